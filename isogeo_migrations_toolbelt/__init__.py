@@ -1,7 +1,20 @@
 # -*- coding: utf-8 -*-
 #! python3  # noqa: E265
 
-from .backup import BackupManager  # noqa: F401
-from .duplicate import MetadataDuplicator  # noqa: F401
-from .delete import MetadataDeleter
+from .backup import (  # noqa: F401
+    BackupManager,
+    BackupManifest,
+    JsonLinesArchive,
+    SnapshotIndex,
+)
+from .duplicate import (  # noqa: F401
+    DuplicationJournal,
+    KeywordCache,
+    MetadataDuplicator,
+    MetadataHandle,
+    WorkgroupReferenceCache,
+)
+from .delete import DeletionReport, MetadataDeleter  # noqa: F401
+from .engine import AsyncEngine  # noqa: F401
 from .search_replace import SearchReplaceManager  # noqa: F401
+from .utils import BoundedExecutor, RateLimiter  # noqa: F401
@@ -1,4 +1,7 @@
 # coding: utf-8
 #! python3  # noqa: E265
 
+from .archive import JsonLinesArchive  # noqa: F401
 from .backup_manager import BackupManager  # noqa: F401
+from .manifest import BackupManifest  # noqa: F401
+from .snapshot_index import SnapshotIndex  # noqa: F401
@@ -0,0 +1,263 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa: E265
+
+# ------------------------------------------------------------------------------
+# Name:         Backup Archive
+# Purpose:      Compressed JSON Lines archive with a sidecar offset index
+# Author:       Isogeo
+#
+# Python:       3.6+
+# ------------------------------------------------------------------------------
+
+# ##############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import gzip
+import json
+import logging
+import os
+from pathlib import Path
+from threading import Lock
+
+# 3rd party
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# submodules
+from .serializers import get_serializer
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class JsonLinesArchive(object):
+    """Compressed JSON Lines archive: one record (metadata...) by line. Each line is \
+    compressed as an independent member (gzip) or frame (zstd), so the archive remains a \
+    regular compressed file which can be read with the usual tools.
+
+    The offset and the length of each record are written in a sidecar index file \
+    (`<archive>.idx`, tab separated: identifier, offset, length), so a single record can be \
+    read without decompressing the whole archive.
+
+    Writing is thread-safe: records can be written by the pool of threads of a backup.
+
+    :param str path: path to the archive. It's created or appended.
+    :param str compression: "gzip" or "zstd" (requires the `zstandard` package). \
+        Defaults to "gzip"
+    :param int level: compression level. Defaults to None (the default level of the compression)
+    :param serializer: serializer of the records, by name ("canonical", "compact") or \
+        instance. Defaults to "canonical"
+
+    :Example:
+
+    .. code-block:: python
+
+        # write
+        archive = JsonLinesArchive("./backup/metadata.jsonl.gz")
+        archive.write(METADATA_UUID, metadata.to_dict())
+        archive.close()
+
+        # read a single record
+        md_dict = JsonLinesArchive.read("./backup/metadata.jsonl.gz", METADATA_UUID)
+
+        # read every record
+        for md_dict in JsonLinesArchive.iter_records("./backup/metadata.jsonl.gz"):
+            print(md_dict.get("title"))
+
+    """
+
+    EXTENSIONS = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+
+    def __init__(
+        self,
+        path: str,
+        compression: str = "gzip",
+        level: int = None,
+        serializer="canonical",
+    ):
+        self.compression = self._check_compression(compression)
+        self.level = level
+        self.serializer = get_serializer(serializer)
+        self.path = Path(path)
+        self.index_path = self.index_path_of(self.path)
+        if not self.path.parent.exists():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.nb_records = 0
+        self._lock = Lock()
+        self._archive = self.path.open("ab")
+        self._index = self.index_path.open("a", encoding="UTF-8")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # -- WRITE -------------------------------------------------------------------------
+    def write(self, record_id: str, record: dict) -> tuple:
+        """Append a record to the archive and its offset to the index.
+
+        :param str record_id: identifier of the record (metadata UUID...)
+        :param dict record: JSON serializable record
+
+        :returns: offset and length of the record into the archive
+        :rtype: tuple
+        """
+        data = self._compress(self.serializer.dumps_line(record) + b"\n")
+
+        with self._lock:
+            offset = self._archive.tell()
+            self._archive.write(data)
+            self._archive.flush()
+            self._index.write("{}\t{}\t{}\n".format(record_id, offset, len(data)))
+            self._index.flush()
+            self.nb_records += 1
+        return offset, len(data)
+
+    def sync(self):
+        """Force the records written so far to the disk (archive and index)."""
+        with self._lock:
+            for out_file in (self._archive, self._index):
+                out_file.flush()
+                os.fsync(out_file.fileno())
+
+    def close(self):
+        """Close the archive and its index."""
+        with self._lock:
+            self._archive.close()
+            self._index.close()
+        logger.debug(
+            "{} records written into the archive: {}".format(self.nb_records, self.path)
+        )
+
+    def _compress(self, data: bytes) -> bytes:
+        """Compress a record as an independent member/frame.
+
+        :param bytes data: serialized record
+        """
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor(level=self.level or 3).compress(data)
+        else:
+            return gzip.compress(data, compresslevel=self.level or 6)
+
+    # -- READ --------------------------------------------------------------------------
+    @classmethod
+    def index(cls, path: str) -> dict:
+        """Load the index of an archive.
+
+        :param str path: path to the archive
+
+        :returns: {record_id: (offset, length)}
+        :rtype: dict
+        """
+        di_index = {}
+        with cls.index_path_of(path).open("r", encoding="UTF-8") as index_file:
+            for line in index_file:
+                record_id, offset, length = line.rstrip("\n").split("\t")
+                di_index[record_id] = (int(offset), int(length))
+        return di_index
+
+    @classmethod
+    def read(cls, path: str, record_id: str, index: dict = None) -> dict:
+        """Read a single record of an archive, using its index.
+
+        :param str path: path to the archive
+        :param str record_id: identifier of the record (metadata UUID...)
+        :param dict index: index of the archive, if already loaded. Defaults to None
+
+        :returns: the record or None if it's not in the archive
+        :rtype: dict
+        """
+        index = index or cls.index(path)
+        if record_id not in index:
+            return None
+
+        offset, length = index.get(record_id)
+        with Path(path).open("rb") as archive:
+            archive.seek(offset)
+            data = archive.read(length)
+        return json.loads(cls._decompress(data, cls.compression_of(path)))
+
+    @classmethod
+    def iter_records(cls, path: str):
+        """Read every record of an archive, in the order of the index.
+
+        :param str path: path to the archive
+
+        :returns: generator of records
+        """
+        compression = cls.compression_of(path)
+        li_entries = sorted(cls.index(path).values())
+        with Path(path).open("rb") as archive:
+            for offset, length in li_entries:
+                archive.seek(offset)
+                yield json.loads(cls._decompress(archive.read(length), compression))
+
+    @staticmethod
+    def _decompress(data: bytes, compression: str) -> bytes:
+        """Decompress a record.
+
+        :param bytes data: compressed record
+        :param str compression: "gzip" or "zstd"
+        """
+        if compression == "zstd":
+            return zstandard.ZstdDecompressor().decompress(data)
+        else:
+            return gzip.decompress(data)
+
+    # -- PATHS -------------------------------------------------------------------------
+    @staticmethod
+    def index_path_of(path: str) -> Path:
+        """Path to the index of an archive.
+
+        :param str path: path to the archive
+        """
+        path = Path(path)
+        return path.with_name(path.name + ".idx")
+
+    @classmethod
+    def compression_of(cls, path: str) -> str:
+        """Compression of an archive, from its extension.
+
+        :param str path: path to the archive
+        """
+        for compression, extension in cls.EXTENSIONS.items():
+            if str(path).endswith(extension):
+                return cls._check_compression(compression)
+        raise ValueError(
+            "'{}' is not an archive. Expected extensions: {}".format(
+                path, " | ".join(cls.EXTENSIONS.values())
+            )
+        )
+
+    @classmethod
+    def _check_compression(cls, compression: str) -> str:
+        """Check the compression is known and available.
+
+        :param str compression: "gzip" or "zstd"
+        """
+        if compression not in cls.EXTENSIONS:
+            raise ValueError(
+                "'compression' must be one of: {}. Given: {}".format(
+                    " | ".join(cls.EXTENSIONS), compression
+                )
+            )
+        if compression == "zstd" and zstandard is None:
+            raise ImportError(
+                "zstd compression requires the 'zstandard' package: "
+                "pip install isogeo-migration-toolbelt[zstd]"
+            )
+        return compression
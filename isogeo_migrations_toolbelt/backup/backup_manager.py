@@ -17,15 +17,31 @@
 import asyncio
 import json
 import logging
+import os
+import shutil
+from collections import Counter
 from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
 from pathlib import Path
+from threading import Lock
+from time import sleep
 
 # 3rd party
 import urllib3
 
 # Isogeo
-from isogeo_pysdk import Isogeo
+from isogeo_pysdk import Isogeo, Metadata
 from isogeo_pysdk.checker import IsogeoChecker
+from isogeo_pysdk.enums import MetadataSubresources
+
+# submodules
+from .archive import JsonLinesArchive
+from .manifest import BackupManifest
+from .serializers import get_serializer
+from .snapshot_index import SnapshotIndex
+from ..duplicate import KeywordCache, MetadataDuplicator
+from ..utils import BoundedExecutor, RateLimiter
 
 # #############################################################################
 # ######## Globals #################
@@ -46,11 +62,91 @@ class BackupManager(object):
 
     :param Isogeo api_client: API client authenticated to Isogeo
     :param str output_folder: path to the folder where to store the exported data
+    :param int max_workers: number of metadata exported simultaneously. Defaults to 5
+    :param int page_size: number of metadata retrieved by each search request (100 max). \
+        Defaults to 100
+    :param bool direct_write: write the metadata as returned by the search, which already \
+        includes every subresource. Metadata missing subresources in the search payload are \
+        still retrieved one by one. Defaults to False (one request per metadata)
+    :param str previous_snapshot: path to the folder of a previous backup. Metadata whose \
+        `_modified` date didn't change since then are not retrieved again but linked to the \
+        previous backup (hard link of the JSON file or copy of the archive record): each \
+        snapshot stays complete on its own. Defaults to None (everything is retrieved)
+    :param SnapshotIndex snapshot_index: SQLite index where the stored metadata are \
+        recorded. Defaults to None (no index)
+    :param serializer: serializer of the exported data, by name or instance (see \
+        `serializers.get_serializer`): "canonical" (sorted and indented JSON, easy to diff) or \
+        "compact" (unsorted JSON, using orjson if it's installed, for throughput). \
+        Defaults to "canonical"
+    :param RateLimiter rate_limiter: rate limiter pacing the API requests. Defaults to None \
+        (the one already installed on the API client or the shared one)
+    :param int retries: number of retries of a failed search page. Defaults to 2
+    :param float backoff: delay before the first retry, in seconds. It's doubled for each \
+        next retry. Defaults to 1
     """
 
-    def __init__(self, api_client: Isogeo, output_folder: str):
-        # store API client
-        self.isogeo = api_client
+    # subresources expected in the search payload to write it directly
+    SEARCH_PAYLOAD_SUBRESOURCES = tuple(
+        i.value
+        for i in MetadataSubresources
+        if i.value not in ("layers", "operations", "serviceLayers")
+    )
+    # only relevant for services
+    SEARCH_PAYLOAD_SUBRESOURCES_SERVICE = ("layers", "operations", "serviceLayers")
+
+    # output formats and their compression
+    OUTPUT_FORMATS = {"json": None, "jsonl.gz": "gzip", "jsonl.zst": "zstd"}
+
+    # workgroup objects which can be backed up
+    WORKGROUP_OBJECTS = (
+        "workgroup",
+        "memberships",
+        "contacts",
+        "catalogs",
+        "specifications",
+        "licenses",
+        "coordinate_systems",
+    )
+
+    # attributes ignored to compare a backup with the current metadata
+    RESTORE_IGNORED_FIELDS = ("_abilities", "_created", "_modified")
+
+    def __init__(
+        self,
+        api_client: Isogeo,
+        output_folder: str,
+        max_workers: int = 5,
+        page_size: int = 100,
+        direct_write: bool = False,
+        previous_snapshot: str = None,
+        snapshot_index: SnapshotIndex = None,
+        serializer="canonical",
+        rate_limiter: RateLimiter = None,
+        retries: int = 2,
+        backoff: float = 1,
+    ):
+        # store API client, paced by the rate limiter
+        self.isogeo = RateLimiter.apply(api_client, rate_limiter)
+        self.max_workers = max_workers
+        self.page_size = max(1, min(page_size, 100))
+        self.retries = retries
+        self.backoff = backoff
+        self.direct_write = direct_write
+        self.serializer = get_serializer(serializer)
+
+        # archives of the current run, by workgroup
+        self.output_format = "json"
+        self._archives = {}
+        self._lock = Lock()
+
+        # manifest of the previous backup
+        if previous_snapshot:
+            self.previous_manifest = BackupManifest.load(previous_snapshot)
+        else:
+            self.previous_manifest = {}
+        self.manifest = None
+        self.nb_unchanged = 0
+        self.snapshot_index = snapshot_index
 
         # output folder
         self.outfolder = Path(output_folder)
@@ -76,12 +172,19 @@ class BackupManager(object):
 
     def metadata(self, search_params: dict, output_format: str = "json") -> bool:
         """Backups every metadata corresponding at a search.
-        It builds a list of metadata to export before transmitting it to an async loop.
+        The search results are walked page by page and each page is transmitted to an async \
+        loop as soon as it's retrieved, so only a few pages are kept in memory at once.
 
         :param dict search params: API client authenticated to Isogeo
-        :param str output_format: format of exported data. Until now, only JSON is available.
+        :param str output_format: format of exported data:
+
+          - "json": one JSON file by metadata, under `<workgroup>/<metadata>.json`
+          - "jsonl.gz" or "jsonl.zst": one compressed JSON Lines archive by workgroup and by \
+            run, under `<workgroup>/metadata_<run>.jsonl.gz`, with its offset index \
+            (see JsonLinesArchive). zstd requires the `zstandard` package.
 
-        :returns: True if export reached the end
+        :returns: True if export reached the end, False if a search page still failed after \
+            the retries (the backup is incomplete)
         :rtype: bool
 
         :Example:
@@ -103,35 +206,16 @@ class BackupManager(object):
             # launch the backup
             backup_mngr.metadata(search_params=search_parameters)
 
-        """
-        # make the search
-        search_to_export = self.isogeo.search(
-            # search params
-            query=search_params.get("query"),
-            page_size=100,
-            specific_md=search_params.get("specific_md"),
-            # settings
-            include="all",
-            # whole_results=True
-        )
+            # or into a compressed archive by workgroup
+            backup_mngr.metadata(search_params=search_parameters, output_format="jsonl.gz")
 
-        self.li_api_routes = []
-        for i in search_to_export.results:
-            # ensure final folder exists
-            final_dest = self.outfolder.resolve() / i.get("_creator").get("_id")
-            final_dest.mkdir(parents=True, exist_ok=True)
-
-            # build the list of methods to execute
-            self.li_api_routes.append(
-                {
-                    "route": self.isogeo.metadata.get,
-                    "params": {"metadata_id": i.get("_id"), "include": "all"},
-                    "output_json_name": "{}/{}".format(
-                        i.get("_creator").get("_id"), i.get("_id")
-                    ),
-                }
+            # next time, only retrieve the metadata modified since the previous backup
+            backup_mngr = BackupManager(
+                api_client=isogeo, output_folder="./output_2", previous_snapshot="./output"
             )
+            backup_mngr.metadata(search_params=search_parameters)
 
+        """
         # async loop
         # loop = asyncio.get_event_loop()
         if self.loop.is_closed():
@@ -141,13 +225,544 @@ class BackupManager(object):
             self.loop = asyncio.new_event_loop()
             asyncio.set_event_loop(self.loop)
 
-        task = self.loop.create_task(self._export_metadata_asynchronous())
+        li_failed_pages = []
+        task = self.loop.create_task(
+            self._export_metadata_asynchronous(
+                search_params=search_params,
+                output_format=output_format,
+                failed_pages=li_failed_pages,
+            )
+        )
         self.loop.run_until_complete(task)
-        return True
+        if li_failed_pages:
+            logger.error(
+                "Backup is incomplete: {} search pages failed.".format(
+                    len(li_failed_pages)
+                )
+            )
+        return not li_failed_pages
+
+    def workgroup(
+        self,
+        workgroup_uuid: str,
+        objects: tuple = WORKGROUP_OBJECTS,
+        metadata: bool = True,
+        output_format: str = "json",
+    ) -> dict:
+        """Backups a workgroup: its settings, memberships, address book, catalogs, \
+        specifications, licenses and coordinate systems are retrieved simultaneously and \
+        stored under `<workgroup>/_workgroup/<object>.json`, next to its metadata.
+
+        :param str workgroup_uuid: workgroup UUID
+        :param tuple objects: workgroup objects to backup. Defaults to all (WORKGROUP_OBJECTS)
+        :param bool metadata: also backup the metadata of the workgroup. Defaults to True
+        :param str output_format: format of exported metadata (see `metadata`). Defaults to "json"
+
+        :returns: number of objects stored by kind (False if the backup of a kind failed)
+        :rtype: dict
+
+        :Example:
+
+        .. code-block:: python
+
+            backup_mngr = BackupManager(api_client=isogeo, output_folder="./output")
+
+            # backup everything before a migration
+            backup_mngr.workgroup(workgroup_uuid=WORKGROUP_UUID)
+
+            # only the address book and the catalogs
+            backup_mngr.workgroup(
+                workgroup_uuid=WORKGROUP_UUID,
+                objects=("contacts", "catalogs"),
+                metadata=False,
+            )
+
+        """
+        # check workgroup UUID
+        if not checker.check_is_uuid(workgroup_uuid):
+            raise ValueError(
+                "Workgroup UUID is not a correct UUID: {}".format(workgroup_uuid)
+            )
+        li_unknown = [i for i in objects if i not in self.WORKGROUP_OBJECTS]
+        if li_unknown:
+            raise ValueError(
+                "Unknown workgroup objects: {}. Must be some of: {}".format(
+                    li_unknown, " | ".join(self.WORKGROUP_OBJECTS)
+                )
+            )
+
+        final_dest = self.outfolder.resolve() / workgroup_uuid / "_workgroup"
+        final_dest.mkdir(parents=True, exist_ok=True)
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="IsogeoBackupWorkgroup_"
+        ) as executor:
+            di_futures = {
+                api_route.get("kind"): executor.submit(
+                    self._store_workgroup_object, api_route
+                )
+                for api_route in self._workgroup_routes(workgroup_uuid, objects)
+            }
+
+            # metadata meanwhile
+            if metadata:
+                self.metadata(
+                    search_params={"query": None, "group": workgroup_uuid},
+                    output_format=output_format,
+                )
+
+            di_report = {kind: future.result() for kind, future in di_futures.items()}
+
+        logger.info("Workgroup {} backed up: {}".format(workgroup_uuid, di_report))
+        return di_report
+
+    def _workgroup_routes(self, workgroup_uuid: str, objects: tuple) -> list:
+        """Build the list of workgroup objects to export.
+
+        :param str workgroup_uuid: workgroup UUID
+        :param tuple objects: workgroup objects to backup
+
+        :returns: list of parameters for `_store_workgroup_object`
+        :rtype: list
+        """
+        di_routes = {
+            "workgroup": (
+                self.isogeo.workgroup.get,
+                {"workgroup_id": workgroup_uuid, "include": ("_abilities", "limits")},
+            ),
+            "memberships": (
+                self.isogeo.workgroup.memberships,
+                {"workgroup_id": workgroup_uuid},
+            ),
+            "contacts": (
+                self.isogeo.contact.listing,
+                {"workgroup_id": workgroup_uuid, "include": ("count",), "caching": 0},
+            ),
+            "catalogs": (
+                self.isogeo.catalog.listing,
+                {
+                    "workgroup_id": workgroup_uuid,
+                    "include": ("_abilities", "count"),
+                    "caching": 0,
+                },
+            ),
+            "specifications": (
+                self.isogeo.specification.listing,
+                {
+                    "workgroup_id": workgroup_uuid,
+                    "include": ("_abilities", "count"),
+                    "caching": 0,
+                },
+            ),
+            "licenses": (
+                self.isogeo.license.listing,
+                {
+                    "workgroup_id": workgroup_uuid,
+                    "include": ("_abilities", "count"),
+                    "caching": 0,
+                },
+            ),
+            "coordinate_systems": (
+                self.isogeo.srs.listing,
+                {"workgroup_id": workgroup_uuid, "caching": 0},
+            ),
+        }
+
+        return [
+            {
+                "kind": kind,
+                "route": di_routes.get(kind)[0],
+                "params": di_routes.get(kind)[1],
+                "output_json_name": "{}/_workgroup/{}".format(workgroup_uuid, kind),
+            }
+            for kind in objects
+        ]
+
+    def _store_workgroup_object(self, func_outname_params: dict):
+        """Meta function meant to be executed by the threads of `workgroup`.
+        In charge to make the request to the Isogeo API and store the result into a JSON file.
+
+        :param dict func_outname_params: parameters for the execution (see `_store_to_json`)
+
+        :returns: number of objects stored or False if the request failed
+        """
+        out_filename = Path(
+            self.outfolder.resolve(),
+            func_outname_params.get("output_json_name") + ".json",
+        )
+
+        try:
+            request = func_outname_params.get("route")(
+                **func_outname_params.get("params")
+            )
+            if isinstance(request, tuple):
+                raise ValueError("API replied with the error: {}".format(request[1]))
+            # transform objects into dicts
+            if not isinstance(request, (dict, list)):
+                request = request.to_dict()
+            # store response into a json file
+            out_filename.write_bytes(self.serializer.dumps(request))
+            return len(request) if isinstance(request, list) else 1
+        except Exception as e:
+            logger.error(
+                "Export failed to '{output_json_name}.json' "
+                "using route '{route}' "
+                "with these params '{params}'".format(**func_outname_params)
+            )
+            logger.error(e)
+            return False
+
+    def _search_pages(
+        self, search_params: dict, include="all", failed_pages: list = None
+    ):
+        """Walk the search results page by page. Specific metadata are searched by chunks of \
+        the page size, others by offsets. Failed searches are retried (see `retries` and \
+        `backoff`): a chunk still failing is skipped, an offset still failing ends the walk.
+
+        :param dict search params: search parameters (query, specific_md, group)
+        :param include: subresources included into the search results. Defaults to "all"
+        :param list failed_pages: list where to append the parameters of the pages still \
+            failing after the retries (`specific_md` and `offset`). Defaults to None
+
+        :returns: generator of pages (lists of metadata as returned by the search). Nothing \
+            is searched if `specific_md` is set but empty.
+        """
+        if search_params.get("specific_md") is not None:
+            specific_md = tuple(search_params.get("specific_md"))
+            li_pages_params = [
+                {"specific_md": specific_md[i : i + self.page_size], "offset": 0}
+                for i in range(0, len(specific_md), self.page_size)
+            ]
+        else:
+            li_pages_params = None
+
+        offset = 0
+        nb_pages = 0
+        while True:
+            if li_pages_params is not None:
+                if nb_pages >= len(li_pages_params):
+                    return
+                page_params = li_pages_params[nb_pages]
+            else:
+                page_params = {"specific_md": (), "offset": offset}
+
+            # make the search
+            search_page = self._search_page(search_params, include, page_params)
+            nb_pages += 1
+            if isinstance(search_page, tuple):
+                logger.error(
+                    "Search failed at page {} ({}): {}".format(
+                        nb_pages, page_params, search_page
+                    )
+                )
+                if failed_pages is not None:
+                    failed_pages.append(page_params)
+                if li_pages_params is None:
+                    return
+                continue
+            logger.debug(
+                "Search page {} retrieved: {} metadata.".format(
+                    nb_pages, len(search_page.results)
+                )
+            )
+            yield search_page.results
+
+            # next offset
+            offset += self.page_size
+            if li_pages_params is None and (
+                not len(search_page.results) or offset >= search_page.total
+            ):
+                return
+
+    def _search_page(self, search_params: dict, include, page_params: dict):
+        """Search a page of metadata, retrying the failures which are worth it: network \
+        errors, server errors (5xx) and rate limiting (429).
+
+        :param dict search params: search parameters (query, group)
+        :param include: subresources included into the search results
+        :param dict page_params: parameters of the page (specific_md, offset)
+
+        :returns: the search or the API error (tuple) if it still failed
+        """
+        for retry in range(self.retries + 1):
+            if retry:
+                delay = self.backoff * 2 ** (retry - 1)
+                logger.info(
+                    "Retry {}/{}: search page {} retried in {}s.".format(
+                        retry, self.retries, page_params, delay
+                    )
+                )
+                sleep(delay)
+            try:
+                search_page = self.isogeo.search(
+                    # search params
+                    group=search_params.get("group"),
+                    query=search_params.get("query"),
+                    page_size=self.page_size,
+                    # settings
+                    include=include,
+                    **page_params
+                )
+            except Exception as e:
+                logger.debug("Search page {} failed: {}".format(page_params, e))
+                search_page = (False, None)
+            if not isinstance(search_page, tuple):
+                return search_page
+            code = search_page[1] if len(search_page) > 1 else None
+            if code is not None and code != 429 and code < 500:
+                break
+        return search_page
+
+    def _metadata_routes(self, search_results: list) -> list:
+        """Build the list of metadata to export from a page of search results.
+
+        :param list search_results: metadata as returned by the search
+
+        :returns: list of parameters for `_store_to_json`
+        :rtype: list
+        """
+        li_api_routes = []
+        for i in search_results:
+            # ensure final folder exists
+            final_dest = self.outfolder.resolve() / i.get("_creator").get("_id")
+            final_dest.mkdir(parents=True, exist_ok=True)
+            output_json_name = "{}/{}".format(
+                i.get("_creator").get("_id"), i.get("_id")
+            )
+
+            # build the list of methods to execute
+            previous_entry = self._previous_entry(i)
+            if previous_entry:
+                li_api_routes.append(
+                    {
+                        "route": self._link_to_previous,
+                        "params": {"previous": previous_entry},
+                        "output_json_name": output_json_name,
+                    }
+                )
+            elif self.direct_write and not self._missing_subresources(i):
+                li_api_routes.append(
+                    {
+                        "route": self._metadata_from_search,
+                        "params": {"search_payload": i},
+                        "output_json_name": output_json_name,
+                    }
+                )
+            else:
+                li_api_routes.append(
+                    {
+                        "route": self.isogeo.metadata.get,
+                        "params": {"metadata_id": i.get("_id"), "include": "all"},
+                        "output_json_name": output_json_name,
+                    }
+                )
+
+        if self.direct_write:
+            logger.debug(
+                "{}/{} metadata written from the search payload.".format(
+                    sum(
+                        1
+                        for route in li_api_routes
+                        if route.get("route") == self._metadata_from_search
+                    ),
+                    len(li_api_routes),
+                )
+            )
+
+        return li_api_routes
+
+    def _previous_entry(self, search_payload: dict) -> dict:
+        """Entry of the previous backup manifest if the metadata didn't change since then.
+
+        :param dict search_payload: metadata as returned by the search
+
+        :returns: the manifest entry or None if the metadata has to be retrieved
+        :rtype: dict
+        """
+        previous_entry = self.previous_manifest.get(search_payload.get("_id"))
+        if (
+            previous_entry is None
+            or search_payload.get("_modified") is None
+            or previous_entry.get("_modified") != search_payload.get("_modified")
+            or not Path(previous_entry.get("path")).is_file()
+        ):
+            return None
+        return previous_entry
+
+    def _missing_subresources(self, search_payload: dict) -> list:
+        """List the subresources missing in a metadata returned by the search.
+
+        :param dict search_payload: metadata as returned by the search
+
+        :rtype: list
+        """
+        li_expected = list(self.SEARCH_PAYLOAD_SUBRESOURCES)
+        if search_payload.get("type") == "service":
+            li_expected.extend(self.SEARCH_PAYLOAD_SUBRESOURCES_SERVICE)
+
+        return [i for i in li_expected if i not in search_payload]
+
+    @staticmethod
+    def _metadata_from_search(search_payload: dict) -> Metadata:
+        """Load a metadata returned by the search as if it was retrieved by `metadata.get`, \
+        so the exported file is the same.
+
+        :param dict search_payload: metadata as returned by the search
+
+        :rtype: Metadata
+        """
+        # clean_attributes renames keys in place: keep the search results untouched
+        return Metadata.clean_attributes(dict(search_payload))
+
+    def _link_to_previous(self, func_outname_params: dict):
+        """Store an unchanged metadata by linking it to the previous backup: the JSON file is \
+        hard linked (or copied if it's not possible), archive records are copied into the \
+        archive of the current run. The new snapshot never references the previous one, so \
+        the older snapshot can be deleted or moved without breaking it.
+
+        :param dict func_outname_params: parameters for the execution (see `_store_to_json`)
+
+        :returns: the manifest entry (see `_record_stored`)
+        :rtype: dict
+        """
+        previous_entry = func_outname_params.get("params").get("previous")
+        previous_path = Path(previous_entry.get("path"))
+        offset, length = None, None
+
+        if self.OUTPUT_FORMATS.get(self.output_format):
+            archive = self._archive(previous_entry.get("_creator"))
+            out_path = archive.path
+            offset, length = archive.write(
+                previous_entry.get("_id"), BackupManifest.load_record(previous_entry)
+            )
+        else:
+            out_path = Path(
+                self.outfolder.resolve(),
+                func_outname_params.get("output_json_name") + ".json",
+            )
+            if out_path.resolve() == previous_path.resolve():
+                pass
+            elif previous_path.suffix == ".json":
+                if out_path.exists():
+                    out_path.unlink()
+                try:
+                    os.link(str(previous_path), str(out_path))
+                except OSError:
+                    shutil.copy2(str(previous_path), str(out_path))
+            else:
+                # previous backup was an archive
+                if out_path.exists():
+                    out_path.unlink()
+                out_path.write_bytes(
+                    self.serializer.dumps(BackupManifest.load_record(previous_entry))
+                )
+
+        stored_entry = self._record_stored(
+            metadata_id=previous_entry.get("_id"),
+            workgroup_id=previous_entry.get("_creator"),
+            modified=previous_entry.get("_modified"),
+            content_hash=previous_entry.get("hash"),
+            snapshot=self.run_id,
+            path=out_path,
+            title=previous_entry.get("title"),
+            name=previous_entry.get("name"),
+            offset=offset,
+            length=length,
+        )
+        with self._lock:
+            self.nb_unchanged += 1
+        return stored_entry
+
+    def _record_stored(self, **entry) -> dict:
+        """Record a stored metadata into the manifest and the snapshot index (if any).
+
+        :param entry: parameters of `BackupManifest.add`
+
+        :returns: the manifest entry, with an absolute path (as returned by \
+            `BackupManifest.load`)
+        :rtype: dict
+        """
+        manifest_entry = self.manifest.add(**entry)
+        if self.snapshot_index is not None:
+            self.snapshot_index.add(folder=self.outfolder, **entry)
+        return dict(manifest_entry, path=str(Path(entry.get("path")).resolve()))
+
+    def _archive(self, workgroup_uuid: str) -> JsonLinesArchive:
+        """Archive of a workgroup for the current run, opened at the first record.
+
+        :param str workgroup_uuid: workgroup UUID
+        """
+        with self._lock:
+            if workgroup_uuid not in self._archives:
+                compression = self.OUTPUT_FORMATS.get(self.output_format)
+                self._archives[workgroup_uuid] = JsonLinesArchive(
+                    path=Path(
+                        self.outfolder.resolve(),
+                        workgroup_uuid,
+                        "metadata_{}{}".format(
+                            self.run_id, JsonLinesArchive.EXTENSIONS.get(compression)
+                        ),
+                    ),
+                    compression=compression,
+                    serializer=self.serializer,
+                )
+            return self._archives.get(workgroup_uuid)
+
+    def _start_run(self, output_format: str):
+        """Start a backup run: check the output format and open the manifest.
+
+        :param str output_format: format of exported data (see `metadata`)
+        """
+        if output_format not in self.OUTPUT_FORMATS:
+            raise ValueError(
+                "'output_format' must be one of: {}. Given: {}".format(
+                    " | ".join(self.OUTPUT_FORMATS), output_format
+                )
+            )
+        if self.OUTPUT_FORMATS.get(output_format):
+            JsonLinesArchive._check_compression(self.OUTPUT_FORMATS.get(output_format))
+        self.output_format = output_format
+        self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.manifest = BackupManifest(self.outfolder)
+        self.nb_unchanged = 0
+
+    def _end_run(self):
+        """End a backup run: close the archives and the manifest, write the index."""
+        self._close_archives()
+        self.manifest.close()
+        if self.snapshot_index is not None:
+            self.snapshot_index.flush()
+
+    def _sync(self, entry: dict):
+        """Force a stored metadata and its manifest entry to the disk.
+
+        :param dict entry: manifest entry (see `_record_stored`)
+        """
+        path = Path(entry.get("path"))
+        with self._lock:
+            li_archives = [
+                archive
+                for archive in self._archives.values()
+                if archive.path.resolve() == path
+            ]
+        if li_archives:
+            li_archives[0].sync()
+        elif path.suffix == ".json":
+            with path.open("ab") as stored_json:
+                os.fsync(stored_json.fileno())
+        self.manifest.sync()
+
+    def _close_archives(self):
+        """Close the archives of the current run."""
+        with self._lock:
+            for archive in self._archives.values():
+                archive.close()
+            self._archives = {}
 
     def _store_to_json(self, func_outname_params: dict):
         """Meta function meant to be executed in async mode.
-        In charge to make the request to the Isogeo API and store the result into a JSON file.
+        In charge to make the request to the Isogeo API and store the result into a JSON file \
+        (or into the archive of the workgroup, depending on the output format).
 
         :param dict func_outname_params: parameters for the execution. Expected structure:
 
@@ -159,6 +774,8 @@ class BackupManager(object):
                     "output_json_name": "{}/{}".format(WORKGROUP_UUID, METADATA_UUID),
                 }
 
+        :returns: the manifest entry (see `_record_stored`) or None if the export failed
+        :rtype: dict
         """
         route_method = func_outname_params.get("route")
         out_filename = Path(
@@ -167,16 +784,43 @@ class BackupManager(object):
         )
 
         try:
+            # unchanged since the previous backup
+            if route_method == self._link_to_previous:
+                return route_method(func_outname_params)
+
             # use request
             request = route_method(**func_outname_params.get("params"))
             # transform objects into dicts
             if not isinstance(request, (dict, list)):
                 request = request.to_dict()
-            # store response into a json file
-            with out_filename.open("w") as out_json:
-                json.dump(
-                    obj=request, fp=out_json, sort_keys=True, indent=4, default=str
-                )
+            workgroup_uuid, md_uuid = func_outname_params.get("output_json_name").split(
+                "/"
+            )
+            offset, length = None, None
+            if self.OUTPUT_FORMATS.get(self.output_format):
+                # store response into the archive of the workgroup
+                out_filename = self._archive(workgroup_uuid).path
+                offset, length = self._archive(workgroup_uuid).write(md_uuid, request)
+            else:
+                # store response into a json file. It may be hard linked to a previous
+                # backup: replace it instead of overwriting the shared content
+                if out_filename.exists():
+                    out_filename.unlink()
+                out_filename.write_bytes(self.serializer.dumps(request))
+
+            # record it for the next backups
+            return self._record_stored(
+                metadata_id=md_uuid,
+                workgroup_id=workgroup_uuid,
+                modified=request.get("_modified"),
+                content_hash=BackupManifest.hash(request),
+                snapshot=self.run_id,
+                path=out_filename,
+                title=request.get("title"),
+                name=request.get("name"),
+                offset=offset,
+                length=length,
+            )
         except Exception as e:
             logger.error(
                 "Export failed to '{output_json_name}.json' "
@@ -185,30 +829,504 @@ class BackupManager(object):
             )
             logger.error(e)
 
-    # -- ASYNC METHODS -----------------------------------------------------------------
-    async def _export_metadata_asynchronous(self):
-        """Async loop builder."""
-        with ThreadPoolExecutor(
-            max_workers=5, thread_name_prefix="IsogeoBackupManager_"
-        ) as executor:
-            # Set any session parameters here before calling `fetch`
-            loop = asyncio.get_event_loop()
-            tasks = [
-                loop.run_in_executor(
-                    executor,
-                    self._store_to_json,
-                    # Allows us to pass in multiple arguments to `fetch`
-                    *(api_route,),
+    # -- VERIFY ------------------------------------------------------------------------
+    def verify(
+        self,
+        metadata_ids: list = None,
+        search_params: dict = None,
+        snapshot: str = None,
+    ) -> dict:
+        """Check a backup against a fresh search before a destructive operation: every \
+        metadata must have been stored completely (its record is read back and hashed) and \
+        must not have been modified on Isogeo since. Metadata are checked simultaneously by \
+        `max_workers` threads.
+
+        :param list metadata_ids: metadata UUIDs to check. Defaults to None (see search_params)
+        :param dict search_params: search of the metadata to check, if metadata_ids is not \
+            set (query, group). Defaults to None
+        :param str snapshot: path to the backup folder. Defaults to None (output folder)
+
+        :returns: report by metadata UUID (see `iter_verify`)
+        :rtype: dict
+
+        :Example:
+
+        .. code-block:: python
+
+            backup_mngr = BackupManager(api_client=isogeo, output_folder="./output")
+            backup_mngr.metadata(search_params={"query": None, "specific_md": li_uuid})
+
+            report = backup_mngr.verify(metadata_ids=li_uuid)
+            li_safe = [k for k, v in report.items() if v.get("status") == "verified"]
+
+        """
+        report = dict(self.iter_verify(metadata_ids, search_params, snapshot))
+        logger.info(
+            "Backup verification: {}".format(
+                dict(Counter(md_report.get("status") for md_report in report.values()))
+            )
+        )
+        return report
+
+    def iter_verify(
+        self,
+        metadata_ids: list = None,
+        search_params: dict = None,
+        snapshot: str = None,
+    ):
+        """Check a backup against a fresh search, yielding each metadata as soon as it's \
+        checked: a deletion can start with the first verified metadata while the others are \
+        still checked. Parameters are the ones of `verify`.
+
+        Status of the metadata:
+
+          - "verified": stored completely and unchanged since
+          - "not_backed_up": not stored by the backup, or its search failed (see `retries`)
+          - "corrupted": stored record can't be read or doesn't match its hash
+          - "outdated": modified on Isogeo since it was stored
+          - "not_found": not returned by the search (deleted or not accessible)
+
+        :returns: generator of tuples (metadata UUID, report)
+        """
+        if metadata_ids is not None:
+            metadata_ids = list(dict.fromkeys(metadata_ids))
+            if not metadata_ids:
+                return
+            search_params = {"query": None, "specific_md": metadata_ids}
+        elif search_params is None:
+            raise ValueError("'metadata_ids' or 'search_params' must be set.")
+        di_entries = BackupManifest.load(snapshot or self.outfolder)
+
+        # only the modification date is compared
+        li_failed_pages = []
+        li_searched = (
+            search_payload
+            for search_results in self._search_pages(
+                search_params, include=(), failed_pages=li_failed_pages
+            )
+            for search_payload in search_results
+        )
+        bounded_executor = BoundedExecutor(
+            max_workers=self.max_workers, thread_name_prefix="IsogeoBackupVerify_"
+        )
+        found_ids = set()
+        for search_payload, md_report in bounded_executor.map(
+            partial(self._verify_metadata, entries=di_entries), li_searched
+        ):
+            found_ids.add(search_payload.get("_id"))
+            yield search_payload.get("_id"), md_report
+
+        yield from self._unsearched_reports(li_failed_pages, found_ids)
+        for md_uuid in metadata_ids or ():
+            if md_uuid not in found_ids:
+                yield md_uuid, {"status": "not_found", "path": None}
+
+    @staticmethod
+    def _unsearched_reports(failed_pages: list, found_ids: set):
+        """Report the metadata whose search failed as not backed up: they can't be told \
+        missing. Metadata are added to `found_ids`.
+
+        :param list failed_pages: parameters of the failed search pages (see `_search_pages`)
+        :param set found_ids: UUIDs of the metadata already reported
+
+        :returns: generator of tuples (metadata UUID, report)
+        """
+        if any(not page_params.get("specific_md") for page_params in failed_pages):
+            logger.error("Search failed: some metadata may not have been reported.")
+        for page_params in failed_pages:
+            for md_uuid in page_params.get("specific_md"):
+                if md_uuid in found_ids:
+                    continue
+                found_ids.add(md_uuid)
+                yield md_uuid, {
+                    "status": "not_backed_up",
+                    "path": None,
+                    "error": "search failed",
+                }
+
+    @staticmethod
+    def _verify_metadata(search_payload: dict, entries: dict) -> dict:
+        """Check the stored version of a metadata. Meant to be executed by the threads of \
+        `iter_verify`.
+
+        :param dict search_payload: metadata as returned by the search
+        :param dict entries: manifest entries of the backup, by metadata UUID
+
+        :rtype: dict
+        """
+        entry = entries.get(search_payload.get("_id"))
+        if entry is None or not Path(entry.get("path")).is_file():
+            return {"status": "not_backed_up", "path": None}
+
+        md_report = {"status": "verified", "path": entry.get("path")}
+        try:
+            record = BackupManifest.load_record(entry)
+        except Exception as e:
+            md_report.update(status="corrupted", error=str(e))
+            return md_report
+
+        if record is None or BackupManifest.hash(record) != entry.get("hash"):
+            md_report["status"] = "corrupted"
+        elif entry.get("_modified") != search_payload.get("_modified"):
+            md_report["status"] = "outdated"
+        return md_report
+
+    def iter_backup(self, metadata_ids: list, output_format: str = "json"):
+        """Backup metadata one by one, yielding each metadata as soon as it's durably \
+        stored (written to the disk, read back and hashed) and verified against the search: \
+        a metadata can be deleted while the next ones are still backed up, without ever \
+        deleting a metadata which isn't backed up. Metadata are backed up simultaneously by \
+        `max_workers` threads.
+
+        :param list metadata_ids: metadata UUIDs to backup
+        :param str output_format: format of exported data (see `metadata`). Defaults to "json"
+
+        :returns: generator of tuples (metadata UUID, report), with the status of \
+            `iter_verify`
+
+        :Example:
+
+        .. code-block:: python
+
+            backup_mngr = BackupManager(api_client=isogeo, output_folder="./output")
+            md_dltr = MetadataDeleter(api_client=isogeo)
+
+            # delete each metadata once backed up
+            md_dltr.backup_and_delete(
+                metadata_ids_list=li_uuid, backup_manager=backup_mngr, hard_mode=1
+            )
+
+        """
+        metadata_ids = list(dict.fromkeys(metadata_ids))
+        if not metadata_ids:
+            return
+        self._start_run(output_format)
+        try:
+            li_failed_pages = []
+            li_searched = (
+                search_payload
+                for search_results in self._search_pages(
+                    {"query": None, "specific_md": metadata_ids},
+                    failed_pages=li_failed_pages,
                 )
-                for api_route in self.li_api_routes
+                for search_payload in search_results
+            )
+            bounded_executor = BoundedExecutor(
+                max_workers=self.max_workers, thread_name_prefix="IsogeoBackupPipeline_"
+            )
+            found_ids = set()
+            for search_payload, md_report in bounded_executor.map(
+                self._backup_and_verify, li_searched
+            ):
+                found_ids.add(search_payload.get("_id"))
+                yield search_payload.get("_id"), md_report
+
+            yield from self._unsearched_reports(li_failed_pages, found_ids)
+            for md_uuid in metadata_ids:
+                if md_uuid not in found_ids:
+                    yield md_uuid, {"status": "not_found", "path": None}
+        finally:
+            self._end_run()
+
+    def _backup_and_verify(self, search_payload: dict) -> dict:
+        """Store a metadata, force it to the disk and verify it. Meant to be executed by \
+        the threads of `iter_backup`.
+
+        :param dict search_payload: metadata as returned by the search
+
+        :rtype: dict
+        """
+        api_route = self._metadata_routes([search_payload])[0]
+        entry = self._store_to_json(api_route)
+        if entry is None:
+            return {"status": "not_backed_up", "path": None}
+
+        self._sync(entry)
+        return self._verify_metadata(search_payload, {entry.get("_id"): entry})
+
+    # -- RESTORE -----------------------------------------------------------------------
+    def restore(
+        self,
+        snapshot: str = None,
+        metadata_ids: list = None,
+        workgroup_uuid: str = None,
+        catalog_uuid: str = None,
+        dry_run: bool = False,
+        import_kwargs: dict = None,
+    ) -> dict:
+        """Restore metadata from a backup: root attributes and subresources of the current \
+        metadata are replaced by the backed up ones, using the differential import of \
+        MetadataDuplicator. Metadata are restored simultaneously by `max_workers` threads.
+
+        Metadata deleted since the backup can't be restored in place: they're reported as \
+        missing. Requested metadata which are not in the backup are reported as not_backed_up.
+
+        :param str snapshot: path to a backup folder or archive. Defaults to None (output folder)
+        :param list metadata_ids: only restore these metadata UUIDs. Defaults to None (all)
+        :param str workgroup_uuid: only restore the metadata of this workgroup. Defaults to None
+        :param str catalog_uuid: only restore the metadata of this catalog (at backup time). \
+            Defaults to None
+        :param bool dry_run: only compare the backup with the current metadata, without \
+            restoring anything. Defaults to False
+        :param dict import_kwargs: other parameters passed to \
+            `MetadataDuplicator.import_into_other_metadata`. Defaults to None
+
+        :returns: report by metadata UUID: status ("unchanged", "to_restore", "restored", \
+            "missing", "not_backed_up" or "error") and the changed fields
+        :rtype: dict
+
+        :Example:
+
+        .. code-block:: python
+
+            backup_mngr = BackupManager(api_client=isogeo, output_folder="./output")
+
+            # see what would be restored
+            report = backup_mngr.restore(workgroup_uuid=WORKGROUP_UUID, dry_run=True)
+            for md_uuid, md_report in report.items():
+                print(md_uuid, md_report.get("status"), md_report.get("changes"))
+
+            # restore
+            backup_mngr.restore(workgroup_uuid=WORKGROUP_UUID)
+
+        """
+        snapshot = Path(snapshot or self.outfolder)
+        if not snapshot.exists():
+            raise ValueError("Snapshot doesn't exist: {}".format(snapshot.resolve()))
+        import_kwargs = dict(import_kwargs or {})
+        if metadata_ids is not None:
+            metadata_ids = set(metadata_ids)
+        keyword_cache = KeywordCache(api_client=self.isogeo)
+
+        li_records = (
+            record
+            for record in self._snapshot_records(snapshot, metadata_ids, workgroup_uuid)
+            if not catalog_uuid
+            or "catalog:{}".format(catalog_uuid) in (record.get("tags") or ())
+        )
+        bounded_executor = BoundedExecutor(
+            max_workers=self.max_workers, thread_name_prefix="IsogeoBackupRestore_"
+        )
+        restore_record = partial(
+            self._restore_metadata,
+            dry_run=dry_run,
+            keyword_cache=keyword_cache,
+            import_kwargs=import_kwargs,
+        )
+        report = {
+            record.get("_id"): md_report
+            for record, md_report in bounded_executor.map(restore_record, li_records)
+        }
+        for md_uuid in metadata_ids or ():
+            if md_uuid not in report:
+                logger.error("Metadata {} is not in the backup.".format(md_uuid))
+                report[md_uuid] = {"status": "not_backed_up", "changes": []}
+
+        logger.info(
+            "Restore{} from {}: {}".format(
+                " (dry run)" if dry_run else "",
+                snapshot,
+                dict(Counter(md_report.get("status") for md_report in report.values())),
+            )
+        )
+        return report
+
+    def _snapshot_records(
+        self, snapshot: Path, metadata_ids: set = None, workgroup_uuid: str = None
+    ):
+        """Read the metadata of a backup folder (using its manifest if any) or archive.
+
+        :param Path snapshot: path to a backup folder or archive
+        :param set metadata_ids: only read these metadata UUIDs. Defaults to None (all)
+        :param str workgroup_uuid: only read the metadata of this workgroup. Defaults to None
+
+        :returns: generator of metadata dicts
+        """
+        if snapshot.is_file():
+            li_sources = [snapshot]
+        elif Path(snapshot, BackupManifest.FILENAME).is_file():
+            li_sources = list(BackupManifest.load(snapshot).values())
+        else:
+            li_sources = sorted(snapshot.glob("*/*.json"))
+            for extension in JsonLinesArchive.EXTENSIONS.values():
+                li_sources.extend(sorted(snapshot.glob("*/*" + extension)))
+
+        for source in li_sources:
+            if isinstance(source, dict):
+                # manifest entry
+                if (
+                    metadata_ids is not None and source.get("_id") not in metadata_ids
+                ) or (workgroup_uuid and source.get("_creator") != workgroup_uuid):
+                    continue
+                li_records = [BackupManifest.load_record(source)]
+            elif source.name.endswith(tuple(JsonLinesArchive.EXTENSIONS.values())):
+                li_records = JsonLinesArchive.iter_records(source)
+            else:
+                with source.open("r", encoding="UTF-8") as in_json:
+                    li_records = [json.load(in_json)]
+
+            for record in li_records:
+                if (
+                    metadata_ids is not None and record.get("_id") not in metadata_ids
+                ) or (
+                    workgroup_uuid
+                    and (record.get("_creator") or {}).get("_id") != workgroup_uuid
+                ):
+                    continue
+                yield record
+
+    def _restore_metadata(
+        self,
+        record: dict,
+        dry_run: bool,
+        keyword_cache: KeywordCache,
+        import_kwargs: dict,
+    ) -> dict:
+        """Compare a backed up metadata with the current one and restore it if needed.
+        Meant to be executed by the threads of `restore`.
+
+        :param dict record: backed up metadata
+        :param bool dry_run: only compare
+        :param KeywordCache keyword_cache: keywords cache shared by the restorations
+        :param dict import_kwargs: other parameters of the import
+
+        :rtype: dict
+        """
+        md_uuid = record.get("_id")
+        try:
+            md_current = self.isogeo.metadata.get(metadata_id=md_uuid, include="all")
+            if isinstance(md_current, tuple):
+                logger.error(
+                    "Metadata {} can't be restored: it doesn't exist anymore ({}).".format(
+                        md_uuid, md_current[1]
+                    )
+                )
+                return {"status": "missing", "changes": []}
+
+            # compare with the current metadata
+            di_current = md_current.to_dict()
+            li_changes = sorted(
+                k
+                for k, v in record.items()
+                if k not in self.RESTORE_IGNORED_FIELDS
+                and self._comparable(v) != self._comparable(di_current.get(k))
+            )
+            if not li_changes:
+                return {"status": "unchanged", "changes": []}
+            elif dry_run:
+                return {"status": "to_restore", "changes": li_changes}
+
+            # restore it
+            di_import_params = {
+                "copymark_title": False,
+                "copymark_abstract": False,
+                "exclude_fields": [],
+                "differential": True,
+            }
+            di_import_params.update(import_kwargs)
+            md_duplicator = MetadataDuplicator(
+                api_client=self.isogeo,
+                source_metadata_uuid=md_uuid,
+                source_metadata=Metadata(**record),
+                keyword_cache=keyword_cache,
+            )
+            md_restored = md_duplicator.import_into_other_metadata(
+                destination_metadata_uuid=md_uuid, **di_import_params
+            )
+
+            li_errors = [
+                family
+                for subresources_report in (
+                    md_duplicator.subresources_removals_report,
+                    md_duplicator.subresources_report,
+                )
+                for family, family_report in subresources_report.items()
+                if family_report.get("errors")
             ]
+            if isinstance(md_restored, tuple) or li_errors:
+                logger.error(
+                    "Metadata {} has been partially restored. Failed: {}".format(
+                        md_uuid, li_errors or "root attributes"
+                    )
+                )
+                return {"status": "error", "changes": li_changes, "errors": li_errors}
 
-            # store responses
-            out_list = []
-            for response in await asyncio.gather(*tasks):
-                out_list.append(response)
+            logger.info("Metadata {} has been restored: {}".format(md_uuid, li_changes))
+            return {"status": "restored", "changes": li_changes}
+        except Exception as e:
+            logger.error("Metadata {} can't be restored: {}".format(md_uuid, e))
+            return {"status": "error", "changes": [], "errors": [str(e)]}
+
+    @staticmethod
+    def _comparable(value):
+        """Make a metadata attribute comparable, whatever the order of its subresources.
+
+        :param value: attribute value
+        """
+        if isinstance(value, list):
+            return sorted(json.dumps(i, sort_keys=True, default=str) for i in value)
+        return json.dumps(value, sort_keys=True, default=str)
+
+    # -- ASYNC METHODS -----------------------------------------------------------------
+    async def _export_metadata_asynchronous(
+        self,
+        search_params: dict,
+        executor: ThreadPoolExecutor = None,
+        output_format: str = "json",
+        failed_pages: list = None,
+    ) -> int:
+        """Async loop builder. The next search page is retrieved while the previous ones are \
+        exported, but no more than two pages of metadata are in flight.
+
+        :param dict search params: search parameters (query, specific_md, group)
+        :param ThreadPoolExecutor executor: pool of threads to use. Defaults to None (a new \
+            one of `max_workers` threads)
+        :param str output_format: format of exported data (see `metadata`). Defaults to "json"
+        :param list failed_pages: list where to append the search pages which failed (see \
+            `_search_pages`). Defaults to None
+
+        :returns: number of metadata exported
+        :rtype: int
+        """
+        if executor is None:
+            with ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="IsogeoBackupManager_"
+            ) as executor:
+                return await self._export_metadata_asynchronous(
+                    search_params=search_params,
+                    executor=executor,
+                    output_format=output_format,
+                    failed_pages=failed_pages,
+                )
+
+        self._start_run(output_format)
 
-            return out_list
+        # routes are built page by page, as the exports make room for them
+        li_api_routes = (
+            api_route
+            for search_results in self._search_pages(
+                search_params, failed_pages=failed_pages
+            )
+            for api_route in self._metadata_routes(search_results)
+        )
+        bounded_executor = BoundedExecutor(
+            max_workers=self.max_workers, window=2 * self.page_size, executor=executor
+        )
+        nb_exported = 0
+        try:
+            async for api_route, result in bounded_executor.amap(
+                self._store_to_json, li_api_routes
+            ):
+                nb_exported += 1
+        finally:
+            self._end_run()
+
+        logger.info(
+            "{} metadata exported ({} unchanged since the previous backup).".format(
+                nb_exported, self.nb_unchanged
+            )
+        )
+        return nb_exported
 
 
 # #############################################################################
@@ -0,0 +1,177 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa: E265
+
+# ------------------------------------------------------------------------------
+# Name:         Backup Manifest
+# Purpose:      Record what each backup stored to make the next ones incremental
+# Author:       Isogeo
+#
+# Python:       3.6+
+# ------------------------------------------------------------------------------
+
+# ##############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from threading import Lock
+
+# submodules
+from .archive import JsonLinesArchive
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class BackupManifest(object):
+    """Manifest of a backup folder (`manifest.jsonl`): one line by stored metadata with its \
+    UUID, workgroup, title, name, `_modified` date, content hash, snapshot (run) and the path \
+    to the file or the archive holding it (relative to the backup folder, with the offset of \
+    the record into the archive).
+
+    Lines are appended as soon as the metadata is stored. When a metadata is stored several \
+    times in the same folder, the last line wins.
+
+    :param str folder: path to the backup folder
+    """
+
+    FILENAME = "manifest.jsonl"
+
+    def __init__(self, folder: str):
+        self.folder = Path(folder)
+        self.path = self.folder / self.FILENAME
+
+        # shared between the threads of the backup
+        self._lock = Lock()
+        self._manifest = self.path.open("a", encoding="UTF-8")
+
+    def add(
+        self,
+        metadata_id: str,
+        workgroup_id: str,
+        modified: str,
+        content_hash: str,
+        snapshot: str,
+        path: str,
+        title: str = None,
+        name: str = None,
+        offset: int = None,
+        length: int = None,
+    ) -> dict:
+        """Record a stored metadata.
+
+        :param str metadata_id: metadata UUID
+        :param str workgroup_id: workgroup UUID
+        :param str modified: `_modified` date of the metadata
+        :param str content_hash: hash of the stored content (see `hash`)
+        :param str snapshot: snapshot (run) holding the metadata, even if its content is \
+            linked to a previous backup
+        :param str path: path to the JSON file or the archive holding the metadata
+        :param str title: metadata title. Defaults to None
+        :param str name: metadata name. Defaults to None
+        :param int offset: offset of the record into the archive. Defaults to None
+        :param int length: length of the record into the archive. Defaults to None
+
+        :returns: the manifest entry
+        :rtype: dict
+        """
+        entry = {
+            "_id": metadata_id,
+            "_creator": workgroup_id,
+            "_modified": modified,
+            "hash": content_hash,
+            "snapshot": snapshot,
+            "path": os.path.relpath(
+                str(Path(path).resolve()), str(self.folder.resolve())
+            ),
+            "title": title,
+            "name": name,
+            "offset": offset,
+            "length": length,
+        }
+        with self._lock:
+            self._manifest.write(json.dumps(entry, sort_keys=True) + "\n")
+            self._manifest.flush()
+        return entry
+
+    def sync(self):
+        """Force the entries written so far to the disk."""
+        with self._lock:
+            self._manifest.flush()
+            os.fsync(self._manifest.fileno())
+
+    def close(self):
+        """Close the manifest file."""
+        with self._lock:
+            self._manifest.close()
+
+    # -- READ --------------------------------------------------------------------------
+    @classmethod
+    def load(cls, folder: str) -> dict:
+        """Load the manifest of a backup folder. Paths of entries are made absolute.
+
+        :param str folder: path to the backup folder
+
+        :returns: {metadata_id: entry}. Empty if the folder has no manifest.
+        :rtype: dict
+        """
+        folder = Path(folder).resolve()
+        manifest_path = folder / cls.FILENAME
+        di_entries = {}
+        if not manifest_path.is_file():
+            logger.warning("No backup manifest found in: {}".format(folder))
+            return di_entries
+
+        with manifest_path.open("r", encoding="UTF-8") as manifest:
+            for line in manifest:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                entry["path"] = str(Path(folder, entry.get("path")).resolve())
+                di_entries[entry.get("_id")] = entry
+
+        return di_entries
+
+    @staticmethod
+    def load_record(entry: dict) -> dict:
+        """Load the metadata stored by a manifest entry, from its JSON file or its archive.
+
+        :param dict entry: manifest entry, as returned by `load` (or a SnapshotIndex record)
+
+        :rtype: dict
+        """
+        path = entry.get("path")
+        if path.endswith(tuple(JsonLinesArchive.EXTENSIONS.values())):
+            if entry.get("offset") is not None:
+                index = {entry.get("_id"): (entry.get("offset"), entry.get("length"))}
+            else:
+                index = None
+            return JsonLinesArchive.read(path, entry.get("_id"), index=index)
+
+        with open(path, "r", encoding="UTF-8") as in_json:
+            return json.load(in_json)
+
+    @staticmethod
+    def hash(record: dict) -> str:
+        """Hash of a metadata content, independent of the output format.
+
+        :param dict record: metadata as a dict
+
+        :rtype: str
+        """
+        return hashlib.sha256(
+            json.dumps(record, sort_keys=True, default=str).encode("UTF-8")
+        ).hexdigest()
@@ -0,0 +1,133 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa: E265
+
+# ------------------------------------------------------------------------------
+# Name:         Backup Serializers
+# Purpose:      Serialize backed up objects, for diffing or for throughput
+# Author:       Isogeo
+#
+# Python:       3.6+
+# ------------------------------------------------------------------------------
+
+# ##############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import json
+import logging
+import os
+
+# 3rd party
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class CanonicalSerializer(object):
+    """Sorted and indented JSON, easy to diff. JSON files are byte-compatible with the ones \
+    written by the previous versions of the BackupManager \
+    (`json.dump(obj, fp, sort_keys=True, indent=4, default=str)` into a text file).
+    """
+
+    name = "canonical"
+
+    def dumps(self, obj) -> bytes:
+        """Serialize an object as a JSON document.
+
+        :param obj: JSON serializable object (dict, list)
+
+        :rtype: bytes
+        """
+        json_str = json.dumps(obj, sort_keys=True, indent=4, default=str)
+        # line breaks as written into a text file
+        return json_str.replace("\n", os.linesep).encode("UTF-8")
+
+    def dumps_line(self, obj) -> bytes:
+        """Serialize an object on a single line (JSON Lines), without the line break.
+
+        :param obj: JSON serializable object (dict, list)
+
+        :rtype: bytes
+        """
+        return json.dumps(obj, sort_keys=True, default=str).encode("UTF-8")
+
+
+class CompactSerializer(object):
+    """Compact JSON, keys are not sorted: the fastest to write. It uses orjson if it's \
+    installed, the standard library otherwise. Values which are not JSON serializable are \
+    converted to strings, as in canonical mode.
+    """
+
+    name = "compact"
+
+    def dumps(self, obj) -> bytes:
+        """Serialize an object as a JSON document.
+
+        :param obj: JSON serializable object (dict, list)
+
+        :rtype: bytes
+        """
+        return self.dumps_line(obj)
+
+    def dumps_line(self, obj) -> bytes:
+        """Serialize an object on a single line (JSON Lines), without the line break.
+
+        :param obj: JSON serializable object (dict, list)
+
+        :rtype: bytes
+        """
+        if orjson is not None:
+            return orjson.dumps(
+                obj,
+                default=str,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        return json.dumps(
+            obj, separators=(",", ":"), ensure_ascii=False, default=str
+        ).encode("UTF-8")
+
+
+# #############################################################################
+# ##### Functions ##################
+# ##################################
+
+SERIALIZERS = {
+    CanonicalSerializer.name: CanonicalSerializer,
+    CompactSerializer.name: CompactSerializer,
+}
+
+
+def get_serializer(serializer="canonical"):
+    """Get a serializer from its name. Any object with `dumps` and `dumps_line` methods \
+    (returning bytes) can be used as a serializer.
+
+    :param serializer: serializer name ("canonical" or "compact") or instance. \
+        Defaults to "canonical"
+    """
+    if isinstance(serializer, str):
+        if serializer not in SERIALIZERS:
+            raise ValueError(
+                "'serializer' must be one of: {}. Given: {}".format(
+                    " | ".join(SERIALIZERS), serializer
+                )
+            )
+        return SERIALIZERS.get(serializer)()
+    elif not (hasattr(serializer, "dumps") and hasattr(serializer, "dumps_line")):
+        raise TypeError(
+            "'serializer' expects a name or an object with 'dumps' and 'dumps_line' "
+            "methods, not {}".format(type(serializer))
+        )
+    return serializer
@@ -0,0 +1,280 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa: E265
+
+# ------------------------------------------------------------------------------
+# Name:         Snapshot Index
+# Purpose:      Queryable SQLite index of the metadata stored by the backups
+# Author:       Isogeo
+#
+# Python:       3.6+
+# ------------------------------------------------------------------------------
+
+# ##############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+
+# submodules
+from .manifest import BackupManifest
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class SnapshotIndex(object):
+    """Local SQLite index of the metadata stored by the backups, shared by the backups of \
+    many folders and scripts: which backups hold a metadata, where (JSON file or archive \
+    offset) and the latest version stored before a date.
+
+    A snapshot is a backup run, identified by its date (`%Y%m%d_%H%M%S`). Metadata unchanged \
+    since a previous backup are held by the snapshot which linked them, with the path to the \
+    previous content. Records are written by batches, so the index must be closed (or \
+    flushed) at the end of a backup.
+
+    :param str path: path to the SQLite database file. It's created if it doesn't exist. \
+        Defaults to "backup_index.sqlite"
+    :param int batch_size: number of records written at once. Defaults to 500
+
+    :Example:
+
+    .. code-block:: python
+
+        # index the backups as they're performed
+        snapshot_index = SnapshotIndex("./_output/_backup/index.sqlite")
+        backup_mngr = BackupManager(
+            api_client=isogeo, output_folder=backup_path, snapshot_index=snapshot_index
+        )
+        backup_mngr.metadata(search_params=search_parameters)
+
+        # or index older backups
+        snapshot_index.add_folder("./_output/_backup/previous_backup")
+
+        # which backup holds the version before the migration?
+        md_version = snapshot_index.latest(METADATA_UUID, before=datetime(2020, 6, 1))
+        md_dict = BackupManifest.load_record(md_version)
+
+    """
+
+    COLUMNS = (
+        "uuid",
+        "workgroup",
+        "title",
+        "name",
+        "modified",
+        "snapshot",
+        "folder",
+        "path",
+        "offset",
+        "length",
+        "hash",
+    )
+
+    def __init__(self, path: str = "backup_index.sqlite", batch_size: int = 500):
+        self.path = Path(path)
+        if not self.path.parent.exists():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+
+        # shared between the threads of the backups
+        self._lock = Lock()
+        self._pending = []
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS records (
+                    uuid TEXT NOT NULL,
+                    workgroup TEXT,
+                    title TEXT,
+                    name TEXT,
+                    modified TEXT,
+                    snapshot TEXT NOT NULL,
+                    folder TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    offset INTEGER,
+                    length INTEGER,
+                    hash TEXT,
+                    PRIMARY KEY (uuid, snapshot, folder)
+                );
+                CREATE INDEX IF NOT EXISTS records_workgroup
+                    ON records (workgroup, snapshot);
+                CREATE INDEX IF NOT EXISTS records_snapshot ON records (snapshot);
+                """
+            )
+
+    def close(self):
+        """Write the pending records and close the connection to the database."""
+        self.flush()
+        with self._lock:
+            self._connection.close()
+
+    # -- WRITE -------------------------------------------------------------------------
+    def add(
+        self,
+        metadata_id: str,
+        workgroup_id: str,
+        modified: str,
+        snapshot: str,
+        folder: str,
+        path: str,
+        content_hash: str = None,
+        title: str = None,
+        name: str = None,
+        offset: int = None,
+        length: int = None,
+    ):
+        """Index a stored metadata. It's written with the next batch.
+
+        :param str metadata_id: metadata UUID
+        :param str workgroup_id: workgroup UUID
+        :param str modified: `_modified` date of the metadata
+        :param str snapshot: snapshot (backup run) holding the metadata
+        :param str folder: path to the backup folder
+        :param str path: path to the JSON file or the archive holding the metadata
+        :param str content_hash: hash of the stored content. Defaults to None
+        :param str title: metadata title. Defaults to None
+        :param str name: metadata name. Defaults to None
+        :param int offset: offset of the record into the archive. Defaults to None
+        :param int length: length of the record into the archive. Defaults to None
+        """
+        row = (
+            metadata_id,
+            workgroup_id,
+            title,
+            name,
+            modified,
+            snapshot,
+            str(Path(folder).resolve()),
+            str(Path(path).resolve()),
+            offset,
+            length,
+            content_hash,
+        )
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) < self.batch_size:
+                return
+        self.flush()
+
+    def add_folder(self, folder: str) -> int:
+        """Index a backup folder from its manifest.
+
+        :param str folder: path to the backup folder
+
+        :returns: number of records indexed
+        :rtype: int
+        """
+        di_entries = BackupManifest.load(folder)
+        for entry in di_entries.values():
+            self.add(
+                metadata_id=entry.get("_id"),
+                workgroup_id=entry.get("_creator"),
+                modified=entry.get("_modified"),
+                snapshot=entry.get("snapshot"),
+                folder=folder,
+                path=entry.get("path"),
+                content_hash=entry.get("hash"),
+                title=entry.get("title"),
+                name=entry.get("name"),
+                offset=entry.get("offset"),
+                length=entry.get("length"),
+            )
+        self.flush()
+        return len(di_entries)
+
+    def flush(self):
+        """Write the pending records."""
+        with self._lock:
+            li_rows, self._pending = self._pending, []
+            if not li_rows:
+                return
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    li_rows,
+                )
+        logger.debug("{} records written into the index.".format(len(li_rows)))
+
+    # -- READ --------------------------------------------------------------------------
+    def versions(self, metadata_id: str) -> list:
+        """Stored versions of a metadata, from the latest snapshot.
+
+        :param str metadata_id: metadata UUID
+
+        :returns: list of records, usable with `BackupManifest.load_record`
+        :rtype: list
+        """
+        return self._select(
+            "WHERE uuid = ? ORDER BY snapshot DESC, folder", (metadata_id,)
+        )
+
+    def latest(self, metadata_id: str, before: datetime = None) -> dict:
+        """Latest stored version of a metadata.
+
+        :param str metadata_id: metadata UUID
+        :param datetime before: only consider the snapshots taken before this date. \
+            Defaults to None (all snapshots)
+
+        :returns: record usable with `BackupManifest.load_record` or None if not stored
+        :rtype: dict
+        """
+        if before is None:
+            li_records = self._select(
+                "WHERE uuid = ? ORDER BY snapshot DESC LIMIT 1", (metadata_id,)
+            )
+        else:
+            li_records = self._select(
+                "WHERE uuid = ? AND snapshot < ? ORDER BY snapshot DESC LIMIT 1",
+                (metadata_id, before.strftime("%Y%m%d_%H%M%S")),
+            )
+        return li_records[0] if li_records else None
+
+    def snapshot(self, snapshot: str, workgroup_id: str = None) -> list:
+        """Records of a snapshot.
+
+        :param str snapshot: snapshot (backup run)
+        :param str workgroup_id: only the records of this workgroup. Defaults to None
+
+        :rtype: list
+        """
+        if workgroup_id is None:
+            return self._select("WHERE snapshot = ?", (snapshot,))
+        return self._select(
+            "WHERE workgroup = ? AND snapshot = ?", (workgroup_id, snapshot)
+        )
+
+    def _select(self, where: str, params: tuple) -> list:
+        """Select records as dicts, with the keys of the manifest entries.
+
+        :param str where: WHERE clause
+        :param tuple params: parameters of the clause
+        """
+        self.flush()
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT {} FROM records {}".format(", ".join(self.COLUMNS), where),
+                params,
+            ).fetchall()
+
+        li_records = []
+        for row in rows:
+            record = dict(zip(self.COLUMNS, row))
+            record["_id"] = record.pop("uuid")
+            record["_creator"] = record.pop("workgroup")
+            record["_modified"] = record.pop("modified")
+            li_records.append(record)
+        return li_records
@@ -2,3 +2,4 @@
 #! python3  # noqa: E265 F401
 
 from .deleter import MetadataDeleter  # noqa: F401
+from .report import DeletionReport  # noqa: F401
@@ -17,14 +17,21 @@
 import asyncio
 import logging
 from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import Lock
+from time import monotonic, sleep
 
 # 3rd party
 import urllib3
 
 # Isogeo
-from isogeo_pysdk import Isogeo
+from isogeo_pysdk import Isogeo, Metadata, ServiceLayer
 from isogeo_pysdk.checker import IsogeoChecker
 
+# submodules
+from .report import DeletionReport
+from ..utils import BoundedExecutor, RateLimiter
+
 # #############################################################################
 # ######## Globals #################
 # ##################################
@@ -43,12 +50,44 @@ class MetadataDeleter(object):
     It uses the Isogeo Python SDK to download data asynchronously.
 
     :param Isogeo api_client: API client authenticated to Isogeo
-    :param str output_folder: path to the folder where to store the exported data
+    :param int max_workers: number of metadata deleted simultaneously. Defaults to 5
+    :param RateLimiter rate_limiter: rate limiter pacing the API requests. Defaults to None \
+        (the one already installed on the API client or the shared one)
+    :param bool check_existence: resolve the metadata by a few searches before deleting \
+        them: metadata which don't exist or are not accessible are reported and skipped. \
+        Defaults to True
+    :param int retries: number of retry passes over the failed deletions which are worth \
+        it (see `DeletionReport.failures`), and over the failed searches of the pre-flight \
+        check. Defaults to 2
+    :param float backoff: delay before the first retry pass, in seconds. It's doubled for \
+        each next pass. Defaults to 1
+    :param bool dependencies: handle the associations between service layers and datasets: \
+        the associations of the metadata to delete are retrieved by the pre-flight search \
+        and dissociated before deleting them. Metadata linked together are deleted by the \
+        same thread, other metadata simultaneously. Associations to metadata which are not \
+        deleted are dissociated too. Defaults to False
     """
 
-    def __init__(self, api_client: Isogeo):
-        # store API client
-        self.isogeo = api_client
+    # number of metadata resolved by each search of the pre-flight check (100 max)
+    CHECK_CHUNK_SIZE = 100
+
+    def __init__(
+        self,
+        api_client: Isogeo,
+        max_workers: int = 5,
+        rate_limiter: RateLimiter = None,
+        check_existence: bool = True,
+        retries: int = 2,
+        backoff: float = 1,
+        dependencies: bool = False,
+    ):
+        # store API client, paced by the rate limiter
+        self.isogeo = RateLimiter.apply(api_client, rate_limiter)
+        self.max_workers = max_workers
+        self.check_existence = check_existence
+        self.retries = retries
+        self.backoff = backoff
+        self.dependencies = dependencies
 
         try:
             self.loop = asyncio.get_event_loop()
@@ -57,17 +96,39 @@ class MetadataDeleter(object):
             self.loop = asyncio.new_event_loop()
             asyncio.set_event_loop(self.loop)
 
-        self.nb_deleted = 0
         self.nb_to_delete = 0
+        self.report = DeletionReport()
         self.deleted = []
+        self.skipped = {}
+        self.missing = []
+        self.unresolved = {}
+        self.to_delete = {}
+
+        # service layers associations: {(service, layer, dataset): dataset type}
+        self.associations = {}
+        self._dissociated = set()
+        self._lock = Lock()
 
         self.hard_mode = 0
 
-    def delete(self, metadata_ids_list: list, hard_mode: bool=0) -> bool:
+    @property
+    def nb_deleted(self) -> int:
+        """Number of metadata deleted (or which would have been deleted in soft mode)."""
+        return self.report.count("deleted", "soft")
+
+    def delete(
+        self, metadata_ids_list: list, hard_mode: bool = 0, backup_manager=None
+    ) -> DeletionReport:
         """Delete every metadata which UUID appears in metadata_ids_list.
 
         :param list metadata_ids_list: list of Isogeo Metadata UUID to delete
         :param bool hard_mode:
+        :param BackupManager backup_manager: backup of the metadata to check before deleting \
+            them (see `BackupManager.iter_verify`). Each metadata is deleted as soon as its \
+            backup is verified, the others are skipped. Defaults to None (no check)
+
+        :returns: report of the deletion, by metadata (see `report`)
+        :rtype: DeletionReport
 
         :Example:
 
@@ -79,9 +140,119 @@ class MetadataDeleter(object):
             # launch the deletion
             md_dltr.delete(metadata_ids_list=li_uuid, hard_mode=1)
 
+            # or only the metadata whose backup is verified
+            backup_mngr.metadata(search_params={"query": None, "specific_md": li_uuid})
+            md_dltr.delete(
+                metadata_ids_list=li_uuid, hard_mode=1, backup_manager=backup_mngr
+            )
+
         """
         self.hard_mode = hard_mode
+        self._prepare_routes(metadata_ids_list)
+        if backup_manager is not None:
+            self.li_api_routes = self._verified_routes(
+                self.li_api_routes, backup_manager.iter_verify
+            )
+        return self._run_deletion()
+
+    def backup_and_delete(
+        self,
+        metadata_ids_list: list,
+        backup_manager,
+        hard_mode: bool = 0,
+        output_format: str = "json",
+    ) -> DeletionReport:
+        """Backup and delete every metadata which UUID appears in metadata_ids_list, in a \
+        single pipeline: each metadata is deleted as soon as its own backup is durably \
+        written and verified (see `BackupManager.iter_backup`), while the next ones are \
+        still backed up. Metadata which can't be backed up are skipped.
+
+        :param list metadata_ids_list: list of Isogeo Metadata UUID to delete
+        :param BackupManager backup_manager: backup manager storing the metadata
+        :param bool hard_mode:
+        :param str output_format: format of the backup (see `BackupManager.metadata`). \
+            Defaults to "json"
+
+        :returns: report of the deletion, by metadata (see `report`)
+        :rtype: DeletionReport
+
+        :Example:
+
+        .. code-block:: python
+
+            backup_mngr = BackupManager(api_client=isogeo, output_folder="./_backup")
+            md_dltr = MetadataDeleter(api_client=isogeo)
+
+            md_dltr.backup_and_delete(
+                metadata_ids_list=li_uuid, backup_manager=backup_mngr, hard_mode=1
+            )
+
+        """
+        self.hard_mode = hard_mode
+        self._prepare_routes(metadata_ids_list)
+        self.li_api_routes = self._verified_routes(
+            self.li_api_routes,
+            partial(backup_manager.iter_backup, output_format=output_format),
+        )
+        return self._run_deletion()
+
+    def _run_deletion(self) -> DeletionReport:
+        """Run the deletion requests prepared by `_prepare_routes` in the async loop.
+
+        :rtype: DeletionReport
+        """
+        # async loop
+        if self.loop.is_closed():
+            logger.debug("Current event loop is already closed. Creating a new one...")
+            self.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.loop)
+
+        # launch the task
+        task = self.loop.create_task(self._run_deletion_asynchronous())
+        return self.loop.run_until_complete(task)
+
+    async def _run_deletion_asynchronous(
+        self, executor: ThreadPoolExecutor = None
+    ) -> DeletionReport:
+        """Run the deletion requests prepared by `_prepare_routes`, from an event loop.
 
+        :param ThreadPoolExecutor executor: pool of threads to use. Defaults to None (a new \
+            one of `max_workers` threads)
+
+        :rtype: DeletionReport
+        """
+        # Inform the user
+        if self.hard_mode:
+            logger.warning(
+                "HARD MODE ACTIVATED >>> {} metadatas gonna be deleted".format(
+                    self.nb_to_delete
+                )
+            )
+        else:
+            logger.info(
+                "SOFT MODE >>> {} metadatas would be deleted".format(self.nb_to_delete)
+            )
+
+        await self._delete_metadata_asynchronous(executor=executor)
+
+        logger.info(
+            "{}/{} metadatas {} deleted".format(
+                self.nb_deleted,
+                self.nb_to_delete,
+                "have been" if self.hard_mode else "would have been",
+            )
+        )
+        return self.report
+
+    def _prepare_routes(self, metadata_ids_list: list) -> list:
+        """Check the UUIDs, resolve the metadata (see `check_existence`) and build the list \
+        of deletion requests.
+
+        :param list metadata_ids_list: list of Isogeo Metadata UUID to delete
+
+        :returns: list of parameters for `_delete_metadata`
+        :rtype: list
+        """
         # check the UUID list content validity:
         li_uuid = []
         for uuid in metadata_ids_list:
@@ -96,7 +267,45 @@ class MetadataDeleter(object):
             logger.info("All UUID from the list passed the check.")
         else:
             logger.info("{} UUIDs didn't pass the check.".format(nb_invalid_uuid))
+
+        # only delete the metadata which can be found
+        li_uuid = list(dict.fromkeys(li_uuid))
+        if self.check_existence or self.dependencies:
+            self.to_delete = self._resolve_metadata(li_uuid)
+            self.missing = [
+                uuid
+                for uuid in li_uuid
+                if uuid not in self.to_delete and uuid not in self.unresolved
+            ]
+            li_uuid = [uuid for uuid in li_uuid if uuid in self.to_delete]
+            for uuid in self.missing:
+                self.report.add(
+                    uuid, "missing", error="doesn't exist or is not accessible"
+                )
+            if self.missing:
+                logger.warning(
+                    "{} metadatas don't exist or are not accessible. "
+                    "They're skipped: {}".format(len(self.missing), self.missing)
+                )
+            for uuid, code in self.unresolved.items():
+                self.report.add(
+                    uuid, "unresolved", code=code, error="search of the metadata failed"
+                )
+            if self.unresolved:
+                logger.warning(
+                    "{} metadatas couldn't be checked: their search failed. "
+                    "They're skipped: {}".format(
+                        len(self.unresolved), list(self.unresolved)
+                    )
+                )
         self.nb_to_delete = len(li_uuid)
+        if self.dependencies:
+            self.associations = self._list_associations(self.to_delete)
+            logger.info(
+                "{} service layers associations to dissociate.".format(
+                    len(self.associations)
+                )
+            )
 
         # prepare the list of request to Isogeo API
         self.li_api_routes = []
@@ -106,27 +315,286 @@ class MetadataDeleter(object):
                 {"route": self.isogeo.metadata.delete, "params": {"metadata_id": uuid}}
             )
 
-        # async loop
-        if self.loop.is_closed():
-            logger.debug("Current event loop is already closed. Creating a new one...")
-            self.loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self.loop)
+        return self.li_api_routes
 
-        # Inform the user
-        if self.hard_mode:
-            logger.warning("HARD MODE ACTIVATED >>> {} metadatas gonna be deleted".format(self.nb_to_delete))
-        else:
-            pass
+    def _resolve_metadata(self, li_uuid: list) -> dict:
+        """Retrieve the metadata to delete by chunks of `CHECK_CHUNK_SIZE` searches, \
+        performed simultaneously. Metadata which are not returned by the search don't exist \
+        or are not accessible. Failed searches are retried like the failed deletions (see \
+        `retries` and `backoff`): the metadata of the chunks still failing are stored in \
+        `unresolved`, with the HTTP status code of the failure.
 
-        # launch the task
-        task = self.loop.create_task(self._delete_metadata_asynchronous())
-        self.loop.run_until_complete(task)
+        :param list li_uuid: list of metadata UUID
 
-        logger.info("{}/{} metadatas have been deleted".format(self.nb_deleted, self.nb_to_delete))
+        :returns: metadata as returned by the search, by UUID
+        :rtype: dict
+        """
+        li_chunks = [
+            tuple(li_uuid[i : i + self.CHECK_CHUNK_SIZE])
+            for i in range(0, len(li_uuid), self.CHECK_CHUNK_SIZE)
+        ]
+        bounded_executor = BoundedExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="IsogeoMetadataDeleterCheck_",
+        )
+        di_found = {}
+        di_failed = {}
+        for retry in range(self.retries + 1):
+            if retry:
+                li_chunks = [
+                    chunk
+                    for chunk, code in di_failed.items()
+                    if DeletionReport.is_retryable(code)
+                ]
+                if not li_chunks:
+                    break
+                delay = self.backoff * 2 ** (retry - 1)
+                logger.info(
+                    "Retry {}/{}: {} failed searches retried in {}s.".format(
+                        retry, self.retries, len(li_chunks), delay
+                    )
+                )
+                sleep(delay)
+
+            for chunk, search_results in bounded_executor.map(
+                self._search_chunk, li_chunks
+            ):
+                if isinstance(search_results, tuple):
+                    di_failed[chunk] = (
+                        search_results[1] if len(search_results) > 1 else None
+                    )
+                    continue
+                di_failed.pop(chunk, None)
+                for md in search_results:
+                    if md.get("_id") in chunk:
+                        di_found[md.get("_id")] = md
+
+        self.unresolved = {
+            uuid: code for chunk, code in di_failed.items() for uuid in chunk
+        }
+        return di_found
+
+    def _search_chunk(self, chunk: tuple) -> list:
+        """Search a chunk of metadata. Meant to be executed by the threads of \
+        `_resolve_metadata`.
+
+        :param tuple chunk: metadata UUIDs
+
+        :returns: metadata as returned by the search, or the API error (tuple) if the \
+            search failed
+        :rtype: list
+        """
+        search = self.isogeo.search(
+            query=None,
+            specific_md=chunk,
+            page_size=len(chunk),
+            include=("layers", "serviceLayers") if self.dependencies else (),
+        )
+        if isinstance(search, tuple):
+            logger.error(
+                "Search of the metadata to delete failed: {}. Chunk: {}".format(
+                    search, chunk
+                )
+            )
+            return search
+        return search.results
+
+    # -- DEPENDENCIES ------------------------------------------------------------------
+    @staticmethod
+    def _list_associations(di_metadata: dict) -> dict:
+        """List the service layers associations of the metadata to delete, from both sides: \
+        layers of the services and service layers of the datasets.
+
+        :param dict di_metadata: metadata as returned by the search (with layers and \
+            serviceLayers), by UUID
+
+        :returns: {(service UUID, layer UUID, dataset UUID): dataset type}
+        :rtype: dict
+        """
+        di_associations = {}
+        for md_uuid, md in di_metadata.items():
+            # layers of a service
+            for layer in md.get("layers") or []:
+                li_datasets = list(layer.get("datasets") or [])
+                if layer.get("dataset"):
+                    li_datasets.append(layer.get("dataset"))
+                for dataset in li_datasets:
+                    di_associations[(md_uuid, layer.get("_id"), dataset.get("_id"))] = (
+                        dataset.get("type")
+                    )
+
+            # layers associated to a dataset
+            for service_layer in md.get("serviceLayers") or []:
+                service = service_layer.get("service") or {}
+                di_associations[
+                    (service.get("_id"), service_layer.get("_id"), md_uuid)
+                ] = md.get("type")
+
+        # incomplete payloads can't be dissociated
+        return {k: v for k, v in di_associations.items() if all(k)}
+
+    def _branches(self, li_api_routes):
+        """Group the deletion requests into independent branches: metadata which are not \
+        associated are yielded as soon as they come, associated ones are held and grouped \
+        by connected metadata at the end, with the associations to remove first.
+
+        :param li_api_routes: deletion requests (list or generator)
+
+        :returns: generator of tuples (associations to remove, deletion requests)
+        """
+        with self._lock:
+            li_pending = [i for i in self.associations if i not in self._dissociated]
+        dependent_ids = {i[0] for i in li_pending} | {i[2] for i in li_pending}
+
+        di_held = {}
+        for api_route in li_api_routes:
+            md_uuid = api_route.get("params").get("metadata_id")
+            if md_uuid in dependent_ids:
+                di_held[md_uuid] = api_route
+            else:
+                yield [], [api_route]
+
+        # connected metadata, linked by associations between two of them
+        di_parents = {md_uuid: md_uuid for md_uuid in di_held}
+
+        def root(md_uuid: str) -> str:
+            while di_parents.get(md_uuid) != md_uuid:
+                md_uuid = di_parents.get(md_uuid)
+            return md_uuid
+
+        for service_uuid, layer_uuid, dataset_uuid in li_pending:
+            if service_uuid in di_held and dataset_uuid in di_held:
+                di_parents[root(service_uuid)] = root(dataset_uuid)
+
+        di_branches = {}
+        for md_uuid, api_route in di_held.items():
+            di_branches.setdefault(root(md_uuid), ([], []))[1].append(api_route)
+        for association in li_pending:
+            for md_uuid in (association[0], association[2]):
+                if md_uuid in di_held:
+                    di_branches.get(root(md_uuid))[0].append(association)
+                    break
+
+        for li_associations, li_routes in di_branches.values():
+            yield li_associations, li_routes
+
+    def _delete_branch(self, branch: tuple) -> list:
+        """Remove the associations of a branch then delete its metadata. Meant to be \
+        executed by the threads of `_delete_metadata_asynchronous`.
+
+        :param tuple branch: associations to remove and deletion requests
+
+        :returns: results of the deletions
+        :rtype: list
+        """
+        li_associations, li_api_routes = branch
+        di_failed = {}
+        for association in li_associations:
+            code, error = self._dissociate(association)
+            if error:
+                for md_uuid in (association[0], association[2]):
+                    di_failed[md_uuid] = (code, error)
+
+        li_responses = []
+        for api_route in li_api_routes:
+            md_uuid = api_route.get("params").get("metadata_id")
+            if md_uuid in di_failed:
+                code, error = di_failed.get(md_uuid)
+                self.report.add(md_uuid, "error", code=code, error=error)
+                li_responses.append("error")
+            else:
+                li_responses.append(self._delete_metadata(api_route))
+        return li_responses
+
+    def _dissociate(self, association: tuple) -> tuple:
+        """Remove the association between a service layer and a dataset.
+
+        :param tuple association: service UUID, layer UUID and dataset UUID
+
+        :returns: HTTP status code and error detail, both None if it succeeded
+        :rtype: tuple
+        """
+        service_uuid, layer_uuid, dataset_uuid = association
+        if not self.hard_mode:
+            logger.info(
+                "Soft mode - would dissociate layer {} of service {} from dataset {}".format(
+                    layer_uuid, service_uuid, dataset_uuid
+                )
+            )
+            return None, None
+
+        try:
+            request = self.isogeo.metadata.layers.dissociate_metadata(
+                service=Metadata(_id=service_uuid, type="service"),
+                layer=ServiceLayer(_id=layer_uuid),
+                # the type is only checked by the API client
+                dataset=Metadata(
+                    _id=dataset_uuid,
+                    type=self.associations.get(association) or "vectorDataset",
+                ),
+            )
+        except Exception as e:
+            logger.error(
+                "Dissociation of layer {} of service {} from dataset {} failed: {}".format(
+                    layer_uuid, service_uuid, dataset_uuid, e
+                )
+            )
+            return None, "dissociation failed: {}: {}".format(type(e).__name__, e)
+
+        # already dissociated
+        if isinstance(request, tuple) and request[1:2] != (404,):
+            logger.error(
+                "Dissociation of layer {} of service {} from dataset {} failed: {}".format(
+                    layer_uuid, service_uuid, dataset_uuid, request
+                )
+            )
+            return (
+                request[1] if len(request) > 1 else None,
+                "dissociation failed: API replied with an error: {}".format(request),
+            )
+
+        with self._lock:
+            self._dissociated.add(association)
+        return None, None
+
+    # -- BACKUP ------------------------------------------------------------------------
+    def _verified_routes(self, li_api_routes: list, verify):
+        """Gate the deletion requests by the verification of the backup: requests are yielded \
+        as the metadata are verified.
+
+        :param list li_api_routes: deletion requests, as returned by `_prepare_routes`
+        :param verify: function taking the list of metadata UUIDs and yielding them with \
+            their backup report, as they're verified (`BackupManager.iter_verify` or \
+            `BackupManager.iter_backup`)
+
+        :returns: generator of parameters for `_delete_metadata`
+        """
+        di_routes = {
+            api_route.get("params").get("metadata_id"): api_route
+            for api_route in li_api_routes
+        }
+        for md_uuid, md_report in verify(list(di_routes)):
+            if md_uuid not in di_routes:
+                logger.debug("{} hasn't been requested. Ignored.".format(md_uuid))
+                continue
+            if md_report.get("status") == "verified":
+                yield di_routes.get(md_uuid)
+            else:
+                self.skipped[md_uuid] = md_report
+                self.report.add(
+                    md_uuid,
+                    "skipped",
+                    error="backup is {}".format(md_report.get("status")),
+                )
+                logger.warning(
+                    "Deletion of {} skipped. Backup is {}.".format(
+                        md_uuid, md_report.get("status")
+                    )
+                )
 
     def _delete_metadata(self, func_outname_params: dict):
         """Meta function meant to be executed in async mode.
-        In charge to make the deletion request to the Isogeo API.
+        In charge to make the deletion request to the Isogeo API and to report its result.
 
         :param dict func_outname_params: parameters for the execution. Expected structure:
 
@@ -140,16 +608,27 @@ class MetadataDeleter(object):
         """
         # retrieve Isogeo API route to call
         route_method = func_outname_params.get("route")
+        md_uuid = func_outname_params.get("params").get("metadata_id")
+
+        if not self.hard_mode:
+            md = self.to_delete.get(md_uuid, {})
+            logger.info(
+                "Soft mode - would delete: {} - '{}' ({}) from workgroup {}".format(
+                    md_uuid,
+                    md.get("title"),
+                    md.get("name"),
+                    (md.get("_creator") or {}).get("_id"),
+                )
+            )
+            self.report.add(md_uuid, "soft")
+            return "soft"
+
+        # a failed request may have gone through anyway
+        retried = (self.report.get(md_uuid) or {}).get("attempts", 0) > 0
 
+        start = monotonic()
         try:
-            # use request
-            if self.hard_mode:
-                request = route_method(**func_outname_params.get("params"))
-            else:
-                request = "soft"
-                pass
-            self.nb_deleted += 1
-            return request
+            request = route_method(**func_outname_params.get("params"))
         except Exception as e:
             logger.error(
                 "Deletion failed using route '{route}' with these params '{params}'".format(
@@ -157,29 +636,82 @@ class MetadataDeleter(object):
                 )
             )
             logger.error(e)
+            self.report.add(
+                md_uuid,
+                "error",
+                latency=monotonic() - start,
+                error="{}: {}".format(type(e).__name__, e),
+                attempt=True,
+            )
+            return "error"
+
+        # the API client returns a tuple when the API replied with an error
+        if isinstance(request, tuple) and retried and request[1:2] == (404,):
+            logger.info(
+                "{} is already gone: its previous deletion request went through.".format(
+                    md_uuid
+                )
+            )
+            self.report.add(
+                md_uuid,
+                "deleted",
+                latency=monotonic() - start,
+                code=404,
+                error="already gone after a failed attempt",
+                attempt=True,
+            )
+            return request
+        if isinstance(request, tuple):
+            logger.error("Deletion of {} failed: {}".format(md_uuid, request))
+            self.report.add(
+                md_uuid,
+                "error",
+                latency=monotonic() - start,
+                code=request[1] if len(request) > 1 else None,
+                error="API replied with an error: {}".format(request),
+                attempt=True,
+            )
             return "error"
 
+        self.report.add(md_uuid, "deleted", latency=monotonic() - start, attempt=True)
+        return request
+
     # -- ASYNC METHODS -----------------------------------------------------------------
-    async def _delete_metadata_asynchronous(self):
-        """Async loop builder."""
-        with ThreadPoolExecutor(
-            max_workers=5, thread_name_prefix="IsogeoMetadataDeleter_"
-        ) as executor:
-            # Set any session parameters here before calling `fetch`
-            loop = asyncio.get_event_loop()
-            tasks = [
-                loop.run_in_executor(
-                    executor,
-                    self._delete_metadata,
-                    # Allows us to pass in multiple arguments to `fetch`
-                    *(api_route,),
-                )
-                for api_route in self.li_api_routes
-            ]
+    async def _delete_metadata_asynchronous(self, executor: ThreadPoolExecutor = None):
+        """Async loop builder. Only a window of deletions is in flight and the results are \
+        stored as they're completed. Then the failed deletions worth it are retried, after \
+        an increasing delay.
 
-            # store responses
-            for response in await asyncio.gather(*tasks):
-                self.deleted.append(response)
+        :param ThreadPoolExecutor executor: pool of threads to use. Defaults to None (a new \
+            one of `max_workers` threads)
+        """
+        bounded_executor = BoundedExecutor(
+            max_workers=self.max_workers,
+            executor=executor,
+            thread_name_prefix="IsogeoMetadataDeleter_",
+        )
+        li_api_routes = self.li_api_routes
+        for retry in range(self.retries + 1):
+            if retry:
+                li_failures = self.report.failures(retryable=True)
+                if not li_failures:
+                    break
+                delay = self.backoff * 2 ** (retry - 1)
+                logger.info(
+                    "Retry {}/{}: {} failed deletions retried in {}s.".format(
+                        retry, self.retries, len(li_failures), delay
+                    )
+                )
+                await asyncio.sleep(delay)
+                li_api_routes = [
+                    {"route": self.isogeo.metadata.delete, "params": {"metadata_id": i}}
+                    for i in li_failures
+                ]
+
+            async for branch, li_responses in bounded_executor.amap(
+                self._delete_branch, self._branches(li_api_routes)
+            ):
+                self.deleted.extend(li_responses)
 
 
 # #############################################################################
@@ -0,0 +1,206 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa: E265
+
+# ------------------------------------------------------------------------------
+# Name:         Deletion Report
+# Purpose:      Thread-safe result of a bulk deletion, by metadata
+# Author:       Isogeo
+#
+# Python:       3.6+
+# ------------------------------------------------------------------------------
+
+# ##############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import csv
+import json
+import logging
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class DeletionReport(object):
+    """Result of a bulk deletion by metadata, filled by the threads of MetadataDeleter: \
+    status, number of attempts, latency of the last attempt and error detail.
+
+    Status of the metadata:
+
+      - "deleted": deleted (hard mode). A retried deletion answered by a 404 is deleted \
+        too: the failed attempt went through
+      - "soft": would have been deleted (soft mode)
+      - "error": deletion request failed (see `failures` to retry it)
+      - "missing": doesn't exist or is not accessible (pre-flight check)
+      - "unresolved": not deleted because its search failed (pre-flight check), even \
+        after the retries. Its deletion can be requested again
+      - "skipped": not deleted because its backup is not verified
+
+    :Example:
+
+    .. code-block:: python
+
+        md_dltr = MetadataDeleter(api_client=isogeo)
+        md_dltr.delete(metadata_ids_list=li_uuid, hard_mode=1)
+
+        print(md_dltr.report.counts())
+        md_dltr.report.to_csv("./_output/deletion_report.csv")
+
+    """
+
+    FIELDS = ("uuid", "status", "attempts", "latency", "code", "error", "updated")
+
+    def __init__(self):
+        self._lock = Lock()
+        self._items = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, metadata_id: str) -> bool:
+        return metadata_id in self._items
+
+    # -- WRITE -------------------------------------------------------------------------
+    def add(
+        self,
+        metadata_id: str,
+        status: str,
+        latency: float = None,
+        code: int = None,
+        error: str = None,
+        attempt: bool = False,
+    ) -> dict:
+        """Record the status of a metadata. It replaces its previous status.
+
+        :param str metadata_id: metadata UUID
+        :param str status: status of the metadata (see the class documentation)
+        :param float latency: duration of the deletion request, in seconds. Defaults to None
+        :param int code: HTTP status code of a failed request. Defaults to None
+        :param str error: error detail. Defaults to None
+        :param bool attempt: a deletion request was sent. Defaults to False
+
+        :returns: the item of the report
+        :rtype: dict
+        """
+        with self._lock:
+            previous_item = self._items.get(metadata_id) or {}
+            item = {
+                "uuid": metadata_id,
+                "status": status,
+                "attempts": previous_item.get("attempts", 0) + int(attempt),
+                "latency": round(latency, 3) if latency is not None else None,
+                "code": code,
+                "error": error,
+                "updated": datetime.now().isoformat(),
+            }
+            self._items[metadata_id] = item
+        return item
+
+    # -- READ --------------------------------------------------------------------------
+    def get(self, metadata_id: str) -> dict:
+        """Item of a metadata.
+
+        :param str metadata_id: metadata UUID
+
+        :returns: the item or None if the metadata is not reported
+        :rtype: dict
+        """
+        with self._lock:
+            item = self._items.get(metadata_id)
+        return dict(item) if item else None
+
+    def items(self) -> list:
+        """Items of the report, in the order the metadata were first reported.
+
+        :rtype: list
+        """
+        with self._lock:
+            return [dict(item) for item in self._items.values()]
+
+    def count(self, *statuses) -> int:
+        """Number of metadata with one of the statuses.
+
+        :param str statuses: statuses to count
+        """
+        with self._lock:
+            return sum(1 for i in self._items.values() if i.get("status") in statuses)
+
+    def counts(self) -> dict:
+        """Number of metadata by status.
+
+        :rtype: dict
+        """
+        with self._lock:
+            return dict(Counter(i.get("status") for i in self._items.values()))
+
+    def failures(self, retryable: bool = False) -> list:
+        """UUIDs of the metadata whose deletion failed.
+
+        :param bool retryable: only the failures worth a retry: network errors, server \
+            errors (5xx) and rate limiting (429). Defaults to False
+
+        :rtype: list
+        """
+        with self._lock:
+            return [
+                item.get("uuid")
+                for item in self._items.values()
+                if item.get("status") == "error"
+                and (not retryable or self.is_retryable(item.get("code")))
+            ]
+
+    @staticmethod
+    def is_retryable(code: int) -> bool:
+        """Tell if a failed deletion is worth a retry, from its HTTP status code.
+
+        :param int code: HTTP status code (None for network errors)
+        """
+        return code is None or code == 429 or code >= 500
+
+    # -- EXPORT ------------------------------------------------------------------------
+    def to_csv(self, path: str, delimiter: str = ";") -> Path:
+        """Export the report to a CSV file.
+
+        :param str path: path to the CSV file
+        :param str delimiter: CSV delimiter. Defaults to ";"
+
+        :rtype: Path
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="UTF-8", newline="") as out_csv:
+            writer = csv.DictWriter(
+                out_csv, fieldnames=self.FIELDS, delimiter=delimiter
+            )
+            writer.writeheader()
+            writer.writerows(self.items())
+        logger.info("Deletion report exported: {}".format(path.resolve()))
+        return path
+
+    def to_jsonl(self, path: str) -> Path:
+        """Export the report to a JSON Lines file: one item by line.
+
+        :param str path: path to the JSON Lines file
+
+        :rtype: Path
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="UTF-8") as out_jsonl:
+            for item in self.items():
+                out_jsonl.write(json.dumps(item, sort_keys=True) + "\n")
+        logger.info("Deletion report exported: {}".format(path.resolve()))
+        return path
@@ -2,3 +2,7 @@
 #! python3  # noqa: E265 F401
 
 from .duplicator import MetadataDuplicator  # noqa: F401
+from .handle import MetadataHandle  # noqa: F401
+from .journal import DuplicationJournal  # noqa: F401
+from .keyword_cache import KeywordCache  # noqa: F401
+from .workgroup_cache import WorkgroupReferenceCache  # noqa: F401
@@ -14,10 +14,13 @@
 # ##################################
 
 # Standard library
+import json
 import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from copy import copy
+from functools import partial
 from os import environ
-from time import sleep
 from uuid import UUID
 
 # 3rd party
@@ -32,14 +35,21 @@ from isogeo_pysdk.models import (
     Contact,
     CoordinateSystem,
     Event,
+    Keyword,
     Limitation,
     Link,
     Metadata,
     ServiceLayer,
     Specification,
-    Workgroup,
 )
 
+# submodules
+from .handle import MetadataHandle
+from .journal import DuplicationJournal
+from .keyword_cache import KeywordCache
+from .workgroup_cache import WorkgroupReferenceCache
+from ..utils import RateLimiter
+
 # #############################################################################
 # ######## Globals #################
 # ##################################
@@ -58,11 +68,31 @@ class MetadataDuplicator(object):
 
     :param Isogeo api_client: already authenticated Isogeo client to use to performe API operations
     :param UUID source_metadata_uuid: UUID of the metadata to be duplicated (source)
+    :param int max_workers: number of threads used to import the sub-resources once the \
+        destination metadata exists. Below 2, sub-resources are imported one by one. Either \
+        way, failures are stored into `subresources_report`. Defaults to 0
+    :param KeywordCache keyword_cache: keywords cache to share between the duplicators of a run. \
+        Defaults to None (a new one is used)
+    :param Metadata source_metadata: source metadata already loaded with all its subresources \
+        (`include="all"`). Defaults to None (it's retrieved from the API)
+    :param RateLimiter rate_limiter: rate limiter pacing the API requests. Defaults to None \
+        (the one already installed on the API client or the shared one)
+    :param DuplicationJournal journal: journal recording the completed steps, to resume an \
+        interrupted duplication when it's launched again. Defaults to None (no journal)
     """
 
-    def __init__(self, api_client: Isogeo, source_metadata_uuid: UUID):
-        # store API client
-        self.isogeo = api_client
+    def __init__(
+        self,
+        api_client: Isogeo,
+        source_metadata_uuid: UUID,
+        max_workers: int = 0,
+        keyword_cache: KeywordCache = None,
+        source_metadata: Metadata = None,
+        rate_limiter: RateLimiter = None,
+        journal: DuplicationJournal = None,
+    ):
+        # store API client, paced by the rate limiter
+        self.isogeo = RateLimiter.apply(api_client, rate_limiter)
 
         # check metadatas UUID
         if not checker.check_is_uuid(source_metadata_uuid):
@@ -75,9 +105,140 @@ class MetadataDuplicator(object):
             pass
 
         # store the source metadata
-        self.metadata_source = self.isogeo.metadata.get(
-            metadata_id=source_metadata_uuid, include="all"
+        if source_metadata is None:
+            self.metadata_source = self.isogeo.metadata.get(
+                metadata_id=source_metadata_uuid, include="all"
+            )
+        elif source_metadata._id != source_metadata_uuid:
+            raise ValueError(
+                "Passed source metadata ({}) doesn't match the source metadata UUID: {}".format(
+                    source_metadata._id, source_metadata_uuid
+                )
+            )
+        else:
+            self.metadata_source = source_metadata
+
+        # sub-resources import settings
+        self.max_workers = max_workers
+        self.subresources_report = {}
+        self.subresources_removals_report = {}
+
+        # keywords cache
+        if keyword_cache is None:
+            keyword_cache = KeywordCache(api_client=self.isogeo)
+        self.keyword_cache = keyword_cache
+
+        # checkpoints
+        self.journal = journal
+
+    @classmethod
+    def from_uuids(
+        cls,
+        api_client: Isogeo,
+        source_metadata_uuids: list,
+        chunk_size: int = 50,
+        load_workers: int = 4,
+        **kwargs
+    ) -> dict:
+        """Load many source metadata at once, using chunked searches instead of one request \
+        per metadata, and return ready-to-use duplicators.
+
+        :param Isogeo api_client: already authenticated Isogeo client to use to performe API operations
+        :param list source_metadata_uuids: UUIDs of the metadata to be duplicated (sources)
+        :param int chunk_size: number of metadata loaded by each search (100 max). Defaults to 50
+        :param int load_workers: number of searches launched simultaneously. Defaults to 4
+        :param kwargs: other parameters passed to each MetadataDuplicator (max_workers, keyword_cache, \
+            rate_limiter, journal...)
+
+        :returns: duplicators by source metadata UUID, in the order of the passed list. \
+            Invalid UUIDs and metadata which can't be retrieved are logged and left out.
+        :rtype: dict
+
+        :Example:
+
+        .. code-block:: python
+
+            # load sources by chunks of 50
+            di_duplicators = MetadataDuplicator.from_uuids(
+                api_client=isogeo, source_metadata_uuids=li_src_uuids
+            )
+
+            for src_uuid, trg_uuid in li_to_migrate:
+                md_duplicator = di_duplicators.get(src_uuid)
+                if md_duplicator is None:
+                    continue
+                md_duplicator.import_into_other_metadata(destination_metadata_uuid=trg_uuid)
+
+        """
+        # pace the API client before loading
+        api_client = RateLimiter.apply(api_client, kwargs.get("rate_limiter"))
+
+        # check the UUID list content validity
+        li_uuids = []
+        for uuid in source_metadata_uuids:
+            if not checker.check_is_uuid(uuid):
+                logger.error("{} is not a valid UUID. It's ignored.".format(uuid))
+            elif uuid not in li_uuids:
+                li_uuids.append(uuid)
+
+        # split into chunks
+        chunk_size = max(1, min(chunk_size, 100))
+        li_chunks = [
+            li_uuids[i : i + chunk_size] for i in range(0, len(li_uuids), chunk_size)
+        ]
+
+        # search by chunks
+        di_sources = {}
+        with ThreadPoolExecutor(
+            max_workers=max(1, load_workers),
+            thread_name_prefix="IsogeoMetadataDuplicatorLoader_",
+        ) as executor:
+            di_futures = {
+                executor.submit(
+                    api_client.search,
+                    specific_md=tuple(chunk),
+                    include="all",
+                    page_size=len(chunk),
+                    check=0,
+                ): chunk
+                for chunk in li_chunks
+            }
+            for future in as_completed(di_futures):
+                try:
+                    search = future.result()
+                except Exception as e:
+                    search = (False, e)
+                if isinstance(search, tuple):
+                    logger.error(
+                        "Search of {} source metadata failed: {}".format(
+                            len(di_futures.get(future)), search[1]
+                        )
+                    )
+                    continue
+                for md in search.results:
+                    di_sources[md.get("_id")] = Metadata.clean_attributes(md)
+
+        # build duplicators
+        di_duplicators = {}
+        for uuid in li_uuids:
+            if uuid not in di_sources:
+                logger.error(
+                    "Source metadata {} can't be found. It's ignored.".format(uuid)
+                )
+                continue
+            di_duplicators[uuid] = cls(
+                api_client=api_client,
+                source_metadata_uuid=uuid,
+                source_metadata=di_sources.get(uuid),
+                **kwargs
+            )
+
+        logger.info(
+            "{}/{} source metadata loaded in {} searches.".format(
+                len(di_duplicators), len(li_uuids), len(li_chunks)
+            )
         )
+        return di_duplicators
 
     # -- DUPLICATION MODES -----------------------------------------------------------------
     def duplicate_into_same_group(
@@ -87,6 +248,7 @@ class MetadataDuplicator(object):
         copymark_abstract: bool = True,
         exclude_catalogs: list = [],
         switch_service_layers: bool = False,
+        refetch: bool = True,
     ) -> Metadata:
         """Create an exact copy of the metadata source in the same workgroup.
         It can apply some copy marks to distinguish the copy from the original.
@@ -97,8 +259,10 @@ class MetadataDuplicator(object):
         :param list exclude_catalogs: list of catalogs UUID's to not associate to destination metadata
         :param bool switch_service_layers: a service layer can't be associated to many datasetes. \
             If this option is enabled, service layers are removed from the metadata source then added to the new one. Defaults to False
+        :param bool refetch: retrieve the complete new metadata at the end. If disabled, a \
+            lightweight MetadataHandle is returned instead. Defaults to True
 
-        :returns: the newly created Metadata
+        :returns: the newly created Metadata (or MetadataHandle)
         :rtype: Metadata
 
         .. code-block:: python
@@ -128,8 +292,14 @@ class MetadataDuplicator(object):
             else:
                 md_to_create.abstract = copymark_txt
 
+        # resume a previous run of this duplication if it's journaled
+        journal_run = ("same_group", self.metadata_source._creator.get("_id"))
+        md_dst = self._journal_resume(*journal_run)
+
         # create it online: it will create only the attributes which are at the base
-        if self.metadata_source.type == "service":
+        if md_dst is not None:
+            pass
+        elif self.metadata_source.type == "service":
             # if it's a service, so use the helper
             md_dst = self.isogeo.services.create(
                 workgroup_id=self.metadata_source._creator.get("_id"),
@@ -145,16 +315,18 @@ class MetadataDuplicator(object):
                 metadata=md_to_create,
             )
 
+        if self.journal is not None:
+            self.journal.start(self.metadata_source._id, *journal_run, md_dst._id)
+
         logger.info(
             "Duplicate has been created: {} ({}). Let's import the associated resources and subresources.".format(
                 md_dst.title, md_dst._id
             )
         )
 
-        # let the API get a rest ;)
-        sleep(0.5)
-
         # NOW PERFORM DUPLICATION OF SUBRESOURCES
+        li_jobs = []
+
         # Catalogs
         li_catalogs_uuids = [
             tag[8:] for tag in self.metadata_source.tags if tag.startswith("catalog:") and tag[8:] not in exclude_catalogs
@@ -162,112 +334,107 @@ class MetadataDuplicator(object):
         if copymark_catalog is not None:
             li_catalogs_uuids.append(copymark_catalog)
 
-        if len(li_catalogs_uuids):
-            for cat_uuid in li_catalogs_uuids:
-                # retrieve online catalog
-                catalog = self.isogeo.catalog.get(
-                    workgroup_id=self.metadata_source._creator.get("_id"),
-                    catalog_id=cat_uuid,  # CHANGE IT with SDK version >= 3.0.1
+        for cat_uuid in li_catalogs_uuids:
+            li_jobs.append(
+                (
+                    "catalogs",
+                    self._import_catalog,
+                    {"metadata": md_dst, "catalog_uuid": cat_uuid},
                 )
-                # associate the metadata with
-                self.isogeo.catalog.associate_metadata(metadata=md_dst, catalog=catalog)
-            logger.info("{} catalogs imported.".format(len(li_catalogs_uuids)))
+            )
 
         # Conditions / Licenses (CGUs)
-        if len(self.metadata_source.conditions):
-            for condition in self.metadata_source.conditions:
-                in_cond = Condition(**condition)
-                self.isogeo.metadata.conditions.create(
-                    metadata=md_dst, condition=in_cond
-                )
-            logger.info(
-                "{} conditions (license + specific description) have been imported.".format(
-                    len(self.metadata_source.conditions)
+        for condition in self.metadata_source.conditions:
+            li_jobs.append(
+                (
+                    "conditions",
+                    self.isogeo.metadata.conditions.create,
+                    {"metadata": md_dst, "condition": Condition(**condition)},
                 )
             )
 
         # Contacts
-        if len(self.metadata_source.contacts):
-            for ct in self.metadata_source.contacts:
-                contact = Contact(**ct.get("contact"))
-                self.isogeo.contact.associate_metadata(
-                    metadata=md_dst, contact=contact, role=ct.get("role")
+        for ct in self.metadata_source.contacts:
+            li_jobs.append(
+                (
+                    "contacts",
+                    self._import_contact,
+                    {"metadata": md_dst, "contact_role": ct},
                 )
-            logger.info(
-                "{} contacts imported.".format(len(self.metadata_source.contacts))
             )
 
         # Coordinate-systems
         if isinstance(self.metadata_source.coordinateSystem, dict):
-            srs = CoordinateSystem(**self.metadata_source.coordinateSystem)
-            self.isogeo.srs.associate_metadata(metadata=md_dst, coordinate_system=srs)
-            logger.info("Coordinate-system {} imported.".format(srs.code))
+            li_jobs.append(
+                (
+                    "coordinateSystem",
+                    self._import_coordinate_system,
+                    {"metadata": md_dst},
+                )
+            )
 
         # Events
-        if len(self.metadata_source.events):
-            for evt in self.metadata_source.events:
-                event = Event(**evt)
-                event.date = event.date[:10]
-                self.isogeo.metadata.events.create(metadata=md_dst, event=event)
-            logger.info(
-                "{} events have been imported.".format(len(self.metadata_source.events))
+        for evt in self.metadata_source.events:
+            event = Event(**evt)
+            event.date = event.date[:10]
+            li_jobs.append(
+                (
+                    "events",
+                    self.isogeo.metadata.events.create,
+                    {"metadata": md_dst, "event": event},
+                )
             )
 
         # Feature attributes
         if self.metadata_source.type == "vectorDataset" and len(
             self.metadata_source.featureAttributes
         ):
-            self.isogeo.metadata.attributes.import_from_dataset(
-                metadata_source=self.metadata_source, metadata_dest=md_dst
-            )
-            logger.info(
-                "{} feature attributes have been imported.".format(
-                    len(self.metadata_source.featureAttributes)
+            li_jobs.append(
+                (
+                    "featureAttributes",
+                    self.isogeo.metadata.attributes.import_from_dataset,
+                    {"metadata_source": self.metadata_source, "metadata_dest": md_dst},
                 )
             )
 
         # Keywords (including INSPIRE themes)
-        li_keywords = self.isogeo.metadata.keywords(self.metadata_source, include=[])
-        if len(li_keywords):
-            for kwd in li_keywords:
-                # retrieve online keyword
-                keyword = self.isogeo.keyword.get(keyword_id=kwd.get("_id"), include=[])
-                # associate the metadata with
-                self.isogeo.keyword.tagging(
-                    metadata=md_dst, keyword=keyword, check_exists=1
-                )
-            logger.info("{} keywords imported.".format(len(li_keywords)))
+        li_dst_tags = md_dst.tags or []
+        for kwd in self._source_keywords():
+            # no need to tag again the destination metadata
+            if kwd.get("_tag") in li_dst_tags:
+                continue
+            li_jobs.append(
+                ("keywords", self._import_keyword, {"metadata": md_dst, "keyword": kwd})
+            )
 
         # Limitations (CGUs)
-        if len(self.metadata_source.limitations):
-            for lim in self.metadata_source.limitations:
-                limitation = Limitation(**lim)
-                self.isogeo.metadata.limitations.create(
-                    metadata=md_dst, limitation=limitation
-                )
-            logger.info(
-                "{} limitations have been imported.".format(
-                    len(self.metadata_source.limitations)
+        for lim in self.metadata_source.limitations:
+            li_jobs.append(
+                (
+                    "limitations",
+                    self.isogeo.metadata.limitations.create,
+                    {"metadata": md_dst, "limitation": Limitation(**lim)},
                 )
             )
 
         # Links (only URLs)
-        if len(self.metadata_source.links):
-            counter_links = 0
-            for lk in self.metadata_source.links:
-                link = Link(**lk)
-                # ignore hosted links
-                if link.type == "hosted":
-                    logger.info(
-                        "Hosted links can't be migrated, so this link has been ignored: {}".format(
-                            link.title
-                        )
+        for lk in self.metadata_source.links:
+            link = Link(**lk)
+            # ignore hosted links
+            if link.type == "hosted":
+                logger.info(
+                    "Hosted links can't be migrated, so this link has been ignored: {}".format(
+                        link.title
                     )
-                    continue
-                # add the link
-                self.isogeo.metadata.links.create(metadata=md_dst, link=link)
-                # increase counter
-                counter_links += 1
+                )
+                continue
+            li_jobs.append(
+                (
+                    "links",
+                    self.isogeo.metadata.links.create,
+                    {"metadata": md_dst, "link": link},
+                )
+            )
 
         # Service layers associated
         if self.metadata_source.type in ("rasterDataset", "vectorDataset") and len(
@@ -275,29 +442,13 @@ class MetadataDuplicator(object):
         ):
             if switch_service_layers:
                 for service_layer in self.metadata_source.serviceLayers:
-                    # remove the layer from the source
-                    self.isogeo.metadata.layers.dissociate_metadata(
-                        service=Metadata(
-                            _id=service_layer.get("service").get("_id"), type="service"
-                        ),
-                        layer=ServiceLayer(_id=service_layer.get("_id")),
-                        dataset=self.metadata_source,
-                    )
-
-                    # add the layer to the copy
-                    self.isogeo.metadata.layers.associate_metadata(
-                        service=Metadata(
-                            _id=service_layer.get("service").get("_id"), type="service"
-                        ),
-                        layer=ServiceLayer(_id=service_layer.get("_id")),
-                        dataset=md_dst,
-                    )
-
-                logger.info(
-                    "{} service layers have been imported after they have been removed from the source.".format(
-                        len(self.metadata_source.serviceLayers)
+                    li_jobs.append(
+                        (
+                            "serviceLayers",
+                            self._switch_service_layer,
+                            {"metadata": md_dst, "service_layer": service_layer},
+                        )
                     )
-                )
             else:
                 logger.info(
                     "{} service layers have NOT been imported because they stay associated with the source.".format(
@@ -306,23 +457,30 @@ class MetadataDuplicator(object):
                 )
 
         # Specifications
-        if len(self.metadata_source.specifications):
-            for spec in self.metadata_source.specifications:
-                specification = Specification(**spec.get("specification"))
-                isConformant = spec.get("conformant")
-                self.isogeo.specification.associate_metadata(
-                    metadata=md_dst,
-                    specification=specification,
-                    conformity=isConformant,
-                )
-            logger.info(
-                "{} specifications have been imported.".format(
-                    len(self.metadata_source.specifications)
+        for spec in self.metadata_source.specifications:
+            li_jobs.append(
+                (
+                    "specifications",
+                    self._import_specification,
+                    {"metadata": md_dst, "specification_link": spec},
                 )
             )
 
+        # send the sub-resources to the API
+        self._run_subresources_jobs(li_jobs, journal_run=journal_run)
+        self._journal_complete(journal_run)
+
         # return final metadata
-        return self.isogeo.metadata.get(metadata_id=md_dst._id, include="all")
+        if refetch:
+            return self.isogeo.metadata.get(metadata_id=md_dst._id, include="all")
+        # services are created from their title, URL and format only: the helper returns
+        # the metadata as it's stored
+        return MetadataHandle.from_creation(
+            api_client=self.isogeo,
+            metadata_sent=md_to_create,
+            metadata_created=md_dst,
+            attributes_sent=() if self.metadata_source.type == "service" else None,
+        )
 
     def duplicate_into_other_group(
         self,
@@ -331,7 +489,9 @@ class MetadataDuplicator(object):
         copymark_title: bool = True,
         copymark_abstract: bool = True,
         exclude_catalogs: list = [],
-        exclude_subresources: list = []
+        exclude_subresources: list = [],
+        workgroup_cache: WorkgroupReferenceCache = None,
+        refetch: bool = True,
     ) -> Metadata:
         """Create an exact copy of the metadata source into another workgroup.
         It can apply some copy marks to distinguish the copy from the original.
@@ -341,8 +501,12 @@ class MetadataDuplicator(object):
         :param bool copymark_abstract: add a [Copied from](./source_uuid)] mark at the end of the new metadata abstract. Defaults to True
         :param list exclude_catalogs: list of catalogs UUID's to not associate to destination metadata
         :param list exclude_subresources : list of subressources to be excluded. Must be metadata attributes names
+        :param WorkgroupReferenceCache workgroup_cache: cache of the destination workgroup, to share \
+            between many duplications into the same workgroup. Defaults to None (a new one is used)
+        :param bool refetch: retrieve the complete new metadata at the end. If disabled, a \
+            lightweight MetadataHandle is returned instead. Defaults to True
 
-        :returns: the newly created Metadata
+        :returns: the newly created Metadata (or MetadataHandle)
         :rtype: Metadata
 
         :Example:
@@ -368,10 +532,20 @@ class MetadataDuplicator(object):
         else:
             pass
 
+        # check workgroup cache
+        if workgroup_cache is None:
+            workgroup_cache = WorkgroupReferenceCache(
+                api_client=self.isogeo, workgroup_uuid=destination_workgroup_uuid
+            )
+        elif workgroup_cache.workgroup_uuid != destination_workgroup_uuid:
+            raise ValueError(
+                "Workgroup cache ({}) doesn't match the destination workgroup: {}".format(
+                    workgroup_cache.workgroup_uuid, destination_workgroup_uuid
+                )
+            )
+
         # check if workgroup can create metadata
-        dest_group_obj = self.isogeo.workgroup.get(
-            workgroup_id=destination_workgroup_uuid
-        )
+        dest_group_obj = workgroup_cache.workgroup
         if dest_group_obj.canCreateMetadata is not True:
             logger.warning(
                 "Workgroup '{}' is not allowed to create metadata. Changing that...".format(
@@ -379,7 +553,9 @@ class MetadataDuplicator(object):
                 )
             )
             dest_group_obj.canCreateMetadata = True
-            dest_group_obj = self.isogeo.workgroup.update(workgroup=dest_group_obj)
+            workgroup_cache.workgroup = self.isogeo.workgroup.update(
+                workgroup=dest_group_obj
+            )
 
         # duplicate local metadata
         md_to_create = copy(self.metadata_source)
@@ -395,8 +571,14 @@ class MetadataDuplicator(object):
             md_to_create.abstract = "{}\n\n----\n\n > {}".format(
                 md_to_create.abstract, copymark_abstract_txt
             )
+        # resume a previous run of this duplication if it's journaled
+        journal_run = ("other_group", destination_workgroup_uuid)
+        md_dst = self._journal_resume(*journal_run)
+
         # create it online: it will create only the attributes which are at the base
-        if self.metadata_source.type == "service":
+        if md_dst is not None:
+            pass
+        elif self.metadata_source.type == "service":
             # if it's a service, so use the helper
             md_dst = self.isogeo.services.create(
                 workgroup_id=destination_workgroup_uuid,
@@ -411,20 +593,20 @@ class MetadataDuplicator(object):
                 workgroup_id=destination_workgroup_uuid, metadata=md_to_create
             )
 
+        if self.journal is not None:
+            self.journal.start(self.metadata_source._id, *journal_run, md_dst._id)
+
         logger.info(
             "Duplicate has been created: {} ({}). Let's import the associated resources and subresources.".format(
                 md_dst.title, md_dst._id
             )
         )
 
-        # let the API get a rest ;)
-        sleep(0.5)
-
         # NOW PERFORM DUPLICATION OF SUBRESOURCES
+        li_jobs = []
 
         # Catalogs
 
-        # list and cache catalogs in the destination workgroup
         # parse source metadata catalogs
         li_catalogs_uuids = [
             tag[8:] for tag in self.metadata_source.tags if tag.startswith("catalog:") and tag[8:] not in exclude_catalogs
@@ -433,249 +615,147 @@ class MetadataDuplicator(object):
         if copymark_catalog is not None:
             li_catalogs_uuids.append(copymark_catalog)
 
-        if len(li_catalogs_uuids):
-            # retrieve catalogs fo the destination group to match with source
-            self.isogeo.catalog.listing(
-                workgroup_id=destination_workgroup_uuid, include=(), caching=1
-            )
-            for cat_uuid in li_catalogs_uuids:
-                # retrieve online catalog
-                src_catalog = self.isogeo.catalog.get(
-                    workgroup_id=self.metadata_source._creator.get("_id"),
-                    catalog_id=cat_uuid,
-                )
-
-                # compare catalog name with destination group catalogs
-                if src_catalog.name in self.isogeo._wg_catalogs_names:
-                    dest_catalog = Catalog(
-                        _id=self.isogeo._wg_catalogs_names.get(src_catalog.name)
-                    )
-                    logger.info(
-                        "A catalog with the name '{}' already exists in the destination group. It'll be used.".format(
-                            src_catalog.name
-                        )
-                    )
-                else:
-                    # create it on the new group
-                    dest_catalog = self.isogeo.catalog.create(
-                        workgroup_id=destination_workgroup_uuid,
-                        catalog=src_catalog,
-                        check_exists=1,
-                    )
-                    logger.info(
-                        "Catalog '{}' has been created in the destination group. It'll be used.".format(
-                            src_catalog.name
-                        )
-                    )
-
-                # associate the metadata with the catalog of the destination group
-                self.isogeo.catalog.associate_metadata(
-                    metadata=md_dst, catalog=dest_catalog
+        for cat_uuid in li_catalogs_uuids:
+            li_jobs.append(
+                (
+                    "catalogs",
+                    self._import_catalog,
+                    {
+                        "metadata": md_dst,
+                        "catalog_uuid": cat_uuid,
+                        "workgroup_cache": workgroup_cache,
+                    },
                 )
-            logger.info("{} catalogs imported.".format(len(li_catalogs_uuids)))
+            )
 
         # Conditions / Licenses (CGUs)
-        if len(self.metadata_source.conditions):
-            for condition in self.metadata_source.conditions:
-                in_cond = Condition(**condition)
-                self.isogeo.metadata.conditions.create(
-                    metadata=md_dst, condition=in_cond
-                )
-            logger.info(
-                "{} conditions (license + specific description) have been imported.".format(
-                    len(self.metadata_source.conditions)
+        for condition in self.metadata_source.conditions:
+            li_jobs.append(
+                (
+                    "conditions",
+                    self.isogeo.metadata.conditions.create,
+                    {"metadata": md_dst, "condition": Condition(**condition)},
                 )
             )
 
         # Contacts
-        if len(self.metadata_source.contacts):
-            # list and cache contacts in the destination workgroup
-            self.isogeo.contact.listing(
-                workgroup_id=destination_workgroup_uuid, include=(), caching=1
-            )
-
-            for ct in self.metadata_source.contacts:
-                src_contact = Contact(**ct.get("contact"))
-                if src_contact.type == "custom":
-                    logger.info(
-                        "Custom contact spotted: {} ({})".format(
-                            src_contact.name, src_contact.email
-                        )
-                    )
-                    # compare contact email with destination group contacts
-                    if (
-                        isinstance(src_contact.email, str)
-                        and src_contact.email in self.isogeo._wg_contacts_emails
-                    ):
-                        dest_contact = Contact(
-                            _id=self.isogeo._wg_contacts_emails.get(src_contact.email)
-                        )
-                        logger.info(
-                            "A contact ({}) with the email ({}) already exists in the destination group (shared group or address-book). It'll be used.".format(
-                                src_contact._id, src_contact.email
-                            )
-                        )
-                    else:
-                        # create it on the new group
-                        dest_contact = self.isogeo.contact.create(
-                            workgroup_id=destination_workgroup_uuid,
-                            contact=src_contact,
-                            check_exists=1,
-                        )
-                        logger.info(
-                            "Contact '{}' has been created in the destination group. It'll be used.".format(
-                                src_contact.name
-                            )
-                        )
-                else:
-                    logger.info(
-                        "Contact group identified: {}. No need to enlarge the address-book.".format(
-                            src_contact.name
-                        )
-                    )
-                    dest_contact = src_contact
-
-                # associate the contact with the metadata
-                self.isogeo.contact.associate_metadata(
-                    metadata=md_dst, contact=dest_contact, role=ct.get("role")
+        for ct in self.metadata_source.contacts:
+            li_jobs.append(
+                (
+                    "contacts",
+                    self._import_contact,
+                    {
+                        "metadata": md_dst,
+                        "contact_role": ct,
+                        "workgroup_cache": workgroup_cache,
+                    },
                 )
-            logger.info(
-                "{} contacts imported.".format(len(self.metadata_source.contacts))
             )
 
         # Coordinate-systems
         if isinstance(self.metadata_source.coordinateSystem, dict):
-            srs = CoordinateSystem(**self.metadata_source.coordinateSystem)
-            # first check if the SRS is already available in the destination group
-            group_srs = self.isogeo.srs.listing(workgroup_id=destination_workgroup_uuid)
-            group_srs = [coordsys.get("code") for coordsys in group_srs]
-
-            # if it's not present, so add it
-            if srs.code not in group_srs:
-                self.isogeo.srs.associate_workgroup(
-                    workgroup=Workgroup(_id=destination_workgroup_uuid),
-                    coordinate_system=srs,
+            li_jobs.append(
+                (
+                    "coordinateSystem",
+                    self._import_coordinate_system,
+                    {"metadata": md_dst, "workgroup_cache": workgroup_cache},
                 )
-                logger.info(
-                    "Coordinate-system {} was not associated with the destination workgroup. It's now done.".format(
-                        srs.code
-                    )
-                )
-
-            # associate SRS to the metadata
-            self.isogeo.srs.associate_metadata(metadata=md_dst, coordinate_system=srs)
-            logger.info("Coordinate-system {} imported.".format(srs.code))
+            )
 
         # Events
-        if len(self.metadata_source.events) and "events" not in exclude_subresources:
+        if "events" not in exclude_subresources:
             for evt in self.metadata_source.events:
                 event = Event(**evt)
                 event.date = event.date[:10]
-                self.isogeo.metadata.events.create(metadata=md_dst, event=event)
-            logger.info(
-                "{} events have been imported.".format(len(self.metadata_source.events))
-            )
+                li_jobs.append(
+                    (
+                        "events",
+                        self.isogeo.metadata.events.create,
+                        {"metadata": md_dst, "event": event},
+                    )
+                )
 
         # Feature attributes
         if self.metadata_source.type == "vectorDataset" and len(
             self.metadata_source.featureAttributes
         ):
-            self.isogeo.metadata.attributes.import_from_dataset(
-                metadata_source=self.metadata_source, metadata_dest=md_dst
-            )
-            logger.info(
-                "{} feature attributes have been imported.".format(
-                    len(self.metadata_source.featureAttributes)
+            li_jobs.append(
+                (
+                    "featureAttributes",
+                    self.isogeo.metadata.attributes.import_from_dataset,
+                    {"metadata_source": self.metadata_source, "metadata_dest": md_dst},
                 )
             )
 
         # Keywords (including INSPIRE themes)
-        li_keywords = self.isogeo.metadata.keywords(self.metadata_source, include=[])
-        if len(li_keywords):
-            for kwd in li_keywords:
-                # retrieve online keyword
-                keyword = self.isogeo.keyword.get(keyword_id=kwd.get("_id"), include=[])
-                # associate the metadata with
-                self.isogeo.keyword.tagging(
-                    metadata=md_dst, keyword=keyword, check_exists=1
-                )
-            logger.info("{} keywords imported.".format(len(li_keywords)))
+        li_dst_tags = md_dst.tags or []
+        for kwd in self._source_keywords():
+            # no need to tag again the destination metadata
+            if kwd.get("_tag") in li_dst_tags:
+                continue
+            li_jobs.append(
+                ("keywords", self._import_keyword, {"metadata": md_dst, "keyword": kwd})
+            )
 
         # Limitations (CGUs)
-        if len(self.metadata_source.limitations):
-            for lim in self.metadata_source.limitations:
-                limitation = Limitation(**lim)
-                self.isogeo.metadata.limitations.create(
-                    metadata=md_dst, limitation=limitation
-                )
-            logger.info(
-                "{} limitations have been imported.".format(
-                    len(self.metadata_source.limitations)
+        for lim in self.metadata_source.limitations:
+            li_jobs.append(
+                (
+                    "limitations",
+                    self.isogeo.metadata.limitations.create,
+                    {"metadata": md_dst, "limitation": Limitation(**lim)},
                 )
             )
 
         # Links (only URLs)
-        if len(self.metadata_source.links):
-            counter_links = 0
-            for lk in self.metadata_source.links:
-                link = Link(**lk)
-                # ignore hosted links
-                if link.type == "hosted":
-                    logger.info(
-                        "Hosted links can't be migrated, so this link has been ignored: {}".format(
-                            link.title
-                        )
+        for lk in self.metadata_source.links:
+            link = Link(**lk)
+            # ignore hosted links
+            if link.type == "hosted":
+                logger.info(
+                    "Hosted links can't be migrated, so this link has been ignored: {}".format(
+                        link.title
                     )
-                    continue
-                # add the link
-                self.isogeo.metadata.links.create(metadata=md_dst, link=link)
-                # increase counter
-                counter_links += 1
+                )
+                continue
+            li_jobs.append(
+                (
+                    "links",
+                    self.isogeo.metadata.links.create,
+                    {"metadata": md_dst, "link": link},
+                )
+            )
 
         # Specifications
-        if len(self.metadata_source.specifications) and "specifications" not in exclude_subresources:
-            wg_dst_specifications = self.isogeo.specification.listing(
-                workgroup_id=md_dst._creator.get("_id"),
-                include="all"
-            )
+        if "specifications" not in exclude_subresources:
             for spec in self.metadata_source.specifications:
-                spec_link = spec.get("specification").get("link")
-                spec_name = spec.get("specification").get("name")
-                # check if a similar specification already exists in the destination workgroup
-                li_wg_spec = [wg_spec for wg_spec in wg_dst_specifications if wg_spec.get("link") == spec_link and wg_spec.get("name") == spec_name]
-                # retrieve it if it's true
-                if len(li_wg_spec):
-                    specification = Specification(**li_wg_spec[0])
-                # create it else
-                else:
-                    new_specification = Specification()
-                    new_specification.link = spec_link
-                    new_specification.name = spec_name
-                    new_specification.published = spec.get("specification").get("published")
-                    specification = self.isogeo.specification.create(
-                        workgroup_id=md_dst._creator.get("_id"),
-                        specification=new_specification
+                li_jobs.append(
+                    (
+                        "specifications",
+                        self._import_specification,
+                        {
+                            "metadata": md_dst,
+                            "specification_link": spec,
+                            "workgroup_cache": workgroup_cache,
+                        },
                     )
-                    logger.info(
-                        "A specification has been created into destination workgroup according to {} specification from the origin workgroup.".format(
-                            spec.get("specification").get("_id")
-                        )
-                    )
-
-                isConformant = spec.get("conformant")
-                self.isogeo.specification.associate_metadata(
-                    metadata=md_dst,
-                    specification=specification,
-                    conformity=isConformant,
-                )
-            logger.info(
-                "{} specifications have been imported.".format(
-                    len(self.metadata_source.specifications)
                 )
-            )
+
+        # send the sub-resources to the API
+        self._run_subresources_jobs(li_jobs, journal_run=journal_run)
+        self._journal_complete(journal_run)
 
         # return final metadata
-        return self.isogeo.metadata.get(metadata_id=md_dst._id, include="all")
+        if refetch:
+            return self.isogeo.metadata.get(metadata_id=md_dst._id, include="all")
+        # services are created from their title, URL and format only: the helper returns
+        # the metadata as it's stored
+        return MetadataHandle.from_creation(
+            api_client=self.isogeo,
+            metadata_sent=md_to_create,
+            metadata_created=md_dst,
+            attributes_sent=() if self.metadata_source.type == "service" else None,
+        )
 
     def import_into_other_metadata(
         self,
@@ -693,11 +773,19 @@ class MetadataDuplicator(object):
             "name",
             "path",
         ],
-        exclude_subresources: list = []
+        exclude_subresources: list = [],
+        workgroup_cache: WorkgroupReferenceCache = None,
+        differential: bool = False,
     ) -> Metadata:
         """Import a metadata content into another one. It can exclude some fields.
         It can apply some copy marks to distinguish the copy from the original.
 
+        In differential mode, the subresources of the source metadata are compared with those \
+        of the destination metadata and only the missing ones are sent to the API. Those which \
+        are not in the source are removed from the destination (except hosted links and \
+        excluded catalogs or subresources). The import can then be run again, e.g. after a \
+        partial failure, without duplicating events, links, etc.
+
         :param str destination_metadata_uuid: UUID of the metadata to update with source metadata
         :param list exclude_fields: list of fields to be excluded. Must be attributes names
         :param list exclude_subresources : list of subressources to be excluded. Must be metadata attributes names
@@ -707,6 +795,10 @@ class MetadataDuplicator(object):
         :param list exclude_catalogs: list of catalogs UUID's to not associate to destination metadata
         :param bool switch_service_layers: a service layer can't be associated to many datasetes. \
             If this option is enabled, service layers are removed from the metadata source then added to the new one. Defaults to False
+        :param WorkgroupReferenceCache workgroup_cache: cache of the destination metadata workgroup, used \
+            when it's not the source workgroup. Defaults to None (a new one is used if needed)
+        :param bool differential: only send the differences between source and destination \
+            subresources. Defaults to False
 
 
         :returns: the updated Metadata
@@ -769,9 +861,22 @@ class MetadataDuplicator(object):
                 )
             logger.info("{} attributes have been excluded".format(len(exclude_fields)))
 
-        # update the destination metadata with root fields
-        md_src._id = destination_metadata_uuid
-        md_dst = self.isogeo.metadata.update(md_src)
+        # update the destination metadata with root fields, unless it's already journaled
+        journal_run = ("import", destination_metadata_uuid)
+        if self.journal is not None:
+            self.journal.start(
+                self.metadata_source._id, *journal_run, destination_metadata_uuid
+            )
+        if self.journal is not None and "root:metadata" in self.journal.done_steps(
+            self.metadata_source._id, *journal_run
+        ):
+            logger.info("Root attributes already imported according to the journal.")
+            md_dst = md_dst_bkp
+        else:
+            md_src._id = destination_metadata_uuid
+            md_dst = self.isogeo.metadata.update(md_src)
+            if not isinstance(md_dst, tuple):
+                self._journal_mark(journal_run, "root:metadata", "metadata")
 
         logger.info(
             "Destination metadata has been updated with the root attributes (fields): {} ({}). Let's import the associated resources and subresources.".format(
@@ -779,10 +884,9 @@ class MetadataDuplicator(object):
             )
         )
 
-        # let the API get a rest ;)
-        sleep(0.5)
-
         # NOW PERFORM DUPLICATION OF SUBRESOURCES
+        li_jobs = []
+
         # Catalogs
         li_catalogs_uuids = [
             tag[8:] for tag in md_src.tags if tag.startswith("catalog:") and tag[8:] not in exclude_catalogs
@@ -790,52 +894,62 @@ class MetadataDuplicator(object):
         if copymark_catalog is not None:
             li_catalogs_uuids.append(copymark_catalog)
 
-        if len(li_catalogs_uuids):
-            for cat_uuid in li_catalogs_uuids:
-                # retrieve online catalog
-                catalog = self.isogeo.catalog.get(
-                    workgroup_id=md_src._creator.get("_id"),
-                    catalog_id=cat_uuid,  # CHANGE IT with SDK version >= 3.0.1
+        for cat_uuid in li_catalogs_uuids:
+            li_jobs.append(
+                (
+                    "catalogs",
+                    self._import_catalog,
+                    {"metadata": md_dst, "catalog_uuid": cat_uuid},
                 )
-                # associate the metadata with
-                self.isogeo.catalog.associate_metadata(metadata=md_dst, catalog=catalog)
-            logger.info("{} catalogs imported.".format(len(li_catalogs_uuids)))
+            )
 
         # Conditions / Licenses (CGUs)
-        if len(self.metadata_source.conditions):
-            for condition in self.metadata_source.conditions:
-                in_cond = Condition(**condition)
-                self.isogeo.metadata.conditions.create(
-                    metadata=md_dst, condition=in_cond
-                )
-            logger.info(
-                "{} conditions (license + specific description) have been imported.".format(
-                    len(self.metadata_source.conditions)
+        for condition in self.metadata_source.conditions:
+            li_jobs.append(
+                (
+                    "conditions",
+                    self.isogeo.metadata.conditions.create,
+                    {"metadata": md_dst, "condition": Condition(**condition)},
                 )
             )
 
         # Contacts
-        if len(md_src.contacts):
-            for ct in md_src.contacts:
-                contact = Contact(**ct.get("contact"))
-                self.isogeo.contact.associate_metadata(
-                    metadata=md_dst, contact=contact, role=ct.get("role")
+        for ct in md_src.contacts:
+            li_jobs.append(
+                (
+                    "contacts",
+                    self._import_contact,
+                    {"metadata": md_dst, "contact_role": ct},
                 )
-            logger.info("{} contacts imported.".format(len(md_src.contacts)))
+            )
 
         # Coordinate-systems
         if isinstance(md_src.coordinateSystem, dict):
-            srs = CoordinateSystem(**md_src.coordinateSystem)
-            self.isogeo.srs.associate_metadata(metadata=md_dst, coordinate_system=srs)
-            logger.info("Coordinate-system {} imported.".format(srs.code))
+            li_jobs.append(
+                (
+                    "coordinateSystem",
+                    self.isogeo.srs.associate_metadata,
+                    {
+                        "metadata": md_dst,
+                        "coordinate_system": CoordinateSystem(
+                            **md_src.coordinateSystem
+                        ),
+                    },
+                )
+            )
 
         # Events
-        if len(md_src.events) and "events" not in exclude_subresources:
+        if "events" not in exclude_subresources:
             for evt in md_src.events:
                 event = Event(**evt)
                 event.date = event.date[:10]
-                self.isogeo.metadata.events.create(metadata=md_dst, event=event)
-            logger.info("{} events have been imported.".format(len(md_src.events)))
+                li_jobs.append(
+                    (
+                        "events",
+                        self.isogeo.metadata.events.create,
+                        {"metadata": md_dst, "event": event},
+                    )
+                )
 
         # Feature attributes
         if (
@@ -843,60 +957,57 @@ class MetadataDuplicator(object):
             and isinstance(md_src.featureAttributes, list)
             and len(md_src.featureAttributes)
         ):
-            self.isogeo.metadata.attributes.import_from_dataset(
-                metadata_source=self.metadata_source,
-                metadata_dest=md_dst,
-                mode="update",
-                case_sensitive_matching=False
-            )
-            logger.info(
-                "{} feature attributes have been imported.".format(
-                    len(md_src.featureAttributes)
+            li_jobs.append(
+                (
+                    "featureAttributes",
+                    self.isogeo.metadata.attributes.import_from_dataset,
+                    {
+                        "metadata_source": self.metadata_source,
+                        "metadata_dest": md_dst,
+                        "mode": "update",
+                        "case_sensitive_matching": False,
+                    },
                 )
             )
 
         # Keywords (including INSPIRE themes)
-        li_keywords = self.isogeo.metadata.keywords(self.metadata_source, include=[])
-        if len(li_keywords):
-            for kwd in li_keywords:
-                # retrieve online keyword
-                keyword = self.isogeo.keyword.get(keyword_id=kwd.get("_id"), include=[])
-                # associate the metadata with
-                self.isogeo.keyword.tagging(
-                    metadata=md_dst, keyword=keyword, check_exists=1
-                )
-            logger.info("{} keywords imported.".format(len(li_keywords)))
+        li_dst_tags = md_dst_bkp.tags or []
+        for kwd in self._source_keywords():
+            # no need to tag again the destination metadata
+            if kwd.get("_tag") in li_dst_tags:
+                continue
+            li_jobs.append(
+                ("keywords", self._import_keyword, {"metadata": md_dst, "keyword": kwd})
+            )
 
         # Limitations (CGUs)
-        if len(md_src.limitations):
-            for lim in md_src.limitations:
-                limitation = Limitation(**lim)
-                self.isogeo.metadata.limitations.create(
-                    metadata=md_dst, limitation=limitation
+        for lim in md_src.limitations:
+            li_jobs.append(
+                (
+                    "limitations",
+                    self.isogeo.metadata.limitations.create,
+                    {"metadata": md_dst, "limitation": Limitation(**lim)},
                 )
-            logger.info(
-                "{} limitations have been imported.".format(len(md_src.limitations))
             )
 
         # Links (only URLs)
-        if len(md_src.links):
-            counter_links = 0
-            for lk in md_src.links:
-                link = Link(**lk)
-                # ignore hosted links
-                if link.type == "hosted":
-                    logger.info(
-                        "Hosted links can't be migrated, so this link has been ignored: {}".format(
-                            link.title
-                        )
+        for lk in md_src.links:
+            link = Link(**lk)
+            # ignore hosted links
+            if link.type == "hosted":
+                logger.info(
+                    "Hosted links can't be migrated, so this link has been ignored: {}".format(
+                        link.title
                     )
-                    continue
-                # add the link
-                self.isogeo.metadata.links.create(metadata=md_dst, link=link)
-                # increase counter
-                counter_links += 1
-
-            logger.info("{} links have been imported.".format(counter_links))
+                )
+                continue
+            li_jobs.append(
+                (
+                    "links",
+                    self.isogeo.metadata.links.create,
+                    {"metadata": md_dst, "link": link},
+                )
+            )
 
         # Service layers associated
         if self.metadata_source.type in ("rasterDataset", "vectorDataset") and len(
@@ -904,29 +1015,13 @@ class MetadataDuplicator(object):
         ):
             if switch_service_layers:
                 for service_layer in self.metadata_source.serviceLayers:
-                    # remove the layer from the source
-                    self.isogeo.metadata.layers.dissociate_metadata(
-                        service=Metadata(
-                            _id=service_layer.get("service").get("_id"), type="service"
-                        ),
-                        layer=ServiceLayer(_id=service_layer.get("_id")),
-                        dataset=self.metadata_source,
-                    )
-
-                    # add the layer to the copy
-                    self.isogeo.metadata.layers.associate_metadata(
-                        service=Metadata(
-                            _id=service_layer.get("service").get("_id"), type="service"
-                        ),
-                        layer=ServiceLayer(_id=service_layer.get("_id")),
-                        dataset=md_dst,
-                    )
-
-                logger.info(
-                    "{} service layers have been imported after they have been removed from the source.".format(
-                        len(self.metadata_source.serviceLayers)
+                    li_jobs.append(
+                        (
+                            "serviceLayers",
+                            self._switch_service_layer,
+                            {"metadata": md_dst, "service_layer": service_layer},
+                        )
                     )
-                )
             else:
                 logger.info(
                     "{} service layers have NOT been imported because they stay associated with the source.".format(
@@ -937,58 +1032,812 @@ class MetadataDuplicator(object):
         # Specifications
         if len(md_src.specifications) and "specifications" not in exclude_subresources:
             if self.metadata_source._creator.get("_id") != md_dst_bkp._creator.get("_id"):
-                wg_dst_specifications = self.isogeo.specification.listing(
-                    workgroup_id=md_dst_bkp._creator.get("_id"),
-                    include="all"
-                )
+                if workgroup_cache is None:
+                    workgroup_cache = WorkgroupReferenceCache(
+                        api_client=self.isogeo,
+                        workgroup_uuid=md_dst_bkp._creator.get("_id"),
+                    )
                 for spec in self.metadata_source.specifications:
-                    spec_link = spec.get("specification").get("link")
-                    spec_name = spec.get("specification").get("name")
-                    # check if a similar specification already exists in the destination workgroup
-                    li_wg_spec = [wg_spec for wg_spec in wg_dst_specifications if wg_spec.get("link") == spec_link and wg_spec.get("name") == spec_name]
-                    # retrieve it if it's true
-                    if len(li_wg_spec):
-                        specification = Specification(**li_wg_spec[0])
-                    # create it else
-                    else:
-                        new_specification = Specification()
-                        new_specification.link = spec_link
-                        new_specification.name = spec_name
-                        new_specification.published = spec.get("specification").get("published")
-                        specification = self.isogeo.specification.create(
-                            workgroup_id=md_dst_bkp._creator.get("_id"),
-                            specification=new_specification
+                    li_jobs.append(
+                        (
+                            "specifications",
+                            self._import_specification,
+                            {
+                                "metadata": md_dst,
+                                "specification_link": spec,
+                                "workgroup_cache": workgroup_cache,
+                            },
                         )
-                        logger.info(
-                            "A specification has been created into destination workgroup according to {} specification from the origin workgroup.".format(
-                                spec.get("specification").get("_id")
-                            )
-                        )
-
-                    isConformant = spec.get("conformant")
-                    self.isogeo.specification.associate_metadata(
-                        metadata=md_dst,
-                        specification=specification,
-                        conformity=isConformant,
                     )
             else:
                 for spec in md_src.specifications:
-                    specification = Specification(**spec.get("specification"))
-                    isConformant = spec.get("conformant")
-                    self.isogeo.specification.associate_metadata(
-                        metadata=md_dst,
-                        specification=specification,
-                        conformity=isConformant,
+                    li_jobs.append(
+                        (
+                            "specifications",
+                            self._import_specification,
+                            {"metadata": md_dst, "specification_link": spec},
+                        )
                     )
+
+        # compare with the destination subresources
+        self.subresources_removals_report = {}
+        if differential:
+            li_removals, li_jobs = self._differential_jobs(
+                jobs=li_jobs,
+                metadata_dst=md_dst,
+                metadata_dst_bkp=md_dst_bkp,
+                exclude_catalogs=exclude_catalogs,
+                exclude_subresources=exclude_subresources,
+            )
+            # removals first: a contact is dissociated before its new roles are set
+            self.subresources_removals_report = self._run_subresources_jobs(
+                li_removals, action="removed", journal_run=journal_run
+            )
+
+        # send the sub-resources to the API
+        self._run_subresources_jobs(li_jobs, journal_run=journal_run)
+        self._journal_complete(journal_run)
+
+        return md_dst
+
+    # -- DUPLICATION TOOLING -----------------------------------------------------------
+    def _run_subresources_jobs(
+        self, jobs: list, action: str = "imported", journal_run: tuple = None
+    ) -> dict:
+        """Send the sub-resources to the API, one by one or through a bounded pool of threads \
+        if `max_workers` is greater than 1. In both cases, a failed job doesn't stop the others: \
+        API errors and exceptions are stored into the report of the related sub-resource family.
+
+        If a journal is set, jobs already recorded for this duplication are skipped and each \
+        successful job is recorded.
+
+        :param list jobs: list of tuples (sub-resource family, callable, keyword arguments)
+        :param str action: what the jobs do, used in logs. Defaults to "imported"
+        :param tuple journal_run: duplication mode and target, to use the journal. Defaults to None
+
+        :returns: report by sub-resource family: {family: {"total": int, "done": int, "errors": list}}
+        :rtype: dict
+        """
+        # identify jobs to skip those already journaled
+        li_steps = self._journal_steps(jobs, action) if journal_run else []
+        if journal_run and self.journal is not None:
+            li_done = self.journal.done_steps(self.metadata_source._id, *journal_run)
+        else:
+            li_done = set()
+
+        # prepare the report
+        report = {}
+        li_todo = []
+        for (family, func, kwargs), step in zip(jobs, li_steps or [None] * len(jobs)):
+            report.setdefault(family, {"total": 0, "done": 0, "errors": []})
+            report[family]["total"] += 1
+            if step in li_done:
+                report[family]["done"] += 1
+            else:
+                li_todo.append((family, func, kwargs, step))
+
+        if len(li_todo) < len(jobs):
             logger.info(
-                "{} specifications have been imported.".format(
-                    len(md_src.specifications)
+                "{}/{} subresources already {} according to the journal.".format(
+                    len(jobs) - len(li_todo), len(jobs), action
+                )
+            )
+
+        if self.max_workers > 1 and len(li_todo) > 1:
+            with ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="IsogeoMetadataDuplicator_",
+            ) as executor:
+                di_futures = {
+                    executor.submit(self._run_job, func, kwargs): (family, step)
+                    for family, func, kwargs, step in li_todo
+                }
+                for future in as_completed(di_futures):
+                    family, step = di_futures.get(future)
+                    if self._store_job_result(report[family], future.result()):
+                        self._journal_mark(journal_run, step, family)
+        else:
+            for family, func, kwargs, step in li_todo:
+                if self._store_job_result(report[family], self._run_job(func, kwargs)):
+                    self._journal_mark(journal_run, step, family)
+
+        # debrief to the user
+        for family, outcome in report.items():
+            if len(outcome.get("errors")):
+                logger.error(
+                    "{}/{} {} failed to be {}: {}".format(
+                        len(outcome.get("errors")),
+                        outcome.get("total"),
+                        family,
+                        action,
+                        outcome.get("errors"),
+                    )
+                )
+            else:
+                logger.info(
+                    "{} {} have been {}.".format(outcome.get("done"), family, action)
+                )
+
+        self.subresources_report = report
+        return report
+
+    def _source_keywords(self) -> list:
+        """Keywords of the source metadata. They're usually loaded with the metadata (`include="all"`)
+        but they're requested to the API otherwise.
+
+        :rtype: list
+        """
+        if isinstance(self.metadata_source.keywords, list):
+            return self.metadata_source.keywords
+        return self.isogeo.metadata.keywords(self.metadata_source, include=[])
+
+    @staticmethod
+    def _run_job(func, kwargs: dict):
+        """Run a sub-resource job. Exceptions are returned like the API errors.
+
+        :param func: callable of the job
+        :param dict kwargs: keyword arguments of the job
+
+        :returns: value returned by the job or a tuple (False, exception)
+        """
+        try:
+            return func(**kwargs)
+        except Exception as e:
+            logger.debug("Sub-resource job failed: {}".format(e))
+            return (False, e)
+
+    @staticmethod
+    def _store_job_result(family_report: dict, result):
+        """Update a sub-resource family report with the result of one of its jobs. The SDK \
+        returns a tuple (False, HTTP status code) when the API replies with an error.
+
+        :param dict family_report: report of the sub-resource family
+        :param result: value returned by the job
+
+        :returns: True if the job succeeded
+        :rtype: bool
+        """
+        if isinstance(result, tuple) and len(result) == 2 and result[0] is False:
+            family_report["errors"].append(result[1])
+            return False
+        else:
+            family_report["done"] += 1
+            return True
+
+    # -- JOURNAL -----------------------------------------------------------------------
+    def _journal_resume(self, mode: str, target: str) -> Metadata:
+        """Retrieve the destination metadata of a previous run of the same duplication, if it's \
+        journaled and still exists.
+
+        :param str mode: duplication mode
+        :param str target: workgroup UUID or destination metadata UUID
+
+        :returns: the destination metadata or None
+        :rtype: Metadata
+        """
+        if self.journal is None:
+            return None
+        destination_uuid = self.journal.destination(
+            self.metadata_source._id, mode, target
+        )
+        if destination_uuid is None:
+            return None
+
+        md_dst = self.isogeo.metadata.get(metadata_id=destination_uuid)
+        if isinstance(md_dst, tuple):
+            logger.warning(
+                "Journaled destination metadata {} can't be retrieved: {}. It'll be created again.".format(
+                    destination_uuid, md_dst
                 )
             )
+            return None
 
+        logger.info(
+            "Resuming the duplication of {} into {} ({}): {} steps already done.".format(
+                self.metadata_source._id,
+                md_dst._id,
+                mode,
+                len(self.journal.done_steps(self.metadata_source._id, mode, target)),
+            )
+        )
         return md_dst
 
-    # -- DUPLICATION TOOLING -----------------------------------------------------------
+    def _journal_mark(self, journal_run: tuple, step: str, family: str):
+        """Record a completed step into the journal, if any.
+
+        :param tuple journal_run: duplication mode and target
+        :param str step: step key
+        :param str family: subresource family of the step
+        """
+        if self.journal is None or journal_run is None:
+            return
+        self.journal.mark_step(self.metadata_source._id, *journal_run, step, family)
+
+    def _journal_complete(self, journal_run: tuple):
+        """Mark the duplication as completed into the journal, if any and if no subresource \
+        failed.
+
+        :param tuple journal_run: duplication mode and target
+        """
+        if self.journal is None:
+            return
+        for report in (self.subresources_report, self.subresources_removals_report):
+            if any(len(outcome.get("errors")) for outcome in report.values()):
+                return
+        self.journal.complete(self.metadata_source._id, *journal_run)
+
+    @classmethod
+    def _journal_steps(cls, jobs: list, action: str = "imported") -> list:
+        """Build stable keys for the jobs, based on what they send to the API: a job gets the \
+        same key from one run to another even if the list of jobs is filtered differently.
+
+        :param list jobs: list of tuples (sub-resource family, callable, keyword arguments)
+        :param str action: what the jobs do. Defaults to "imported"
+
+        :rtype: list
+        """
+        li_steps = []
+        for family, func, kwargs in jobs:
+            di_args = {
+                arg: cls._journal_value(value)
+                for arg, value in kwargs.items()
+                if not isinstance(value, (Metadata, WorkgroupReferenceCache))
+            }
+            li_steps.append(
+                "{}:{}:{}".format(
+                    action, family, json.dumps(di_args, sort_keys=True, default=str)
+                )
+            )
+
+        # identical jobs are numbered
+        di_count = Counter()
+        li_keys = []
+        for step in li_steps:
+            di_count[step] += 1
+            li_keys.append(
+                step if di_count[step] == 1 else "{}#{}".format(step, di_count[step])
+            )
+        return li_keys
+
+    @classmethod
+    def _journal_value(cls, value):
+        """Reduce a job argument to what identifies it: its UUID if it has one.
+
+        :param value: job argument (model, dict, str...)
+        """
+        if hasattr(value, "to_dict"):
+            value = value.to_dict()
+        if isinstance(value, dict):
+            if value.get("_id"):
+                return value.get("_id")
+            return {k: cls._journal_value(v) for k, v in value.items()}
+        return value
+
+    def _differential_jobs(
+        self,
+        jobs: list,
+        metadata_dst: Metadata,
+        metadata_dst_bkp: Metadata,
+        exclude_catalogs: list = [],
+        exclude_subresources: list = [],
+    ) -> tuple:
+        """Compare the import jobs with the subresources of the destination metadata. Jobs \
+        whose subresource already exists in the destination are dropped and removal jobs are \
+        added for the destination subresources which are not in the source.
+
+        :param list jobs: list of tuples (sub-resource family, callable, keyword arguments)
+        :param Metadata metadata_dst: destination metadata, as returned by the update
+        :param Metadata metadata_dst_bkp: destination metadata before the update (`include="all"`)
+        :param list exclude_catalogs: list of catalogs UUID's to keep associated with the destination
+        :param list exclude_subresources: list of subresources to leave as they are
+
+        :returns: removal jobs and remaining import jobs
+        :rtype: tuple
+        """
+        # one differ by subresource family, in the order of the removals
+        di_differs = {
+            "catalogs": partial(
+                self._differ_catalogs, exclude_catalogs=exclude_catalogs
+            ),
+            "contacts": self._differ_contacts,
+            "keywords": self._differ_keywords,
+            "conditions": self._differ_conditions,
+            "events": self._differ_events,
+            "limitations": self._differ_limitations,
+            "links": self._differ_links,
+            "specifications": self._differ_specifications,
+            "coordinateSystem": self._differ_coordinate_system,
+            "serviceLayers": self._differ_service_layers,
+        }
+
+        # import jobs by family
+        di_jobs = {}
+        for job in jobs:
+            di_jobs.setdefault(job[0], []).append(job)
+
+        li_removals = []
+        li_kept = []
+        for family, differ in di_differs.items():
+            li_family_removals, li_family_jobs = differ(
+                di_jobs.get(family, []), metadata_dst, metadata_dst_bkp
+            )
+            if family not in exclude_subresources:
+                li_removals.extend(li_family_removals)
+            li_kept.extend(li_family_jobs)
+
+        # remaining import jobs, in their original order (a job can be listed twice)
+        kept_ids = Counter(id(job) for job in li_kept)
+        li_jobs = []
+        for job in jobs:
+            if job[0] in di_differs:
+                if not kept_ids[id(job)]:
+                    continue
+                kept_ids[id(job)] -= 1
+            li_jobs.append(job)
+
+        logger.info(
+            "Differential import: {} subresources to remove, {} to import, "
+            "{} already up to date.".format(
+                len(li_removals), len(li_jobs), len(jobs) - len(li_jobs)
+            )
+        )
+
+        return li_removals, li_jobs
+
+    def _differ_catalogs(
+        self,
+        jobs: list,
+        metadata_dst: Metadata,
+        metadata_dst_bkp: Metadata,
+        exclude_catalogs: list = [],
+    ) -> tuple:
+        """Differential of the catalogs. See `_differential_jobs`.
+
+        :param list exclude_catalogs: list of catalogs UUID's to keep associated with the destination
+        """
+        li_dst_tags = metadata_dst_bkp.tags or []
+        li_jobs = [
+            job
+            for job in jobs
+            if "catalog:{}".format(job[2].get("catalog_uuid")) not in li_dst_tags
+        ]
+
+        li_src_catalogs = [kwargs.get("catalog_uuid") for family, func, kwargs in jobs]
+        li_removals = [
+            (
+                "catalogs",
+                self.isogeo.catalog.dissociate_metadata,
+                {"metadata": metadata_dst, "catalog": Catalog(_id=tag[8:])},
+            )
+            for tag in li_dst_tags
+            if tag.startswith("catalog:")
+            and tag[8:] not in li_src_catalogs
+            and tag[8:] not in exclude_catalogs
+        ]
+
+        return li_removals, li_jobs
+
+    def _differ_contacts(
+        self, jobs: list, metadata_dst: Metadata, metadata_dst_bkp: Metadata
+    ) -> tuple:
+        """Differential of the contacts. See `_differential_jobs`."""
+        # contacts are dissociated with all their roles
+        di_dst_contacts = {}
+        for ct in metadata_dst_bkp.contacts or []:
+            di_dst_contacts.setdefault(ct.get("contact").get("_id"), set()).add(
+                ct.get("role")
+            )
+        di_src_contacts = {}
+        for family, func, kwargs in jobs:
+            ct = kwargs.get("contact_role")
+            di_src_contacts.setdefault(ct.get("contact").get("_id"), set()).add(
+                ct.get("role")
+            )
+        li_contacts_to_reset = [
+            ct_uuid
+            for ct_uuid, roles in di_dst_contacts.items()
+            if not roles.issubset(di_src_contacts.get(ct_uuid, set()))
+        ]
+
+        li_jobs = []
+        for job in jobs:
+            ct = job[2].get("contact_role")
+            ct_uuid = ct.get("contact").get("_id")
+            if ct_uuid not in li_contacts_to_reset and ct.get(
+                "role"
+            ) in di_dst_contacts.get(ct_uuid, set()):
+                continue
+            li_jobs.append(job)
+
+        li_removals = [
+            (
+                "contacts",
+                self.isogeo.contact.dissociate_metadata,
+                {"metadata": metadata_dst, "contact": Contact(_id=ct_uuid)},
+            )
+            for ct_uuid in li_contacts_to_reset
+        ]
+
+        return li_removals, li_jobs
+
+    def _differ_keywords(
+        self, jobs: list, metadata_dst: Metadata, metadata_dst_bkp: Metadata
+    ) -> tuple:
+        """Differential of the keywords. See `_differential_jobs`."""
+        li_src_tags = self.metadata_source.tags or []
+        li_removals = [
+            (
+                "keywords",
+                self.isogeo.keyword.untagging,
+                {
+                    "metadata": metadata_dst,
+                    "keyword": Keyword(
+                        **{k: v for k, v in kwd.items() if k in Keyword.ATTR_TYPES}
+                    ),
+                },
+            )
+            for kwd in metadata_dst_bkp.keywords or []
+            if kwd.get("_tag") not in li_src_tags
+        ]
+
+        return li_removals, jobs
+
+    def _differ_conditions(
+        self, jobs: list, metadata_dst: Metadata, metadata_dst_bkp: Metadata
+    ) -> tuple:
+        """Differential of the conditions. See `_differential_jobs`."""
+        li_jobs, li_left = self._diff_by_key(
+            "conditions", jobs, "condition", metadata_dst_bkp.conditions
+        )
+        li_removals = [
+            (
+                "conditions",
+                self.isogeo.metadata.conditions.delete,
+                {"metadata": metadata_dst, "condition": Condition(**item)},
+            )
+            for item in li_left
+        ]
+
+        return li_removals, li_jobs
+
+    def _differ_events(
+        self, jobs: list, metadata_dst: Metadata, metadata_dst_bkp: Metadata
+    ) -> tuple:
+        """Differential of the events. See `_differential_jobs`."""
+        li_jobs, li_left = self._diff_by_key(
+            "events", jobs, "event", metadata_dst_bkp.events
+        )
+        li_removals = [
+            (
+                "events",
+                self.isogeo.metadata.events.delete,
+                {"metadata": metadata_dst, "event": Event(**item)},
+            )
+            for item in li_left
+        ]
+
+        return li_removals, li_jobs
+
+    def _differ_limitations(
+        self, jobs: list, metadata_dst: Metadata, metadata_dst_bkp: Metadata
+    ) -> tuple:
+        """Differential of the limitations. See `_differential_jobs`."""
+        li_jobs, li_left = self._diff_by_key(
+            "limitations", jobs, "limitation", metadata_dst_bkp.limitations
+        )
+        li_removals = [
+            (
+                "limitations",
+                self.isogeo.metadata.limitations.delete,
+                {"metadata": metadata_dst, "limitation": Limitation(**item)},
+            )
+            for item in li_left
+        ]
+
+        return li_removals, li_jobs
+
+    def _differ_links(
+        self, jobs: list, metadata_dst: Metadata, metadata_dst_bkp: Metadata
+    ) -> tuple:
+        """Differential of the links. See `_differential_jobs`."""
+        li_jobs, li_left = self._diff_by_key(
+            "links", jobs, "link", metadata_dst_bkp.links
+        )
+        # hosted links can't be imported, so they're kept
+        li_removals = [
+            (
+                "links",
+                self.isogeo.metadata.links.delete,
+                {"metadata": metadata_dst, "link": Link(**item)},
+            )
+            for item in li_left
+            if item.get("type") != "hosted"
+        ]
+
+        return li_removals, li_jobs
+
+    def _differ_specifications(
+        self, jobs: list, metadata_dst: Metadata, metadata_dst_bkp: Metadata
+    ) -> tuple:
+        """Differential of the specifications. See `_differential_jobs`."""
+        # a new association updates the specification conformity
+        li_jobs, li_left = self._diff_by_key(
+            "specifications",
+            jobs,
+            "specification_link",
+            metadata_dst_bkp.specifications,
+            same=lambda dst_item, item: dst_item.get("conformant")
+            == item.get("conformant"),
+        )
+        li_removals = [
+            (
+                "specifications",
+                self.isogeo.specification.dissociate_metadata,
+                {
+                    "metadata": metadata_dst,
+                    "specification_id": item.get("specification").get("_id"),
+                },
+            )
+            for item in li_left
+        ]
+
+        return li_removals, li_jobs
+
+    def _differ_coordinate_system(
+        self, jobs: list, metadata_dst: Metadata, metadata_dst_bkp: Metadata
+    ) -> tuple:
+        """Differential of the coordinate system. See `_differential_jobs`."""
+        dst_srs = metadata_dst_bkp.coordinateSystem
+        if not isinstance(dst_srs, dict):
+            return [], jobs
+
+        li_jobs = [
+            job
+            for job in jobs
+            if dst_srs.get("code") != job[2].get("coordinate_system").code
+        ]
+
+        return [], li_jobs
+
+    def _differ_service_layers(
+        self, jobs: list, metadata_dst: Metadata, metadata_dst_bkp: Metadata
+    ) -> tuple:
+        """Differential of the service layers. See `_differential_jobs`."""
+        li_dst_layers = [lyr.get("_id") for lyr in metadata_dst_bkp.serviceLayers or []]
+        li_jobs = [
+            job
+            for job in jobs
+            if job[2].get("service_layer").get("_id") not in li_dst_layers
+        ]
+
+        return [], li_jobs
+
+    def _diff_by_key(
+        self,
+        family: str,
+        jobs: list,
+        job_argument: str,
+        dst_items: list,
+        same=None,
+    ) -> tuple:
+        """Match the import jobs of a subresource family with the subresources of the \
+        destination, using their identity key (see `_subresource_key`). Each destination \
+        subresource matches one job at most.
+
+        :param str family: subresource family
+        :param list jobs: import jobs of the family
+        :param str job_argument: name of the job argument holding the subresource
+        :param list dst_items: subresources of the destination metadata
+        :param same: function telling if a matched destination subresource is up to date \
+            (destination subresource, source subresource). Defaults to None (always)
+
+        :returns: import jobs to keep and destination subresources which are not matched
+        :rtype: tuple
+        """
+        # index destination subresources by identity key
+        di_dst_items = {}
+        for item in dst_items or []:
+            di_dst_items.setdefault(self._subresource_key(family, item), []).append(item)
+
+        li_jobs = []
+        for job in jobs:
+            item = job[2].get(job_argument)
+            if not isinstance(item, dict):
+                item = item.to_dict()
+            li_matching = di_dst_items.get(self._subresource_key(family, item))
+            if li_matching:
+                dst_item = li_matching.pop(0)
+                if same is None or same(dst_item, item):
+                    continue
+            li_jobs.append(job)
+
+        li_left = [item for li_items in di_dst_items.values() for item in li_items]
+
+        return li_jobs, li_left
+
+    @staticmethod
+    def _subresource_key(family: str, item: dict) -> tuple:
+        """Identity key of a subresource, used to compare the subresources of two metadata.
+
+        :param str family: subresource family (conditions, events, limitations, links, specifications)
+        :param dict item: subresource as returned by the API
+        """
+        if family == "conditions":
+            return ((item.get("license") or {}).get("_id"), item.get("description"))
+        elif family == "events":
+            return (
+                (item.get("date") or "")[:10],
+                item.get("kind"),
+                item.get("description"),
+            )
+        elif family == "limitations":
+            return (
+                item.get("type"),
+                item.get("restriction"),
+                item.get("description"),
+                (item.get("directive") or {}).get("_id"),
+            )
+        elif family == "links":
+            return (
+                item.get("type"),
+                item.get("kind"),
+                item.get("title"),
+                item.get("url"),
+            )
+        elif family == "specifications":
+            specification = item.get("specification") or {}
+            return (specification.get("link"), specification.get("name"))
+        else:
+            raise ValueError(
+                "No identity key for this subresource family: {}".format(family)
+            )
+
+    def _import_catalog(
+        self,
+        metadata: Metadata,
+        catalog_uuid: str,
+        workgroup_cache: WorkgroupReferenceCache = None,
+    ):
+        """Associate a catalog of the source workgroup with the destination metadata. If a \
+        destination workgroup cache is passed, the catalog is matched by name with the catalogs \
+        of this workgroup and created if it doesn't exist.
+
+        :param Metadata metadata: destination metadata
+        :param str catalog_uuid: UUID of the catalog in the source workgroup
+        :param WorkgroupReferenceCache workgroup_cache: destination workgroup cache. Defaults to None
+        """
+        # retrieve online catalog
+        catalog = self.isogeo.catalog.get(
+            workgroup_id=self.metadata_source._creator.get("_id"),
+            catalog_id=catalog_uuid,  # CHANGE IT with SDK version >= 3.0.1
+        )
+
+        # compare catalog name with destination group catalogs
+        if workgroup_cache is not None:
+            catalog = workgroup_cache.resolve_catalog(catalog)
+
+        # associate the metadata with
+        return self.isogeo.catalog.associate_metadata(
+            metadata=metadata, catalog=catalog
+        )
+
+    def _import_contact(
+        self,
+        metadata: Metadata,
+        contact_role: dict,
+        workgroup_cache: WorkgroupReferenceCache = None,
+    ):
+        """Associate a contact of the source metadata with the destination metadata. If a \
+        destination workgroup cache is passed, custom contacts are matched by email with the \
+        address-book of this workgroup and created if missing.
+
+        :param Metadata metadata: destination metadata
+        :param dict contact_role: item of the source metadata contacts ({"contact": {}, "role": ""})
+        :param WorkgroupReferenceCache workgroup_cache: destination workgroup cache. Defaults to None
+        """
+        contact = Contact(**contact_role.get("contact"))
+
+        if workgroup_cache is not None and contact.type == "custom":
+            logger.info(
+                "Custom contact spotted: {} ({})".format(contact.name, contact.email)
+            )
+            # compare contact email with destination group contacts
+            contact = workgroup_cache.resolve_contact(contact)
+        elif workgroup_cache is not None:
+            logger.info(
+                "Contact group identified: {}. No need to enlarge the address-book.".format(
+                    contact.name
+                )
+            )
+
+        # associate the contact with the metadata
+        return self.isogeo.contact.associate_metadata(
+            metadata=metadata, contact=contact, role=contact_role.get("role")
+        )
+
+    def _import_coordinate_system(
+        self, metadata: Metadata, workgroup_cache: WorkgroupReferenceCache = None
+    ):
+        """Associate the coordinate-system of the source metadata with the destination \
+        metadata. If a destination workgroup cache is passed, the coordinate-system is first \
+        associated with this workgroup if needed.
+
+        :param Metadata metadata: destination metadata
+        :param WorkgroupReferenceCache workgroup_cache: destination workgroup cache. Defaults to None
+        """
+        srs = CoordinateSystem(**self.metadata_source.coordinateSystem)
+
+        # first check if the SRS is already available in the destination group
+        if workgroup_cache is not None:
+            workgroup_cache.resolve_coordinate_system(srs)
+
+        # associate SRS to the metadata
+        return self.isogeo.srs.associate_metadata(
+            metadata=metadata, coordinate_system=srs
+        )
+
+    def _import_keyword(self, metadata: Metadata, keyword: dict):
+        """Tag the destination metadata with a keyword of the source metadata. The keyword is \
+        resolved through the keyword cache and the destination tags must have been checked before.
+
+        :param Metadata metadata: destination metadata
+        :param dict keyword: item of the source metadata keywords
+        """
+        keyword = self.keyword_cache.get(keyword)
+        if isinstance(keyword, tuple):
+            return keyword
+
+        # associate the metadata with
+        return self.isogeo.keyword.tagging(
+            metadata=metadata, keyword=keyword, check_exists=0
+        )
+
+    def _import_specification(
+        self,
+        metadata: Metadata,
+        specification_link: dict,
+        workgroup_cache: WorkgroupReferenceCache = None,
+    ):
+        """Associate a specification of the source metadata with the destination metadata. \
+        If a destination workgroup cache is passed, the specification is matched by link and \
+        name with the specifications of this workgroup and created if it doesn't exist.
+
+        :param Metadata metadata: destination metadata
+        :param dict specification_link: item of the source metadata specifications \
+            ({"specification": {}, "conformant": bool})
+        :param WorkgroupReferenceCache workgroup_cache: destination workgroup cache. Defaults to None
+        """
+        if workgroup_cache is None:
+            specification = Specification(**specification_link.get("specification"))
+        else:
+            specification = workgroup_cache.resolve_specification(
+                specification_link.get("specification")
+            )
+
+        return self.isogeo.specification.associate_metadata(
+            metadata=metadata,
+            specification=specification,
+            conformity=specification_link.get("conformant"),
+        )
+
+    def _switch_service_layer(self, metadata: Metadata, service_layer: dict):
+        """Remove a service layer from the source metadata then add it to the destination one.
+
+        :param Metadata metadata: destination metadata
+        :param dict service_layer: item of the source metadata service layers
+        """
+        service = Metadata(_id=service_layer.get("service").get("_id"), type="service")
+        layer = ServiceLayer(_id=service_layer.get("_id"))
+
+        # remove the layer from the source
+        self.isogeo.metadata.layers.dissociate_metadata(
+            service=service, layer=layer, dataset=self.metadata_source
+        )
+
+        # add the layer to the copy
+        return self.isogeo.metadata.layers.associate_metadata(
+            service=service, layer=layer, dataset=metadata
+        )
 
 
 # #############################################################################
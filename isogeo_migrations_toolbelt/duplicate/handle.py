@@ -0,0 +1,123 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa: E265
+
+# ------------------------------------------------------------------------------
+# Name:         Metadata Handle
+# Purpose:      Lightweight reference to a metadata created by a duplication
+# Author:       Isogeo
+#
+# Python:       3.6+
+# ------------------------------------------------------------------------------
+
+# ##############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import logging
+
+# Isogeo
+from isogeo_pysdk import Isogeo
+from isogeo_pysdk.enums import MetadataSubresources
+from isogeo_pysdk.models import Metadata
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class MetadataHandle(object):
+    """Lightweight reference to a metadata created by a duplication. It holds the metadata UUID
+    and the locally known root attributes (title, name, abstract...). The complete metadata is
+    retrieved from the API only when one of its subresources (events, keywords, tags...) or
+    `complete` is accessed.
+
+    :param Isogeo api_client: API client authenticated to Isogeo
+    :param Metadata metadata: locally known state of the metadata (at least with its `_id`)
+
+    :Example:
+
+    .. code-block:: python
+
+        new_md = md_duplicator.duplicate_into_same_group(refetch=False)
+        # no request
+        print(new_md._id, new_md.title)
+        # one request to get the complete metadata, then cached
+        print(len(new_md.events))
+
+    """
+
+    SUBRESOURCES = tuple(
+        i.name for i in MetadataSubresources if not i.name.startswith("_")
+    )
+
+    def __init__(self, api_client: Isogeo, metadata: Metadata):
+        # store API client
+        self.isogeo = api_client
+
+        self._id = metadata._id
+        self.local = metadata
+        self._complete = None
+
+    @classmethod
+    def from_creation(
+        cls,
+        api_client: Isogeo,
+        metadata_sent: Metadata,
+        metadata_created: Metadata,
+        attributes_sent: tuple = None,
+    ):
+        """Build the handle from the metadata sent to the API for creation and the minimal
+        metadata returned by the API.
+
+        :param Isogeo api_client: API client authenticated to Isogeo
+        :param Metadata metadata_sent: metadata passed to the creation request
+        :param Metadata metadata_created: metadata returned by the creation request
+        :param tuple attributes_sent: attributes of `metadata_sent` actually written by the \
+            creation request, the others are taken from `metadata_created` (e.g. a service \
+            created from its title, URL and format). Defaults to None (all the attributes)
+        """
+        if attributes_sent is None:
+            md_local = metadata_sent.to_dict()
+        else:
+            md_local = metadata_created.to_dict()
+            for attr in attributes_sent:
+                md_local[attr] = getattr(metadata_sent, attr)
+        # server side attributes
+        for attr in ("_id", "_creator", "_created", "_modified"):
+            md_local[attr] = getattr(metadata_created, attr)
+        # subresources are not known locally
+        for attr in cls.SUBRESOURCES:
+            md_local.pop(attr, None)
+
+        return cls(api_client=api_client, metadata=Metadata(**md_local))
+
+    def __getattr__(self, name: str):
+        # only called for attributes which are not set on the handle itself
+        if name in ("isogeo", "local", "_complete"):
+            raise AttributeError(name)
+        if name in self.SUBRESOURCES:
+            return getattr(self.complete, name)
+        return getattr(self.local, name)
+
+    def __repr__(self) -> str:
+        return "<MetadataHandle {} ({})>".format(
+            self._id, "complete" if self._complete is not None else "local"
+        )
+
+    @property
+    def complete(self) -> Metadata:
+        """Complete metadata with all its subresources, retrieved once from the API."""
+        if self._complete is None:
+            logger.debug("Retrieving complete metadata: {}".format(self._id))
+            self._complete = self.isogeo.metadata.get(
+                metadata_id=self._id, include="all"
+            )
+        return self._complete
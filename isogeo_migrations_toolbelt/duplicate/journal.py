@@ -0,0 +1,253 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa: E265
+
+# ------------------------------------------------------------------------------
+# Name:         Duplication Journal
+# Purpose:      Record the completed steps of duplications to resume them
+# Author:       Isogeo
+#
+# Python:       3.6+
+# ------------------------------------------------------------------------------
+
+# ##############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class DuplicationJournal(object):
+    """Local SQLite journal of the duplications performed by MetadataDuplicator. Each completed \
+    step (destination created or updated, each subresource imported) is written as soon as the \
+    API confirmed it. When a duplication is launched again with the same journal, it reuses the \
+    destination metadata and only performs the steps which are not recorded yet.
+
+    A duplication is identified by the source metadata UUID, the duplication mode \
+    (same_group, other_group, import) and the target (workgroup or destination metadata UUID).
+
+    The destination metadata is journaled once its creation request returned: if the process \
+    stops between the creation and its recording, the destination created online is not known \
+    by the journal and the next run creates another one. Such orphan copies must be cleaned up \
+    by hand (e.g. searching the workgroup for the copy marks).
+
+    :param str path: path to the SQLite database file. It's created if it doesn't exist. \
+        Defaults to "duplication_journal.sqlite"
+
+    :Example:
+
+    .. code-block:: python
+
+        # one journal for the whole migration
+        journal = DuplicationJournal("./migration_journal.sqlite")
+
+        for md_uuid in li_uuids_to_duplicate:
+            md_duplicator = MetadataDuplicator(
+                api_client=isogeo, source_metadata_uuid=md_uuid, journal=journal
+            )
+            # if it crashes, run it again: it resumes where it stopped
+            md_duplicator.duplicate_into_other_group(destination_workgroup_uuid=WG_UUID)
+
+    """
+
+    def __init__(self, path: str = "duplication_journal.sqlite"):
+        self.path = Path(path)
+        if not self.path.parent.exists():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # shared between the threads importing subresources
+        self._lock = Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS duplications (
+                    source_uuid TEXT NOT NULL,
+                    mode TEXT NOT NULL,
+                    target TEXT NOT NULL,
+                    destination_uuid TEXT,
+                    status TEXT NOT NULL,
+                    started TEXT NOT NULL,
+                    updated TEXT NOT NULL,
+                    PRIMARY KEY (source_uuid, mode, target)
+                );
+                CREATE TABLE IF NOT EXISTS steps (
+                    source_uuid TEXT NOT NULL,
+                    mode TEXT NOT NULL,
+                    target TEXT NOT NULL,
+                    step TEXT NOT NULL,
+                    family TEXT NOT NULL,
+                    done TEXT NOT NULL,
+                    PRIMARY KEY (source_uuid, mode, target, step)
+                );
+                """
+            )
+
+    def close(self):
+        """Close the connection to the database."""
+        with self._lock:
+            self._connection.close()
+
+    # -- DUPLICATIONS ------------------------------------------------------------------
+    def destination(self, source_uuid: str, mode: str, target: str) -> str:
+        """Destination metadata UUID of a journaled duplication.
+
+        :param str source_uuid: source metadata UUID
+        :param str mode: duplication mode
+        :param str target: workgroup UUID or destination metadata UUID
+
+        :returns: destination metadata UUID or None if the duplication is not journaled
+        :rtype: str
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT destination_uuid FROM duplications "
+                "WHERE source_uuid = ? AND mode = ? AND target = ?",
+                (source_uuid, mode, target),
+            ).fetchone()
+        return row[0] if row else None
+
+    def start(self, source_uuid: str, mode: str, target: str, destination_uuid: str):
+        """Record the destination metadata of a duplication. If the duplication was already \
+        journaled with another destination (deleted meanwhile), its steps are forgotten.
+
+        :param str source_uuid: source metadata UUID
+        :param str mode: duplication mode
+        :param str target: workgroup UUID or destination metadata UUID
+        :param str destination_uuid: destination metadata UUID
+        """
+        if self.destination(source_uuid, mode, target) not in (None, destination_uuid):
+            self.forget(source_uuid, mode, target)
+
+        now = datetime.now().isoformat()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO duplications VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (source_uuid, mode, target, destination_uuid, "started", now, now),
+            )
+
+    def complete(self, source_uuid: str, mode: str, target: str):
+        """Mark a duplication as completed.
+
+        :param str source_uuid: source metadata UUID
+        :param str mode: duplication mode
+        :param str target: workgroup UUID or destination metadata UUID
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE duplications SET status = ?, updated = ? "
+                "WHERE source_uuid = ? AND mode = ? AND target = ?",
+                ("completed", datetime.now().isoformat(), source_uuid, mode, target),
+            )
+
+    def status(self, source_uuid: str, mode: str, target: str) -> str:
+        """Status of a duplication: None (not journaled), "started" or "completed".
+
+        :param str source_uuid: source metadata UUID
+        :param str mode: duplication mode
+        :param str target: workgroup UUID or destination metadata UUID
+
+        :rtype: str
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT status FROM duplications "
+                "WHERE source_uuid = ? AND mode = ? AND target = ?",
+                (source_uuid, mode, target),
+            ).fetchone()
+        return row[0] if row else None
+
+    def forget(self, source_uuid: str, mode: str = None, target: str = None):
+        """Remove duplications of a source metadata and their steps from the journal, so they \
+        can be performed again from scratch.
+
+        :param str source_uuid: source metadata UUID
+        :param str mode: duplication mode. Defaults to None (all modes)
+        :param str target: workgroup UUID or destination metadata UUID. \
+            Defaults to None (all targets)
+        """
+        query = "WHERE source_uuid = ?"
+        params = [source_uuid]
+        if mode is not None:
+            query += " AND mode = ?"
+            params.append(mode)
+        if target is not None:
+            query += " AND target = ?"
+            params.append(target)
+
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM steps " + query, params)
+            self._connection.execute("DELETE FROM duplications " + query, params)
+
+    # -- STEPS -------------------------------------------------------------------------
+    def done_steps(self, source_uuid: str, mode: str, target: str) -> set:
+        """Steps already completed for a duplication.
+
+        :param str source_uuid: source metadata UUID
+        :param str mode: duplication mode
+        :param str target: workgroup UUID or destination metadata UUID
+
+        :rtype: set
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT step FROM steps WHERE source_uuid = ? AND mode = ? AND target = ?",
+                (source_uuid, mode, target),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def mark_step(
+        self, source_uuid: str, mode: str, target: str, step: str, family: str
+    ):
+        """Record a completed step.
+
+        :param str source_uuid: source metadata UUID
+        :param str mode: duplication mode
+        :param str target: workgroup UUID or destination metadata UUID
+        :param str step: step key
+        :param str family: subresource family of the step (or "metadata")
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO steps VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    source_uuid,
+                    mode,
+                    target,
+                    step,
+                    family,
+                    datetime.now().isoformat(),
+                ),
+            )
+
+    def progress(self, source_uuid: str, mode: str, target: str) -> dict:
+        """Number of completed steps by subresource family.
+
+        :param str source_uuid: source metadata UUID
+        :param str mode: duplication mode
+        :param str target: workgroup UUID or destination metadata UUID
+
+        :rtype: dict
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT family, COUNT(*) FROM steps "
+                "WHERE source_uuid = ? AND mode = ? AND target = ? GROUP BY family",
+                (source_uuid, mode, target),
+            ).fetchall()
+        return dict(rows)
@@ -0,0 +1,121 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa: E265
+
+# ------------------------------------------------------------------------------
+# Name:         Keyword Cache
+# Purpose:      Cache keywords resolved during a migration run
+# Author:       Isogeo
+#
+# Python:       3.6+
+# ------------------------------------------------------------------------------
+
+# ##############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import logging
+from collections import OrderedDict
+from threading import Lock
+
+# Isogeo
+from isogeo_pysdk import Isogeo
+from isogeo_pysdk.models import Keyword
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class KeywordCache(object):
+    """Least recently used cache of the keywords retrieved from the API, meant to be shared by
+    all the MetadataDuplicator of a migration run. The same thesaurus keywords (INSPIRE themes,
+    workgroup keywords...) are then requested only once. Keywords complete enough to tag a
+    metadata (with their `_tag`) are built without any request, so they're not cached.
+
+    `hits` counts the requests saved by the cache and `misses` the requests sent.
+
+    :param Isogeo api_client: API client authenticated to Isogeo
+    :param int maxsize: maximum number of keywords to keep. Defaults to 2048
+
+    :Example:
+
+    .. code-block:: python
+
+        # one cache for the whole run
+        kw_cache = KeywordCache(api_client=isogeo)
+
+        for md_uuid in li_uuids_to_duplicate:
+            md_duplicator = MetadataDuplicator(
+                api_client=isogeo, source_metadata_uuid=md_uuid, keyword_cache=kw_cache
+            )
+            md_duplicator.duplicate_into_same_group()
+
+    """
+
+    def __init__(self, api_client: Isogeo, maxsize: int = 2048):
+        # store API client
+        self.isogeo = api_client
+
+        # cached keywords
+        self.maxsize = maxsize
+        self._keywords = OrderedDict()
+        self._lock = Lock()
+
+        # counters
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+    def get(self, keyword: dict) -> Keyword:
+        """Resolve a keyword as returned into the `keywords` subresource of a metadata. The
+        keyword is loaded from this dictionary when it's complete enough, else it's retrieved
+        from the cache or from the API.
+
+        :param dict keyword: keyword as returned by the API (at least with an `_id`)
+
+        :returns: the keyword or a tuple (False, HTTP status code) if the API failed to return it
+        :rtype: Keyword
+        """
+        if keyword.get("_tag"):
+            # the metadata subresource is enough to tag another metadata
+            return Keyword(
+                **{k: v for k, v in keyword.items() if k in Keyword.ATTR_TYPES}
+            )
+
+        keyword_id = keyword.get("_id")
+        with self._lock:
+            if keyword_id in self._keywords:
+                self._keywords.move_to_end(keyword_id)
+                self.hits += 1
+                return self._keywords.get(keyword_id)
+            self.misses += 1
+
+        # retrieve online keyword
+        resolved = self.isogeo.keyword.get(keyword_id=keyword_id, include=[])
+        if isinstance(resolved, tuple):
+            return resolved
+
+        with self._lock:
+            self._keywords[keyword_id] = resolved
+            self._keywords.move_to_end(keyword_id)
+            while len(self._keywords) > self.maxsize:
+                self._keywords.popitem(last=False)
+
+        return resolved
+
+    def clear(self):
+        """Empty the cache and reset counters."""
+        with self._lock:
+            self._keywords.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,433 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa: E265
+
+# ------------------------------------------------------------------------------
+# Name:         Workgroup Reference Cache
+# Purpose:      Cache the objects of a workgroup referenced by metadata
+# Author:       Isogeo
+#
+# Python:       3.6+
+# ------------------------------------------------------------------------------
+
+# ##############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import logging
+import re
+from threading import RLock
+from time import monotonic
+
+# Isogeo
+from isogeo_pysdk import Isogeo
+from isogeo_pysdk.checker import IsogeoChecker
+from isogeo_pysdk.models import (
+    Catalog,
+    Contact,
+    CoordinateSystem,
+    Specification,
+    Workgroup,
+)
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+checker = IsogeoChecker()
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class WorkgroupReferenceCache(object):
+    """Cache of the objects of a workgroup which are referenced by metadata (catalogs, contacts,
+    coordinate-systems, specifications). It's meant to be shared between many MetadataDuplicator
+    duplicating into the same workgroup: each kind of object is listed once, on first use, then
+    the cache is updated in place when an object is created through it.
+
+    If something else modifies the workgroup, call `invalidate` to reload on next use or set a
+    `max_age` to reload periodically. When a creation fails, the objects are reloaded and looked
+    up again, in case they've been created meanwhile.
+
+    :param Isogeo api_client: API client authenticated to Isogeo
+    :param str workgroup_uuid: UUID of the workgroup to cache
+    :param float max_age: number of seconds after which cached listings are reloaded. \
+        Defaults to None (never expires)
+    :param bool normalize_specifications: also match specifications whose link and name only \
+        differ by case, surrounding spaces or trailing slash. Defaults to False
+
+    :Example:
+
+    .. code-block:: python
+
+        # load the destination workgroup cache once
+        wg_cache = WorkgroupReferenceCache(api_client=isogeo, workgroup_uuid=WORKGROUP_UUID)
+
+        # share it between duplications
+        for md_uuid in li_uuids_to_duplicate:
+            md_duplicator = MetadataDuplicator(api_client=isogeo, source_metadata_uuid=md_uuid)
+            md_duplicator.duplicate_into_other_group(
+                destination_workgroup_uuid=WORKGROUP_UUID, workgroup_cache=wg_cache
+            )
+
+    """
+
+    KINDS = ("workgroup", "catalogs", "contacts", "coordinate_systems", "specifications")
+
+    def __init__(
+        self,
+        api_client: Isogeo,
+        workgroup_uuid: str,
+        max_age: float = None,
+        normalize_specifications: bool = False,
+    ):
+        # store API client
+        self.isogeo = api_client
+
+        # check workgroup UUID
+        if not checker.check_is_uuid(workgroup_uuid):
+            raise ValueError(
+                "Workgroup UUID is not a correct UUID: {}".format(workgroup_uuid)
+            )
+        self.workgroup_uuid = workgroup_uuid
+        self.max_age = max_age
+        self.normalize_specifications = normalize_specifications
+
+        # cached objects
+        self._lock = RLock()
+        self._loaded_at = {}
+        self._workgroup = None
+        self._catalogs = {}  # name: UUID
+        self._contacts = {}  # email: UUID
+        self._coordinate_systems = set()  # EPSG codes
+        self._specifications = []  # raw specifications
+        self._specifications_index = {}  # (link, name): raw specification
+
+    # -- CACHE MANAGEMENT --------------------------------------------------------------
+    def invalidate(self, kind: str = None):
+        """Mark cached objects as outdated: they'll be reloaded on next use.
+
+        :param str kind: kind of objects to invalidate. Defaults to None (all kinds)
+        """
+        with self._lock:
+            if kind is None:
+                self._loaded_at.clear()
+            elif kind in self.KINDS:
+                self._loaded_at.pop(kind, None)
+            else:
+                raise ValueError(
+                    "'{}' is not a cached kind of objects. Expected one of: {}".format(
+                        kind, self.KINDS
+                    )
+                )
+        logger.debug(
+            "Cache of workgroup {} invalidated: {}".format(
+                self.workgroup_uuid, kind or "all"
+            )
+        )
+
+    def _ensure_loaded(self, kind: str):
+        """Load a kind of objects from the API if it has never been loaded or if it's expired.
+
+        :param str kind: kind of objects to load
+        """
+        loaded_at = self._loaded_at.get(kind)
+        if loaded_at is not None and (
+            self.max_age is None or monotonic() - loaded_at < self.max_age
+        ):
+            return
+
+        if kind == "workgroup":
+            response = self.isogeo.workgroup.get(workgroup_id=self.workgroup_uuid)
+        elif kind == "catalogs":
+            response = self.isogeo.catalog.listing(
+                workgroup_id=self.workgroup_uuid, include=(), caching=0
+            )
+        elif kind == "contacts":
+            response = self.isogeo.contact.listing(
+                workgroup_id=self.workgroup_uuid, include=(), caching=0
+            )
+        elif kind == "coordinate_systems":
+            response = self.isogeo.srs.listing(
+                workgroup_id=self.workgroup_uuid, caching=0
+            )
+        else:
+            response = self.isogeo.specification.listing(
+                workgroup_id=self.workgroup_uuid, include="all", caching=0
+            )
+
+        # the SDK returns a tuple (False, status code) when the API replies with an error
+        if isinstance(response, tuple):
+            logger.error(
+                "Listing {} of workgroup {} failed: {}".format(
+                    kind, self.workgroup_uuid, response
+                )
+            )
+            return
+
+        if kind == "workgroup":
+            self._workgroup = response
+        elif kind == "catalogs":
+            self._catalogs = {cat.get("name"): cat.get("_id") for cat in response}
+        elif kind == "contacts":
+            self._contacts = {
+                ct.get("email"): ct.get("_id")
+                for ct in response
+                if isinstance(ct.get("email"), str)
+            }
+        elif kind == "coordinate_systems":
+            self._coordinate_systems = {srs.get("code") for srs in response}
+        else:
+            self._specifications = []
+            self._specifications_index = {}
+            for spec in response:
+                self._index_specification(spec)
+
+        self._loaded_at[kind] = monotonic()
+        logger.debug(
+            "Cache of workgroup {}: {} loaded.".format(self.workgroup_uuid, kind)
+        )
+
+    # -- PROPERTIES --------------------------------------------------------------------
+    @property
+    def workgroup(self) -> Workgroup:
+        """Cached workgroup."""
+        with self._lock:
+            self._ensure_loaded("workgroup")
+            return self._workgroup
+
+    @workgroup.setter
+    def workgroup(self, workgroup: Workgroup):
+        """Replace the cached workgroup, typically after an update."""
+        with self._lock:
+            self._workgroup = workgroup
+            self._loaded_at["workgroup"] = monotonic()
+
+    @property
+    def specifications(self) -> list:
+        """Cached specifications of the workgroup, including created ones."""
+        with self._lock:
+            self._ensure_loaded("specifications")
+            return self._specifications
+
+    # -- SPECIFICATIONS INDEX -----------------------------------------------------------
+    def _specification_key(self, link: str, name: str) -> tuple:
+        """Key of a specification into the index.
+
+        :param str link: specification link
+        :param str name: specification name
+
+        :rtype: tuple
+        """
+        if not self.normalize_specifications:
+            return (link, name)
+        if isinstance(link, str):
+            link = link.strip().rstrip("/").lower()
+        if isinstance(name, str):
+            name = re.sub(r"\s+", " ", name).strip().casefold()
+        return (link, name)
+
+    def _index_specification(self, specification: dict):
+        """Add a raw specification to the cache. The first one wins when several \
+        specifications share the same key.
+
+        :param dict specification: raw specification
+        """
+        self._specifications.append(specification)
+        self._specifications_index.setdefault(
+            self._specification_key(
+                specification.get("link"), specification.get("name")
+            ),
+            specification,
+        )
+
+    def find_specification(self, link: str, name: str) -> dict:
+        """Look for a specification of the workgroup by link and name.
+
+        :param str link: specification link
+        :param str name: specification name
+
+        :returns: raw specification or None
+        :rtype: dict
+        """
+        with self._lock:
+            self._ensure_loaded("specifications")
+            return self._specifications_index.get(self._specification_key(link, name))
+
+    # -- RESOLVERS ---------------------------------------------------------------------
+    def resolve_catalog(self, catalog: Catalog) -> Catalog:
+        """Match a catalog by name with the workgroup catalogs. Create it if it doesn't exist.
+
+        :param Catalog catalog: catalog to match (typically from another workgroup)
+
+        :returns: catalog of the cached workgroup
+        :rtype: Catalog
+        """
+        with self._lock:
+            self._ensure_loaded("catalogs")
+            if catalog.name in self._catalogs:
+                logger.info(
+                    "A catalog with the name '{}' already exists in the destination group. "
+                    "It'll be used.".format(catalog.name)
+                )
+                return Catalog(_id=self._catalogs.get(catalog.name))
+
+            # create it on the workgroup
+            new_catalog = self.isogeo.catalog.create(
+                workgroup_id=self.workgroup_uuid, catalog=catalog, check_exists=0
+            )
+            if isinstance(new_catalog, tuple):
+                # maybe created meanwhile by something else: look for it again
+                self.invalidate("catalogs")
+                self._ensure_loaded("catalogs")
+                if catalog.name in self._catalogs:
+                    logger.info(
+                        "Catalog '{}' has been created meanwhile in the destination group. "
+                        "It'll be used.".format(catalog.name)
+                    )
+                    return Catalog(_id=self._catalogs.get(catalog.name))
+                logger.error(
+                    "Catalog '{}' can't be created: {}".format(
+                        catalog.name, new_catalog
+                    )
+                )
+                return new_catalog
+
+            self._catalogs[new_catalog.name] = new_catalog._id
+            logger.info(
+                "Catalog '{}' has been created in the destination group. It'll be used.".format(
+                    new_catalog.name
+                )
+            )
+            return new_catalog
+
+    def resolve_contact(self, contact: Contact) -> Contact:
+        """Match a contact by email with the workgroup address-book. Create it if it doesn't exist.
+
+        :param Contact contact: contact to match (typically from another workgroup)
+
+        :returns: contact of the cached workgroup
+        :rtype: Contact
+        """
+        with self._lock:
+            self._ensure_loaded("contacts")
+            if isinstance(contact.email, str) and contact.email in self._contacts:
+                logger.info(
+                    "A contact ({}) with the email ({}) already exists in the destination "
+                    "group (shared group or address-book). It'll be used.".format(
+                        contact._id, contact.email
+                    )
+                )
+                return Contact(_id=self._contacts.get(contact.email))
+
+            # create it on the workgroup
+            new_contact = self.isogeo.contact.create(
+                workgroup_id=self.workgroup_uuid, contact=contact, check_exists=0
+            )
+            if isinstance(new_contact, tuple):
+                # maybe created meanwhile by something else: look for it again
+                self.invalidate("contacts")
+                self._ensure_loaded("contacts")
+                if isinstance(contact.email, str) and contact.email in self._contacts:
+                    logger.info(
+                        "Contact with the email ({}) has been created meanwhile in the "
+                        "destination group. It'll be used.".format(contact.email)
+                    )
+                    return Contact(_id=self._contacts.get(contact.email))
+                logger.error(
+                    "Contact '{}' can't be created: {}".format(
+                        contact.name, new_contact
+                    )
+                )
+                return new_contact
+
+            if isinstance(new_contact.email, str):
+                self._contacts[new_contact.email] = new_contact._id
+            logger.info(
+                "Contact '{}' has been created in the destination group. It'll be used.".format(
+                    new_contact.name
+                )
+            )
+            return new_contact
+
+    def resolve_coordinate_system(self, coordinate_system: CoordinateSystem):
+        """Associate a coordinate-system with the workgroup if it's not already done.
+
+        :param CoordinateSystem coordinate_system: coordinate-system to make available
+        """
+        with self._lock:
+            self._ensure_loaded("coordinate_systems")
+            if coordinate_system.code in self._coordinate_systems:
+                return
+
+            response = self.isogeo.srs.associate_workgroup(
+                workgroup=Workgroup(_id=self.workgroup_uuid),
+                coordinate_system=coordinate_system,
+            )
+            if isinstance(response, tuple):
+                self.invalidate("coordinate_systems")
+                logger.error(
+                    "Coordinate-system {} can't be associated with the destination "
+                    "workgroup: {}".format(coordinate_system.code, response)
+                )
+                return
+
+            self._coordinate_systems.add(coordinate_system.code)
+            logger.info(
+                "Coordinate-system {} was not associated with the destination workgroup. "
+                "It's now done.".format(coordinate_system.code)
+            )
+
+    def resolve_specification(self, specification: dict) -> Specification:
+        """Match a specification by link and name with the workgroup specifications. Create it
+        if it doesn't exist.
+
+        :param dict specification: raw specification to match (typically from another workgroup)
+
+        :returns: specification of the cached workgroup
+        :rtype: Specification
+        """
+        with self._lock:
+            # check if a similar specification already exists in the workgroup
+            wg_spec = self.find_specification(
+                link=specification.get("link"), name=specification.get("name")
+            )
+            # retrieve it if it's true
+            if wg_spec is not None:
+                return Specification(**wg_spec)
+
+            # create it else
+            new_specification = Specification()
+            new_specification.link = specification.get("link")
+            new_specification.name = specification.get("name")
+            new_specification.published = specification.get("published")
+            new_specification = self.isogeo.specification.create(
+                workgroup_id=self.workgroup_uuid,
+                specification=new_specification,
+                check_exists=0,
+            )
+            if isinstance(new_specification, tuple):
+                # maybe created meanwhile by something else: look for it again
+                self.invalidate("specifications")
+                wg_spec = self.find_specification(
+                    link=specification.get("link"), name=specification.get("name")
+                )
+                if wg_spec is not None:
+                    return Specification(**wg_spec)
+                logger.error(
+                    "Specification '{}' can't be created: {}".format(
+                        specification.get("name"), new_specification
+                    )
+                )
+                return new_specification
+
+            self._index_specification(new_specification.to_dict())
+            logger.info(
+                "A specification has been created into destination workgroup according to "
+                "{} specification from the origin workgroup.".format(specification.get("_id"))
+            )
+            return new_specification
@@ -0,0 +1,4 @@
+# coding: utf-8
+#! python3  # noqa: E265
+
+from .async_engine import AsyncEngine  # noqa: F401
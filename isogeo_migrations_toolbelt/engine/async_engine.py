@@ -0,0 +1,293 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa: E265
+
+# ------------------------------------------------------------------------------
+# Name:         Async Engine
+# Purpose:      Awaitable API over the toolbelt operations
+# Author:       Isogeo
+#
+# Python:       3.6+
+# ------------------------------------------------------------------------------
+
+# ##############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import Lock
+
+# Isogeo
+from isogeo_pysdk import Isogeo, Metadata
+
+# submodules
+from ..backup import BackupManager
+from ..delete import DeletionReport, MetadataDeleter
+from ..duplicate import KeywordCache, MetadataDuplicator, WorkgroupReferenceCache
+from ..utils import RateLimiter
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class AsyncEngine(object):
+    """Awaitable API to duplicate, import, backup, update and delete metadata from an asyncio \
+    event loop. The Isogeo SDK sends blocking requests, so they're sent from one pool of threads \
+    shared by all the operations of the engine: many operations can be awaited at once while \
+    the number of requests in flight stays bounded (and paced by the rate limiter).
+
+    Duplications share a keywords cache and one reference cache by destination workgroup.
+
+    :param Isogeo api_client: API client authenticated to Isogeo
+    :param int max_workers: number of operations performed simultaneously. Defaults to 10
+    :param RateLimiter rate_limiter: rate limiter pacing the API requests. Defaults to None \
+        (the one already installed on the API client or the shared one)
+
+    :Example:
+
+    .. code-block:: python
+
+        async def migrate(li_uuids):
+            async with AsyncEngine(api_client=isogeo, max_workers=10) as engine:
+                return await asyncio.gather(
+                    *[
+                        engine.duplicate_into_other_group(
+                            source_metadata_uuid=md_uuid,
+                            destination_workgroup_uuid=WORKGROUP_UUID,
+                            copymark_title=False,
+                        )
+                        for md_uuid in li_uuids
+                    ]
+                )
+
+        li_new_md = asyncio.run(migrate(li_uuids_to_migrate))
+
+    """
+
+    def __init__(
+        self,
+        api_client: Isogeo,
+        max_workers: int = 10,
+        rate_limiter: RateLimiter = None,
+    ):
+        # store API client, paced by the rate limiter
+        self.isogeo = RateLimiter.apply(api_client, rate_limiter)
+        self.max_workers = max_workers
+
+        # shared between all the operations
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="IsogeoAsyncEngine_"
+        )
+        self.keyword_cache = KeywordCache(api_client=self.isogeo)
+        self._workgroup_caches = {}
+        self._lock = Lock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Wait for the pending operations then release the threads."""
+        self._executor.shutdown(wait=True)
+
+    async def run(self, func, *args, **kwargs):
+        """Await a blocking function, executed by the shared pool of threads.
+
+        :param func: function to execute (typically a method of the API client)
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+
+    # -- DUPLICATE ---------------------------------------------------------------------
+    def _workgroup_cache(self, workgroup_uuid: str) -> WorkgroupReferenceCache:
+        """Reference cache of a destination workgroup, shared by the duplications.
+
+        :param str workgroup_uuid: destination workgroup UUID
+        """
+        with self._lock:
+            if workgroup_uuid not in self._workgroup_caches:
+                self._workgroup_caches[workgroup_uuid] = WorkgroupReferenceCache(
+                    api_client=self.isogeo, workgroup_uuid=workgroup_uuid
+                )
+            return self._workgroup_caches.get(workgroup_uuid)
+
+    def _duplicate(
+        self,
+        source_metadata_uuid: str,
+        mode: str,
+        duplicator_kwargs: dict,
+        kwargs: dict,
+    ):
+        """Load the source metadata and perform the duplication (blocking).
+
+        :param str source_metadata_uuid: UUID of the metadata to be duplicated (source)
+        :param str mode: name of the MetadataDuplicator method to use
+        :param dict duplicator_kwargs: other parameters passed to the MetadataDuplicator
+        :param dict kwargs: parameters of the duplication method
+        """
+        duplicator_kwargs = dict(duplicator_kwargs or {})
+        duplicator_kwargs.setdefault("keyword_cache", self.keyword_cache)
+
+        md_duplicator = MetadataDuplicator(
+            api_client=self.isogeo,
+            source_metadata_uuid=source_metadata_uuid,
+            **duplicator_kwargs
+        )
+        return getattr(md_duplicator, mode)(**kwargs)
+
+    async def duplicate_into_same_group(
+        self, source_metadata_uuid: str, duplicator_kwargs: dict = None, **kwargs
+    ) -> Metadata:
+        """Awaitable `MetadataDuplicator.duplicate_into_same_group`.
+
+        :param str source_metadata_uuid: UUID of the metadata to be duplicated (source)
+        :param dict duplicator_kwargs: other parameters passed to the MetadataDuplicator \
+            (max_workers, journal...). Defaults to None
+        :param kwargs: parameters of the duplication (copymark_title...)
+        """
+        return await self.run(
+            self._duplicate,
+            source_metadata_uuid,
+            "duplicate_into_same_group",
+            duplicator_kwargs,
+            kwargs,
+        )
+
+    async def duplicate_into_other_group(
+        self,
+        source_metadata_uuid: str,
+        destination_workgroup_uuid: str,
+        duplicator_kwargs: dict = None,
+        **kwargs
+    ) -> Metadata:
+        """Awaitable `MetadataDuplicator.duplicate_into_other_group`. The reference cache of \
+        the destination workgroup is shared by the duplications of the engine.
+
+        :param str source_metadata_uuid: UUID of the metadata to be duplicated (source)
+        :param str destination_workgroup_uuid: UUID of the destination workgroup
+        :param dict duplicator_kwargs: other parameters passed to the MetadataDuplicator \
+            (max_workers, journal...). Defaults to None
+        :param kwargs: parameters of the duplication (copymark_title...)
+        """
+        kwargs["destination_workgroup_uuid"] = destination_workgroup_uuid
+        if kwargs.get("workgroup_cache") is None:
+            kwargs["workgroup_cache"] = self._workgroup_cache(
+                destination_workgroup_uuid
+            )
+        return await self.run(
+            self._duplicate,
+            source_metadata_uuid,
+            "duplicate_into_other_group",
+            duplicator_kwargs,
+            kwargs,
+        )
+
+    async def import_into_other_metadata(
+        self,
+        source_metadata_uuid: str,
+        destination_metadata_uuid: str,
+        duplicator_kwargs: dict = None,
+        **kwargs
+    ) -> Metadata:
+        """Awaitable `MetadataDuplicator.import_into_other_metadata`.
+
+        :param str source_metadata_uuid: UUID of the metadata to be imported (source)
+        :param str destination_metadata_uuid: UUID of the metadata to update with source metadata
+        :param dict duplicator_kwargs: other parameters passed to the MetadataDuplicator \
+            (max_workers, journal...). Defaults to None
+        :param kwargs: parameters of the import (differential, exclude_fields...)
+        """
+        kwargs["destination_metadata_uuid"] = destination_metadata_uuid
+        return await self.run(
+            self._duplicate,
+            source_metadata_uuid,
+            "import_into_other_metadata",
+            duplicator_kwargs,
+            kwargs,
+        )
+
+    # -- BACKUP ------------------------------------------------------------------------
+    async def backup_metadata(
+        self,
+        search_params: dict,
+        output_folder: str,
+        output_format: str = "json",
+        backup_kwargs: dict = None,
+    ) -> bool:
+        """Awaitable `BackupManager.metadata`: metadata are retrieved and stored as JSON \
+        files by the shared pool of threads.
+
+        :param dict search_params: search parameters (query, specific_md, group)
+        :param str output_folder: path to the folder where to store the exported data
+        :param str output_format: "json", "jsonl.gz" or "jsonl.zst". Defaults to "json"
+        :param dict backup_kwargs: other parameters passed to the BackupManager \
+            (page_size, direct_write...). Defaults to None
+
+        :returns: True if export reached the end, False if a search page still failed \
+            (see `BackupManager.metadata`)
+        :rtype: bool
+        """
+        backup_mngr = BackupManager(
+            api_client=self.isogeo, output_folder=output_folder, **(backup_kwargs or {})
+        )
+        li_failed_pages = []
+        await backup_mngr._export_metadata_asynchronous(
+            search_params=search_params,
+            executor=self._executor,
+            output_format=output_format,
+            failed_pages=li_failed_pages,
+        )
+        return not li_failed_pages
+
+    # -- UPDATE ------------------------------------------------------------------------
+    async def update(self, metadata: Metadata) -> Metadata:
+        """Awaitable metadata update.
+
+        :param Metadata metadata: metadata to update
+
+        :returns: the updated metadata or a tuple (False, HTTP status code)
+        :rtype: Metadata
+        """
+        md_updated = await self.run(self.isogeo.metadata.update, metadata)
+        if isinstance(md_updated, tuple):
+            logger.error("{} can't be updated: {}".format(metadata._id, md_updated[1]))
+        return md_updated
+
+    # -- DELETE ------------------------------------------------------------------------
+    async def delete(
+        self, metadata_ids_list: list, hard_mode: bool = 0, dependencies: bool = False
+    ) -> DeletionReport:
+        """Awaitable `MetadataDeleter.delete`.
+
+        :param list metadata_ids_list: list of Isogeo Metadata UUID to delete
+        :param bool hard_mode: really delete the metadata. Defaults to 0 (soft mode)
+        :param bool dependencies: dissociate the service layers of the metadata before \
+            deleting them (see `MetadataDeleter`). Defaults to False
+
+        :returns: report of the deletion, by metadata (see `MetadataDeleter.report`)
+        :rtype: DeletionReport
+        """
+        md_deleter = MetadataDeleter(
+            api_client=self.isogeo,
+            max_workers=self.max_workers,
+            dependencies=dependencies,
+        )
+        md_deleter.hard_mode = hard_mode
+        # pre-flight searches are blocking too
+        await self.run(md_deleter._prepare_routes, metadata_ids_list)
+        return await md_deleter._run_deletion_asynchronous(executor=self._executor)
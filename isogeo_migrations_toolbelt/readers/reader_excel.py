@@ -16,7 +16,6 @@
 import logging
 from os import environ
 from pathlib import Path
-from time import sleep
 from timeit import default_timer
 
 # 3rd party
@@ -26,6 +25,7 @@ import urllib3
 
 # Isogeo
 from isogeo_pysdk import Isogeo, IsogeoChecker, Metadata
+from isogeo_migrations_toolbelt.utils import RateLimiter
 
 # #############################################################################
 # ######## Globals #################
@@ -80,6 +80,9 @@ isogeo.connect(
     password=environ.get("ISOGEO_USER_PASSWORD"),
 )
 
+# pace the requests instead of waiting after each update
+RateLimiter.apply(isogeo)
+
 print("Authentication succeeded at {:5.2f}s".format(default_timer() - START_TIME))
 
 # -- Parse Excel workbook --
@@ -215,7 +218,6 @@ for row in ws_vectors.iter_rows(min_row=2):
 
     # update online metadata
     isogeo.metadata.update(target_md)
-    sleep(1)
     logger.info(
         "{} update finished at {:5.2f}s".format(
             metadata_uuid, default_timer() - START_TIME
@@ -16,6 +16,7 @@
 # Standard library
 import logging
 import re
+from collections import Counter
 from concurrent.futures import ThreadPoolExecutor
 
 # 3rd party
@@ -24,6 +25,9 @@ import urllib3
 # Isogeo
 from isogeo_pysdk import Isogeo, Metadata
 
+# submodules
+from ..utils import RateLimiter
+
 # from .updater import MetadataUpdater
 
 # #############################################################################
@@ -49,6 +53,9 @@ class SearchReplaceManager(object):
     :param dict attributes_patterns: dictionary of metadata attributes and tuple of "value to be replaced", "replacement value".
     :param dict prepositions: dictionary used to manage special cases related to prepositions. \
         Structure: {"preposition to be replaced": "replacement preposition"}
+    :param int max_workers: number of metadata updated simultaneously. Defaults to 10
+    :param RateLimiter rate_limiter: rate limiter pacing the API requests. Defaults to None \
+        (the one already installed on the API client or the shared one)
     """
 
     def __init__(
@@ -57,9 +64,12 @@ class SearchReplaceManager(object):
         objects_kind: str = "metadata",
         attributes_patterns: dict = {"title": None, "abstract": None},
         prepositions: dict = None,
+        max_workers: int = 10,
+        rate_limiter: RateLimiter = None,
     ):
-        # store API client
-        self.isogeo = api_client
+        # store API client, paced by the rate limiter
+        self.isogeo = RateLimiter.apply(api_client, rate_limiter)
+        self.max_workers = max_workers
 
         # check object_kind
         if objects_kind != "metadata":
@@ -113,80 +123,98 @@ class SearchReplaceManager(object):
             return metadatas_to_update
 
         # if not safe, launch the update
-        with ThreadPoolExecutor(thread_name_prefix="IsogeoSearchReplace") as executor:
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="IsogeoSearchReplace"
+        ) as executor:
             for md in metadatas_to_update:
                 logger.info("Metadata sent to update: " + md._id)
                 executor.submit(self.isogeo.metadata.update, metadata=md)
 
     def filter_matching_metadatas(self, isogeo_search_results: list) -> tuple:
-        """Filter search results basing on matching patterns.
+        """Filter search results basing on matching patterns. Every metadata is parsed \
+        once for all the attributes: patterns are evaluated on the raw search result and \
+        the Metadata object is built only for the metadata matching at least one of them.
 
         :param MetadataSearch isogeo_search_results: Isogeo search results (`MetadataSearch.results`)
 
         :returns: a tuple of objects with the updated attributes
         :rtype: tuple
         """
-        # out list
+        # out objects, by UUID
         di_out_objects = {}
 
-        # parse attributes to replace
-        for attribute, pattern in self.attributes_patterns.items():
-            logger.info("Searching into '{}' values...".format(attribute))
-            # counters
-            empty = 0
-            ignored = 0
-            matched = 0
-            # parse metadatas
-            for md in isogeo_search_results:
-                # load metadata as object
-                metadata = Metadata.clean_attributes(md)
+        # counters by attribute
+        di_counters = {
+            attribute: Counter(empty=0, ignored=0, matched=0)
+            for attribute in self.attributes_patterns
+        }
+
+        # raw keys of the attributes (some are renamed by Metadata.clean_attributes)
+        di_raw_keys = {
+            attribute: Metadata.ATTR_MAP.get(attribute, attribute)
+            for attribute in self.attributes_patterns
+        }
+
+        logger.info(
+            "Searching into '{}' values...".format(
+                "', '".join(self.attributes_patterns)
+            )
+        )
+        # parse metadatas
+        for md in isogeo_search_results:
+            di_replacements = {}
+            # parse attributes to replace
+            for attribute, pattern in self.attributes_patterns.items():
                 # get attribute value
-                in_value = getattr(metadata, attribute)
+                in_value = md.get(di_raw_keys.get(attribute))
                 # check if attribute has a value
                 if not isinstance(in_value, str):
-                    empty += 1
+                    di_counters[attribute]["empty"] += 1
                     continue
 
                 # special cases: check if title is different from the technical name
-                if attribute == "title" and in_value == metadata.name:
-                    empty += 1
+                if attribute == "title" and in_value == md.get("name"):
+                    di_counters[attribute]["empty"] += 1
                     continue
 
                 # check if the value matches the search
-                if pattern[0] in str(in_value):
+                if pattern[0] in in_value:
                     logger.debug(
                         "Value of '{}' to change spotted in {}: '{}'".format(
-                            attribute, metadata._id, in_value
+                            attribute, md.get("_id"), in_value
                         )
                     )
-                    matched += 1
-
-                    if metadata._id in di_out_objects:
-                        # object has already been previously updated
-                        updated_obj = di_out_objects.get(metadata._id)
-                        # apply replacement
-                        setattr(
-                            updated_obj, attribute, self.replacer(in_value, pattern)
-                        )
-                        di_out_objects[metadata._id] = updated_obj
-                    else:
-                        setattr(metadata, attribute, self.replacer(in_value, pattern))
-                        di_out_objects[metadata._id] = metadata
+                    di_counters[attribute]["matched"] += 1
+                    di_replacements[attribute] = self.replacer(in_value, pattern)
                 else:
-                    ignored += 1
+                    di_counters[attribute]["ignored"] += 1
+
+            if not di_replacements:
+                continue
 
-            # log for this attribute
+            # load metadata as object, without altering the search result
+            metadata = Metadata.clean_attributes(dict(md))
+            # apply replacements
+            for attribute, out_value in di_replacements.items():
+                setattr(metadata, attribute, out_value)
+            di_out_objects[metadata._id] = metadata
+
+        # log by attribute
+        for attribute, pattern in self.attributes_patterns.items():
+            counter = di_counters.get(attribute)
             logger.info(
-                "{} metadatas do not contains a valid {}".format(empty, attribute)
+                "{} metadatas do not contains a valid {}".format(
+                    counter.get("empty"), attribute
+                )
             )
             logger.info(
                 "{} metadatas.{} DO NOT MATCH the pattern: {}".format(
-                    ignored, attribute, pattern[0]
+                    counter.get("ignored"), attribute, pattern[0]
                 )
             )
             logger.info(
                 "{} metadatas.{} MATCH the pattern: {}".format(
-                    matched, attribute, pattern[0]
+                    counter.get("matched"), attribute, pattern[0]
                 )
             )
 
@@ -16,6 +16,7 @@
 # Standard library
 import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 # Isogeo
 from isogeo_pysdk import Isogeo, Metadata
@@ -44,11 +45,16 @@ class MetadataUpdater:
         # create a queue that only allows a maximum of two items
         self.queue_updating = asyncio.Queue()
         self.max_workers = max_workers
+        self._executor = None
 
     async def batch_updates(self):
         # DON'T await here; start consuming things out of the queue, and
         # meanwhile execution of this function continues. We'll start two
         # coroutines for fetching and two coroutines for processing.
+        # blocking SDK requests are sent from threads, not from the event loop
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="IsogeoMetadataUpdater_"
+        )
         all_the_coros = asyncio.gather(
             *[self._worker(i) for i in range(self.max_workers)]
         )
@@ -63,7 +69,11 @@ class MetadataUpdater:
             await self.queue_updating.put(None)
 
         # now make sure everything is done
-        await all_the_coros
+        try:
+            await all_the_coros
+        finally:
+            self._executor.shutdown(wait=True)
+            self._executor = None
 
     async def _worker(self, i):
         while True:
@@ -77,7 +87,9 @@ class MetadataUpdater:
 
     async def update(self, metadata: Metadata):
         logger.debug("Updating metadata: " + metadata.title_or_name())
-        md_updated = self.isogeo.metadata.update(metadata)
+        md_updated = await asyncio.get_event_loop().run_in_executor(
+            self._executor, self.isogeo.metadata.update, metadata
+        )
         # await asyncio.sleep(2)
         if isinstance(md_updated, Metadata):
             logger.debug(f"{metadata._id} has been updated")
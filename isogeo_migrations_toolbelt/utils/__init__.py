@@ -0,0 +1,5 @@
+# coding: utf-8
+#! python3  # noqa: E265
+
+from .bounded_executor import BoundedExecutor  # noqa: F401
+from .rate_limiter import RateLimiter  # noqa: F401
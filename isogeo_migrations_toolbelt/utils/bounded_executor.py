@@ -0,0 +1,147 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa: E265
+
+# ------------------------------------------------------------------------------
+# Name:         Bounded Executor
+# Purpose:      Run blocking tasks over many items with a bounded window in flight
+# Author:       Isogeo
+#
+# Python:       3.6+
+# ------------------------------------------------------------------------------
+
+# ##############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import asyncio
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# end of the items
+_END = object()
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class BoundedExecutor(object):
+    """Apply a blocking function (typically an API request) to many items with a pool of \
+    threads, keeping only a window of items in flight: items are pulled from the iterable \
+    only when there is room, and results are yielded as soon as they're completed (not in the \
+    order of the items). Memory stays bounded whatever the number of items.
+
+    :param int max_workers: number of threads. Defaults to 5
+    :param int window: number of items in flight (submitted but not yielded yet). \
+        Defaults to None (twice the number of threads)
+    :param ThreadPoolExecutor executor: pool of threads to use instead of a new one, e.g. \
+        shared by several operations. Defaults to None
+    :param str thread_name_prefix: name prefix of the new threads. \
+        Defaults to "IsogeoBoundedExecutor_"
+
+    :Example:
+
+    .. code-block:: python
+
+        bounded_executor = BoundedExecutor(max_workers=10, window=50)
+
+        # from a thread
+        for md_uuid, md in bounded_executor.map(isogeo.metadata.get, li_uuids):
+            print(md_uuid, md.title)
+
+        # from a coroutine
+        async for md_uuid, md in bounded_executor.amap(isogeo.metadata.get, li_uuids):
+            print(md_uuid, md.title)
+
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 5,
+        window: int = None,
+        executor: ThreadPoolExecutor = None,
+        thread_name_prefix: str = "IsogeoBoundedExecutor_",
+    ):
+        if max_workers < 1:
+            raise ValueError("'max_workers' must be at least 1.")
+        self.max_workers = max_workers
+        self.window = max(1, window or 2 * max_workers)
+        self.executor = executor
+        self.thread_name_prefix = thread_name_prefix
+
+    def _new_executor(self) -> ThreadPoolExecutor:
+        """Pool of threads used when none was given."""
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=self.thread_name_prefix
+        )
+
+    def map(self, func, items):
+        """Apply a function to the items from the current thread.
+
+        :param func: blocking function taking an item
+        :param items: iterable of items, consumed lazily
+
+        :returns: generator of tuples (item, result), as they're completed
+        """
+        executor = self.executor or self._new_executor()
+        pending = {}
+        try:
+            for item in items:
+                pending[executor.submit(func, item)] = item
+                while len(pending) >= self.window:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield pending.pop(future), future.result()
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+        finally:
+            if self.executor is None:
+                executor.shutdown(wait=True)
+
+    async def amap(self, func, items):
+        """Apply a function to the items from a coroutine. Items are pulled by the pool of \
+        threads too, so a blocking iterable (e.g. a paginated search) doesn't block the \
+        event loop.
+
+        :param func: blocking function taking an item
+        :param items: iterable of items, consumed lazily
+
+        :returns: asynchronous generator of tuples (item, result), as they're completed
+        """
+        loop = asyncio.get_event_loop()
+        executor = self.executor or self._new_executor()
+        items = iter(items)
+        pending = {}
+        try:
+            while True:
+                item = await loop.run_in_executor(executor, next, items, _END)
+                if item is _END:
+                    break
+                pending[loop.run_in_executor(executor, func, item)] = item
+                while len(pending) >= self.window:
+                    done, _ = await asyncio.wait(
+                        list(pending), return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        yield pending.pop(future), future.result()
+
+            while pending:
+                done, _ = await asyncio.wait(
+                    list(pending), return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    yield pending.pop(future), future.result()
+        finally:
+            if self.executor is None:
+                executor.shutdown(wait=True)
@@ -0,0 +1,251 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa: E265
+
+# ------------------------------------------------------------------------------
+# Name:         Rate Limiter
+# Purpose:      Pace the requests sent to the Isogeo API by the toolbelt
+# Author:       Isogeo
+#
+# Python:       3.6+
+# ------------------------------------------------------------------------------
+
+# ##############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import logging
+from threading import Lock
+from time import monotonic, sleep
+
+# 3rd party
+from requests.exceptions import ConnectionError, Timeout
+
+# Isogeo
+from isogeo_pysdk import Isogeo
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class RateLimiter(object):
+    """Token bucket pacing the requests sent to the Isogeo API. It's meant to be shared by all \
+    the toolbelt components of a process (duplicators, backup, deletion, search and replace...).
+
+    The rate adapts itself to the API: it grows a little after each successful request and it's \
+    cut down as soon as the API replies with a 429 (too many requests) or a 5xx status code. \
+    Requests refused with a 429 are sent again, after the delay asked by the API if any.
+
+    :param float rate: initial number of requests per second. Defaults to 10
+    :param float min_rate: lowest rate, reached after repeated back offs. Defaults to 0.5
+    :param float max_rate: highest rate, reached after repeated successes. Defaults to 50
+    :param float increase: requests per second added after each success. Defaults to 0.1
+    :param float decrease: factor applied to the rate after each back off. Defaults to 0.5
+    :param int burst: number of requests which can be sent at once. Defaults to None (initial rate)
+    :param int max_retries: number of times a request refused with a 429 is sent again. \
+        Defaults to 3
+
+    :Example:
+
+    .. code-block:: python
+
+        # all the requests of the client are paced by the rate limiter
+        rate_limiter = RateLimiter(rate=5, max_rate=20)
+        rate_limiter.install(isogeo)
+
+        # toolbelt components use the rate limiter already installed on the client
+        md_duplicator = MetadataDuplicator(api_client=isogeo, source_metadata_uuid=md_uuid)
+
+    """
+
+    _shared = None
+    _shared_lock = Lock()
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        min_rate: float = 0.5,
+        max_rate: float = 50.0,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+        burst: int = None,
+        max_retries: int = 3,
+    ):
+        if not 0 < min_rate <= rate <= max_rate:
+            raise ValueError(
+                "Rates must verify 0 < min_rate <= rate <= max_rate. Given: {}, {}, {}".format(
+                    min_rate, rate, max_rate
+                )
+            )
+        if not 0 < decrease < 1:
+            raise ValueError(
+                "'decrease' must be between 0 and 1 (excluded). Given: {}".format(
+                    decrease
+                )
+            )
+
+        self.rate = float(rate)
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.burst = burst or max(1, int(rate))
+        self.max_retries = max_retries
+
+        # bucket
+        self._lock = Lock()
+        self._tokens = float(self.burst)
+        self._updated_at = monotonic()
+        self._paused_until = 0.0
+
+        # counters
+        self.requests = 0
+        self.throttled = 0
+
+    @classmethod
+    def shared(cls):
+        """Rate limiter shared by the toolbelt components which are not given one.
+
+        :rtype: RateLimiter
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @classmethod
+    def apply(cls, api_client: Isogeo, rate_limiter=None) -> Isogeo:
+        """Make sure that an API client is paced by a rate limiter. If no rate limiter is given, \
+        the one already installed on the client is kept, else the shared one is installed.
+
+        :param Isogeo api_client: API client authenticated to Isogeo
+        :param RateLimiter rate_limiter: rate limiter to install. Defaults to None
+
+        :returns: the API client
+        :rtype: Isogeo
+        """
+        if rate_limiter is None:
+            if isinstance(getattr(api_client, "_rate_limiter", None), cls):
+                return api_client
+            rate_limiter = cls.shared()
+        return rate_limiter.install(api_client)
+
+    def install(self, api_client: Isogeo) -> Isogeo:
+        """Pace all the requests sent by an API client with this rate limiter. It replaces any \
+        rate limiter previously installed on the client.
+
+        :param Isogeo api_client: API client authenticated to Isogeo
+
+        :returns: the API client
+        :rtype: Isogeo
+        """
+        if getattr(api_client, "_rate_limiter", None) is self:
+            return api_client
+
+        # the SDK routes all go through the session request method
+        request = vars(api_client).get("_unlimited_request", api_client.request)
+
+        def limited_request(*args, **kwargs):
+            return self.call(request, *args, **kwargs)
+
+        api_client._unlimited_request = request
+        api_client._rate_limiter = self
+        api_client.request = limited_request
+
+        logger.debug(
+            "Rate limiter installed on the API client: {:.2f} requests/s.".format(
+                self.rate
+            )
+        )
+        return api_client
+
+    # -- PACING ------------------------------------------------------------------------
+    def acquire(self):
+        """Wait until a request can be sent."""
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+            # the token is reserved even if the bucket is empty: next callers wait longer
+            self._tokens -= 1
+            wait = max(-self._tokens / self.rate, self._paused_until - now)
+            self.requests += 1
+
+        if wait > 0:
+            sleep(wait)
+
+    def success(self):
+        """Speed up after a successful request (additive increase)."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def back_off(self, retry_after: float = None):
+        """Slow down after a throttled or failed request (multiplicative decrease).
+
+        :param float retry_after: number of seconds to wait before sending any other request. \
+            Defaults to None
+        """
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self.throttled += 1
+            if retry_after:
+                self._paused_until = max(self._paused_until, monotonic() + retry_after)
+
+        logger.warning(
+            "Isogeo API is overloaded. Requests rate lowered to {:.2f} requests/s.".format(
+                self.rate
+            )
+        )
+
+    def call(self, func, *args, **kwargs):
+        """Send a request through the rate limiter and adapt the rate to the response.
+
+        :param func: function sending the request and returning a requests.Response
+        """
+        for attempt in range(self.max_retries + 1):
+            self.acquire()
+            try:
+                response = func(*args, **kwargs)
+            except (ConnectionError, Timeout):
+                self.back_off()
+                raise
+
+            status_code = getattr(response, "status_code", None)
+            if status_code == 429:
+                self.back_off(retry_after=self._retry_after(response))
+                if attempt < self.max_retries:
+                    logger.info(
+                        "Request refused by the API (429). Attempt {}/{}.".format(
+                            attempt + 1, self.max_retries
+                        )
+                    )
+                    continue
+            elif isinstance(status_code, int) and status_code >= 500:
+                self.back_off()
+            else:
+                self.success()
+
+            return response
+
+    @staticmethod
+    def _retry_after(response) -> float:
+        """Delay asked by the API before sending another request, if any.
+
+        :param requests.Response response: API response
+
+        :rtype: float
+        """
+        try:
+            return float(response.headers.get("Retry-After"))
+        except (AttributeError, TypeError, ValueError):
+            return None
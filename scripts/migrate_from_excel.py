@@ -17,7 +17,6 @@
 import logging
 from os import environ
 from pathlib import Path
-from time import sleep
 from timeit import default_timer
 
 # 3rd party
@@ -27,6 +26,7 @@ from openpyxl import load_workbook
 
 # Isogeo
 from isogeo_pysdk import Isogeo, IsogeoChecker, Metadata
+from isogeo_migrations_toolbelt import RateLimiter
 
 # #############################################################################
 # ######## Globals #################
@@ -81,6 +81,9 @@ isogeo.connect(
     password=environ.get("ISOGEO_USER_PASSWORD"),
 )
 
+# pace the requests instead of waiting after each update
+RateLimiter.apply(isogeo)
+
 print("Authentication succeeded at {:5.2f}s".format(default_timer() - START_TIME))
 
 # -- Parse Excel workbook --
@@ -216,7 +219,6 @@ for row in ws_vectors.iter_rows(min_row=2):
 
     # update online metadata
     isogeo.md_update(target_md)
-    sleep(1)
     logger.info(
         "{} update finished at {:5.2f}s".format(
             metadata_uuid, default_timer() - START_TIME
@@ -51,6 +51,8 @@ setup(
     extras_require={
         "dev": ["black", "python-dotenv"],
         "test": ["pytest", "pytest-cov"],
+        "orjson": ["orjson"],
+        "zstd": ["zstandard"],
     },
     python_requires=">=3.6, <4",
     # packaging
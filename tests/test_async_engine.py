@@ -0,0 +1,143 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_async_engine
+        # for specific python -m unittest
+        python -m unittest tests.test_async_engine.TestAsyncEngine.test_shared_caches
+
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import asyncio
+import unittest
+from tempfile import TemporaryDirectory
+from threading import current_thread
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+# module target
+from isogeo_migrations_toolbelt import AsyncEngine, MetadataDeleter
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestAsyncEngine(unittest.TestCase):
+    """Test the async engine with an offline API client."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Executed before each test."""
+        self.api_client = MagicMock()
+        self.engine = AsyncEngine(api_client=self.api_client, max_workers=4)
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        """Executed after each test."""
+        self.engine.close()
+        self.loop.close()
+
+    # -- TESTS ---------------------------------------------------------
+    def test_shared_caches(self):
+        """Keywords and workgroup caches are shared by the duplications"""
+        li_workgroups = [uuid4().hex, uuid4().hex]
+
+        async def duplicate():
+            await self.engine.duplicate_into_same_group(uuid4().hex)
+            await asyncio.gather(
+                *[
+                    self.engine.duplicate_into_other_group(
+                        uuid4().hex, destination_workgroup_uuid=workgroup_uuid
+                    )
+                    for workgroup_uuid in li_workgroups + li_workgroups
+                ]
+            )
+
+        with patch(
+            "isogeo_migrations_toolbelt.engine.async_engine.MetadataDuplicator"
+        ) as duplicator:
+            self.loop.run_until_complete(duplicate())
+
+        # one duplicator by operation, all with the same keywords cache
+        self.assertEqual(duplicator.call_count, 5)
+        for args, kwargs in duplicator.call_args_list:
+            self.assertIs(kwargs.get("keyword_cache"), self.engine.keyword_cache)
+
+        # one reference cache by destination workgroup
+        di_caches = {}
+        li_calls = duplicator.return_value.duplicate_into_other_group.call_args_list
+        for args, kwargs in li_calls:
+            workgroup_cache = kwargs.get("workgroup_cache")
+            self.assertEqual(
+                workgroup_cache.workgroup_uuid, kwargs.get("destination_workgroup_uuid")
+            )
+            di_caches.setdefault(workgroup_cache.workgroup_uuid, set()).add(
+                id(workgroup_cache)
+            )
+        self.assertEqual(set(di_caches), set(li_workgroups))
+        self.assertTrue(all(len(caches) == 1 for caches in di_caches.values()))
+
+    def test_delete_off_loop(self):
+        """Pre-flight searches of a deletion don't block the event loop"""
+        li_uuids = [uuid4().hex for i in range(3)]
+        search = MagicMock()
+        search.results = [{"_id": md_uuid} for md_uuid in li_uuids]
+        self.api_client.search.return_value = search
+
+        li_threads = []
+        prepare_routes = MetadataDeleter._prepare_routes
+
+        def record_thread(md_deleter, metadata_ids_list):
+            li_threads.append(current_thread().name)
+            return prepare_routes(md_deleter, metadata_ids_list)
+
+        with patch.object(MetadataDeleter, "_prepare_routes", record_thread):
+            report = self.loop.run_until_complete(
+                self.engine.delete(metadata_ids_list=li_uuids, hard_mode=1)
+            )
+
+        self.assertEqual(len(li_threads), 1)
+        self.assertTrue(li_threads[0].startswith("IsogeoAsyncEngine_"))
+        self.assertEqual(report.counts(), {"deleted": 3})
+        self.assertEqual(self.api_client.metadata.delete.call_count, 3)
+
+    def test_delete_soft_mode(self):
+        """Nothing is reported deleted in soft mode"""
+        li_uuids = [uuid4().hex for i in range(3)]
+        self.api_client.search.return_value = MagicMock(
+            results=[{"_id": md_uuid} for md_uuid in li_uuids]
+        )
+
+        with self.assertLogs("isogeo_migrations_toolbelt.delete.deleter") as logs:
+            report = self.loop.run_until_complete(
+                self.engine.delete(metadata_ids_list=li_uuids)
+            )
+
+        self.assertEqual(report.counts(), {"soft": 3})
+        self.api_client.metadata.delete.assert_not_called()
+        self.assertIn("3/3 metadatas would have been deleted", logs.output[-1])
+
+    def test_backup_failed_search(self):
+        """An incomplete backup is reported"""
+        self.api_client.search.return_value = (False, 500)
+
+        with TemporaryDirectory() as tmp_dir:
+            backed_up = self.loop.run_until_complete(
+                self.engine.backup_metadata(
+                    search_params={"query": None},
+                    output_folder=tmp_dir,
+                    backup_kwargs={"retries": 0},
+                )
+            )
+
+        self.assertFalse(backed_up)
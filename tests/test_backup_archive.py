@@ -0,0 +1,108 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_backup_archive
+        # for specific python -m unittest
+        python -m unittest tests.test_backup_archive.TestJsonLinesArchive.test_read_single_record
+
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import gzip
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from uuid import uuid4
+
+# module target
+from isogeo_migrations_toolbelt import JsonLinesArchive
+from isogeo_migrations_toolbelt.backup import archive
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestJsonLinesArchive(unittest.TestCase):
+    """Test compressed JSON Lines archive."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Executed before each test."""
+        self.tmp_dir = TemporaryDirectory()
+        self.records = {
+            uuid4().hex: {"title": "Metadata {}".format(i), "keywords": [i]}
+            for i in range(50)
+        }
+
+    def tearDown(self):
+        """Executed after each test."""
+        self.tmp_dir.cleanup()
+
+    def write_archive(self, compression: str = "gzip") -> Path:
+        """Write the test records into an archive, from several threads."""
+        archive_path = Path(
+            self.tmp_dir.name, "metadata" + JsonLinesArchive.EXTENSIONS.get(compression)
+        )
+        with JsonLinesArchive(archive_path, compression=compression) as jsonl_archive:
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                for record_id, record in self.records.items():
+                    executor.submit(jsonl_archive.write, record_id, record)
+        return archive_path
+
+    # -- TESTS ---------------------------------------------------------
+    def test_read_single_record(self):
+        """A record is read through the index"""
+        archive_path = self.write_archive()
+        self.assertEqual(len(JsonLinesArchive.index(archive_path)), 50)
+        for record_id, record in self.records.items():
+            self.assertEqual(JsonLinesArchive.read(archive_path, record_id), record)
+        self.assertIsNone(JsonLinesArchive.read(archive_path, uuid4().hex))
+
+    def test_sync(self):
+        """Synced records are readable while the archive is still open"""
+        archive_path = Path(self.tmp_dir.name, "metadata.jsonl.gz")
+        jsonl_archive = JsonLinesArchive(archive_path)
+        for record_id, record in self.records.items():
+            jsonl_archive.write(record_id, record)
+        jsonl_archive.sync()
+
+        record_id = next(iter(self.records))
+        self.assertEqual(
+            JsonLinesArchive.read(archive_path, record_id), self.records.get(record_id)
+        )
+        jsonl_archive.close()
+
+    def test_regular_gzip_file(self):
+        """The archive is a regular gzip file of JSON Lines"""
+        archive_path = self.write_archive()
+        with gzip.open(archive_path, "rt", encoding="UTF-8") as jsonl_file:
+            li_records = [json.loads(line) for line in jsonl_file]
+        self.assertCountEqual(li_records, list(self.records.values()))
+        self.assertCountEqual(
+            list(JsonLinesArchive.iter_records(archive_path)), li_records
+        )
+
+    @unittest.skipIf(archive.zstandard is None, "zstandard is not installed")
+    def test_zstd(self):
+        """Records are read from a zstd archive"""
+        archive_path = self.write_archive(compression="zstd")
+        self.assertEqual(JsonLinesArchive.compression_of(archive_path), "zstd")
+        for record_id, record in self.records.items():
+            self.assertEqual(JsonLinesArchive.read(archive_path, record_id), record)
+
+    def test_bad_compression(self):
+        """Unknown compressions are refused"""
+        with self.assertRaises(ValueError):
+            JsonLinesArchive(Path(self.tmp_dir.name, "metadata.jsonl"), "bz2")
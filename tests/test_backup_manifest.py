@@ -0,0 +1,139 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_backup_manifest
+        # for specific python -m unittest
+        python -m unittest tests.test_backup_manifest.TestBackupManifest.test_last_entry_wins
+
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+# module target
+from isogeo_migrations_toolbelt import BackupManager, BackupManifest, JsonLinesArchive
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+METADATA_UUID = "0269803d50c446b09f5060ef7fe3e22b"
+WORKGROUP_UUID = "32f7e95ec4e94ca3bc1afda960003882"
+
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestBackupManifest(unittest.TestCase):
+    """Test backup manifest."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Executed before each test."""
+        self.tmp_dir = TemporaryDirectory()
+        self.folder = Path(self.tmp_dir.name, "backup")
+        Path(self.folder, WORKGROUP_UUID).mkdir(parents=True)
+        self.record = {"_id": METADATA_UUID, "_modified": "2020-06-01", "title": "T"}
+
+    def tearDown(self):
+        """Executed after each test."""
+        self.tmp_dir.cleanup()
+
+    # -- TESTS ---------------------------------------------------------
+    def test_last_entry_wins(self):
+        """Entries are reloaded with absolute paths and the last one wins"""
+        json_path = Path(self.folder, WORKGROUP_UUID, METADATA_UUID + ".json")
+        with json_path.open("w") as out_json:
+            json.dump(self.record, out_json)
+
+        manifest = BackupManifest(self.folder)
+        for modified in ("2020-01-01", "2020-06-01"):
+            manifest.add(
+                metadata_id=METADATA_UUID,
+                workgroup_id=WORKGROUP_UUID,
+                modified=modified,
+                content_hash=BackupManifest.hash(self.record),
+                snapshot="20200601_000000",
+                path=json_path,
+            )
+        manifest.close()
+
+        # move the backup folder: paths are relative
+        moved_folder = Path(self.folder).rename(Path(self.tmp_dir.name, "moved"))
+        di_entries = BackupManifest.load(moved_folder)
+        entry = di_entries.get(METADATA_UUID)
+        self.assertEqual(len(di_entries), 1)
+        self.assertEqual(entry.get("_modified"), "2020-06-01")
+        self.assertEqual(BackupManifest.load_record(entry), self.record)
+
+    def test_archive_record(self):
+        """Records stored into an archive are loaded"""
+        archive_path = Path(self.folder, WORKGROUP_UUID, "metadata_run.jsonl.gz")
+        with JsonLinesArchive(archive_path) as jsonl_archive:
+            jsonl_archive.write(METADATA_UUID, self.record)
+
+        manifest = BackupManifest(self.folder)
+        manifest.add(
+            metadata_id=METADATA_UUID,
+            workgroup_id=WORKGROUP_UUID,
+            modified="2020-06-01",
+            content_hash=BackupManifest.hash(self.record),
+            snapshot="run",
+            path=archive_path,
+        )
+        manifest.close()
+
+        entry = BackupManifest.load(self.folder).get(METADATA_UUID)
+        self.assertEqual(BackupManifest.load_record(entry), self.record)
+        self.assertEqual(
+            entry.get("hash"), BackupManifest.hash(dict(reversed(self.record.items())))
+        )
+
+    def test_no_manifest(self):
+        """A folder without manifest has no entries"""
+        self.assertEqual(BackupManifest.load(self.tmp_dir.name), {})
+
+    def test_verify_metadata(self):
+        """Stored records are checked against their hash and the search payload"""
+        json_path = Path(self.folder, WORKGROUP_UUID, METADATA_UUID + ".json")
+        with json_path.open("w") as out_json:
+            json.dump(self.record, out_json)
+
+        manifest = BackupManifest(self.folder)
+        manifest.add(
+            metadata_id=METADATA_UUID,
+            workgroup_id=WORKGROUP_UUID,
+            modified="2020-06-01",
+            content_hash=BackupManifest.hash(self.record),
+            snapshot="run",
+            path=json_path,
+        )
+        manifest.close()
+        di_entries = BackupManifest.load(self.folder)
+
+        def status(search_payload: dict) -> str:
+            return BackupManager._verify_metadata(search_payload, di_entries).get(
+                "status"
+            )
+
+        self.assertEqual(status(self.record), "verified")
+        self.assertEqual(status(dict(self.record, _modified="2021-01-01")), "outdated")
+        self.assertEqual(status({"_id": WORKGROUP_UUID}), "not_backed_up")
+
+        # truncated file
+        json_path.write_text(json_path.read_text()[:-5])
+        self.assertEqual(status(self.record), "corrupted")
@@ -0,0 +1,185 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_backup_restore
+        # for specific python -m unittest
+        python -m unittest tests.test_backup_restore.TestBackupRestore.test_restore_one
+
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock, patch
+
+# Isogeo
+from isogeo_pysdk import Metadata
+
+# module target
+from isogeo_migrations_toolbelt import BackupManager, BackupManifest
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+METADATA_UUID_1 = "0269803d50c446b09f5060ef7fe3e22b"
+METADATA_UUID_2 = "c2f7d68a7d9c4cd3b8a6de3a3b1d52a8"
+WORKGROUP_UUID_1 = "32f7e95ec4e94ca3bc1afda960003882"
+WORKGROUP_UUID_2 = "7c1a8cbb9c1c4a1ab0b0e3b5c30e1a44"
+
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestBackupRestore(unittest.TestCase):
+    """Test metadata restore from a backup, with an offline API client."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Executed before each test."""
+        self.tmp_dir = TemporaryDirectory()
+        self.folder = Path(self.tmp_dir.name, "backup")
+        self.folder.mkdir()
+
+        # backup of two metadata, in two workgroups
+        self.records = {}
+        manifest = BackupManifest(self.folder)
+        for md_uuid, workgroup_uuid in (
+            (METADATA_UUID_1, WORKGROUP_UUID_1),
+            (METADATA_UUID_2, WORKGROUP_UUID_2),
+        ):
+            record = {
+                "_id": md_uuid,
+                "_creator": {"_id": workgroup_uuid},
+                "_modified": "2020-06-01T00:00:00+00:00",
+                "title": "Backed up title",
+                "events": [
+                    {"kind": "creation", "date": "2020-01-01"},
+                    {"kind": "update", "date": "2020-06-01"},
+                ],
+            }
+            json_path = Path(self.folder, workgroup_uuid, md_uuid + ".json")
+            json_path.parent.mkdir(parents=True)
+            json_path.write_text(json.dumps(record))
+            manifest.add(
+                metadata_id=md_uuid,
+                workgroup_id=workgroup_uuid,
+                modified=record.get("_modified"),
+                content_hash=BackupManifest.hash(record),
+                snapshot="run",
+                path=json_path,
+            )
+            self.records[md_uuid] = record
+        manifest.close()
+
+        # current metadata: same events in another order, the first title changed
+        self.current = {
+            md_uuid: dict(
+                record,
+                _modified="2021-01-01T00:00:00+00:00",
+                events=list(reversed(record.get("events"))),
+            )
+            for md_uuid, record in self.records.items()
+        }
+        self.current[METADATA_UUID_1]["title"] = "Modified title"
+
+        self.api_client = MagicMock()
+        self.api_client.metadata.get.side_effect = self.get
+        self.backup_mngr = BackupManager(
+            api_client=self.api_client, output_folder=self.folder
+        )
+
+    def tearDown(self):
+        """Executed after each test."""
+        self.tmp_dir.cleanup()
+
+    # -- Helpers -------------------------------------------------------
+    def get(self, metadata_id: str, include="all") -> Metadata:
+        """Offline metadata retrieval."""
+        if metadata_id not in self.current:
+            return (False, 404)
+        return Metadata(**self.current.get(metadata_id))
+
+    # -- TESTS ---------------------------------------------------------
+    @patch("isogeo_migrations_toolbelt.backup.backup_manager.MetadataDuplicator")
+    def test_restore_one(self, duplicator):
+        """A modified metadata is restored in place, without copy marks"""
+        duplicator.return_value.subresources_report = {}
+        duplicator.return_value.subresources_removals_report = {}
+
+        report = self.backup_mngr.restore(metadata_ids=[METADATA_UUID_1])
+
+        self.assertEqual(
+            report, {METADATA_UUID_1: {"status": "restored", "changes": ["title"]}}
+        )
+        args, kwargs = duplicator.call_args
+        self.assertEqual(kwargs.get("source_metadata_uuid"), METADATA_UUID_1)
+        self.assertEqual(
+            kwargs.get("source_metadata").to_dict(),
+            Metadata(**self.records.get(METADATA_UUID_1)).to_dict(),
+        )
+        duplicator.return_value.import_into_other_metadata.assert_called_once_with(
+            destination_metadata_uuid=METADATA_UUID_1,
+            copymark_title=False,
+            copymark_abstract=False,
+            exclude_fields=[],
+            differential=True,
+        )
+
+    @patch("isogeo_migrations_toolbelt.backup.backup_manager.MetadataDuplicator")
+    def test_unchanged(self, duplicator):
+        """Subresources order doesn't make a metadata changed"""
+        report = self.backup_mngr.restore(metadata_ids=[METADATA_UUID_2])
+
+        self.assertEqual(
+            report, {METADATA_UUID_2: {"status": "unchanged", "changes": []}}
+        )
+        duplicator.assert_not_called()
+        self.assertEqual(
+            BackupManager._comparable(self.records[METADATA_UUID_2].get("events")),
+            BackupManager._comparable(self.current[METADATA_UUID_2].get("events")),
+        )
+
+    @patch("isogeo_migrations_toolbelt.backup.backup_manager.MetadataDuplicator")
+    def test_workgroup_filter(self, duplicator):
+        """Only the metadata of the workgroup are compared"""
+        self.current[METADATA_UUID_2]["title"] = "Modified title"
+
+        report = self.backup_mngr.restore(workgroup_uuid=WORKGROUP_UUID_2, dry_run=True)
+
+        self.assertEqual(
+            report, {METADATA_UUID_2: {"status": "to_restore", "changes": ["title"]}}
+        )
+        self.api_client.metadata.get.assert_called_once_with(
+            metadata_id=METADATA_UUID_2, include="all"
+        )
+        duplicator.assert_not_called()
+
+    @patch("isogeo_migrations_toolbelt.backup.backup_manager.MetadataDuplicator")
+    def test_unknown(self, duplicator):
+        """Unknown snapshots and metadata are reported"""
+        with self.assertRaises(ValueError):
+            self.backup_mngr.restore(snapshot=Path(self.tmp_dir.name, "unknown"))
+
+        # not in the backup
+        report = self.backup_mngr.restore(metadata_ids=[WORKGROUP_UUID_1])
+        self.assertEqual(report.get(WORKGROUP_UUID_1).get("status"), "not_backed_up")
+
+        # deleted since the backup
+        del self.current[METADATA_UUID_1]
+        report = self.backup_mngr.restore(metadata_ids=[METADATA_UUID_1])
+        self.assertEqual(report.get(METADATA_UUID_1).get("status"), "missing")
+        duplicator.assert_not_called()
@@ -0,0 +1,261 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_backup_search
+        # for specific python -m unittest
+        python -m unittest tests.test_backup_search.TestBackupSearch.test_pages_offsets
+
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import shutil
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+# Isogeo
+from isogeo_pysdk import Metadata
+
+# module target
+from isogeo_migrations_toolbelt import BackupManager, BackupManifest
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+WORKGROUP_UUID = "32f7e95ec4e94ca3bc1afda960003882"
+
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestBackupSearch(unittest.TestCase):
+    """Test how the metadata to backup are searched, with an offline API client."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Executed before each test."""
+        self.tmp_dir = TemporaryDirectory()
+        self.catalog = [
+            {
+                "_id": uuid4().hex,
+                "_creator": {"_id": WORKGROUP_UUID},
+                "_modified": "2020-06-01T00:00:00+00:00",
+                "title": "Metadata {}".format(i),
+                "type": "vectorDataset",
+            }
+            for i in range(250)
+        ]
+        self.li_searches = []
+        # failures of the searches, by first UUID or offset of the page
+        self.di_failures = {}
+
+        self.api_client = MagicMock()
+        self.api_client.search.side_effect = self.search
+        self.api_client.metadata.get.side_effect = self.get
+
+    def tearDown(self):
+        """Executed after each test."""
+        self.tmp_dir.cleanup()
+
+    # -- Helpers -------------------------------------------------------
+    def search(self, **kwargs) -> MagicMock:
+        """Offline search, by specific metadata or by offset."""
+        self.li_searches.append(kwargs)
+        page_key = (kwargs.get("specific_md") or (kwargs.get("offset", 0),))[0]
+        if self.di_failures.get(page_key):
+            failure = self.di_failures.get(page_key).pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+            return failure
+        if kwargs.get("specific_md"):
+            results = [
+                md for md in self.catalog if md.get("_id") in kwargs.get("specific_md")
+            ]
+        else:
+            offset = kwargs.get("offset", 0)
+            results = self.catalog[offset : offset + kwargs.get("page_size")]
+        return MagicMock(results=results, total=len(self.catalog))
+
+    def get(self, metadata_id: str, include="all") -> Metadata:
+        """Offline metadata retrieval."""
+        for md in self.catalog:
+            if md.get("_id") == metadata_id:
+                return Metadata.clean_attributes(dict(md))
+        return (False, 404)
+
+    # -- TESTS ---------------------------------------------------------
+    def test_pages_offsets(self):
+        """Search results are walked beyond the first page"""
+        backup_mngr = BackupManager(
+            api_client=self.api_client, output_folder=self.tmp_dir.name
+        )
+        li_pages = list(backup_mngr._search_pages({"query": None}))
+
+        self.assertEqual([len(page) for page in li_pages], [100, 100, 50])
+        self.assertEqual(
+            [search.get("offset") for search in self.li_searches], [0, 100, 200]
+        )
+
+    def test_pages_specific_md(self):
+        """Specific metadata are searched by chunks of the page size"""
+        backup_mngr = BackupManager(
+            api_client=self.api_client, output_folder=self.tmp_dir.name, page_size=40
+        )
+        li_uuids = [md.get("_id") for md in self.catalog[:90]]
+        li_pages = list(
+            backup_mngr._search_pages({"query": None, "specific_md": li_uuids})
+        )
+
+        self.assertEqual([len(page) for page in li_pages], [40, 40, 10])
+        self.assertEqual(
+            [list(search.get("specific_md")) for search in self.li_searches],
+            [li_uuids[:40], li_uuids[40:80], li_uuids[80:]],
+        )
+
+    def test_backup_all_pages(self):
+        """Every metadata of the search is backed up"""
+        backup_mngr = BackupManager(
+            api_client=self.api_client, output_folder=self.tmp_dir.name
+        )
+        backup_mngr.metadata(search_params={"query": None})
+
+        di_entries = BackupManifest.load(self.tmp_dir.name)
+        self.assertEqual(set(di_entries), {md.get("_id") for md in self.catalog})
+        self.assertEqual(
+            len(list(Path(self.tmp_dir.name, WORKGROUP_UUID).glob("*.json"))), 250
+        )
+
+    def test_direct_write(self):
+        """Complete search payloads are written, incomplete ones are retrieved again"""
+        dataset, service = self.catalog[:2]
+        for md in (dataset, service):
+            for subresource in BackupManager.SEARCH_PAYLOAD_SUBRESOURCES:
+                md.setdefault(subresource, [])
+        service.update(type="service", operations=[], serviceLayers=[])
+        self.catalog = [dataset, service]
+
+        backup_mngr = BackupManager(
+            api_client=self.api_client,
+            output_folder=self.tmp_dir.name,
+            direct_write=True,
+        )
+        self.assertEqual(backup_mngr._missing_subresources(dataset), [])
+        self.assertEqual(backup_mngr._missing_subresources(service), ["layers"])
+
+        backup_mngr.metadata(search_params={"query": None})
+
+        # only the service is retrieved
+        self.api_client.metadata.get.assert_called_once_with(
+            metadata_id=service.get("_id"), include="all"
+        )
+        di_entries = BackupManifest.load(self.tmp_dir.name)
+        self.assertEqual(
+            BackupManifest.load_record(di_entries.get(dataset.get("_id"))),
+            Metadata.clean_attributes(dict(dataset)).to_dict(),
+        )
+        # search results are left untouched
+        self.assertIn("coordinate-system", dataset)
+
+    def test_verify_search(self):
+        """Verification searches only the requested metadata, without subresources"""
+        backup_mngr = BackupManager(
+            api_client=self.api_client, output_folder=self.tmp_dir.name
+        )
+        self.assertEqual(list(backup_mngr.iter_verify(metadata_ids=[])), [])
+        self.api_client.search.assert_not_called()
+
+        li_uuids = [md.get("_id") for md in self.catalog[:3]]
+        report = backup_mngr.verify(metadata_ids=li_uuids)
+
+        self.assertEqual(set(report), set(li_uuids))
+        self.assertEqual(
+            {md_report.get("status") for md_report in report.values()},
+            {"not_backed_up"},
+        )
+        self.assertEqual([search.get("include") for search in self.li_searches], [()])
+
+    def test_failed_pages(self):
+        """Failed searches are retried, then their metadata are not backed up"""
+        backup_mngr = BackupManager(
+            api_client=self.api_client,
+            output_folder=self.tmp_dir.name,
+            page_size=40,
+            retries=2,
+            backoff=0,
+        )
+        li_uuids = [md.get("_id") for md in self.catalog[:90]]
+        # first chunk fails twice, second one always, third one is forbidden
+        self.di_failures = {
+            li_uuids[0]: [(False, 503), ConnectionError("reset by peer")],
+            li_uuids[40]: [(False, 502)] * 3,
+            li_uuids[80]: [(False, 403)],
+        }
+        report = dict(backup_mngr.iter_backup(li_uuids))
+
+        self.assertEqual(
+            [list(search.get("specific_md"))[0] for search in self.li_searches],
+            [li_uuids[0]] * 3 + [li_uuids[40]] * 3 + [li_uuids[80]],
+        )
+        self.assertEqual(set(report), set(li_uuids))
+        for md_uuid in li_uuids[:40]:
+            self.assertEqual(report.get(md_uuid).get("status"), "verified")
+        for md_uuid in li_uuids[40:]:
+            self.assertEqual(report.get(md_uuid).get("status"), "not_backed_up")
+            self.assertEqual(report.get(md_uuid).get("error"), "search failed")
+
+    def test_failed_offset(self):
+        """A backup whose search fails is reported incomplete"""
+        backup_mngr = BackupManager(
+            api_client=self.api_client,
+            output_folder=self.tmp_dir.name,
+            retries=1,
+            backoff=0,
+        )
+        self.di_failures = {100: [(False, 500)] * 2}
+
+        self.assertFalse(backup_mngr.metadata(search_params={"query": None}))
+        self.assertEqual(
+            [search.get("offset") for search in self.li_searches], [0, 100, 100]
+        )
+        self.assertEqual(len(BackupManifest.load(self.tmp_dir.name)), 100)
+
+    def test_previous_archive(self):
+        """Unchanged archive records are copied: the previous snapshot can be deleted"""
+        previous_folder = Path(self.tmp_dir.name, "previous")
+        backup_mngr = BackupManager(
+            api_client=self.api_client, output_folder=previous_folder
+        )
+        backup_mngr.metadata(search_params={"query": None}, output_format="jsonl.gz")
+
+        backup_mngr = BackupManager(
+            api_client=self.api_client,
+            output_folder=Path(self.tmp_dir.name, "current"),
+            previous_snapshot=previous_folder,
+        )
+        self.api_client.metadata.get.reset_mock()
+        backup_mngr.metadata(search_params={"query": None}, output_format="jsonl.gz")
+        self.api_client.metadata.get.assert_not_called()
+        self.assertEqual(backup_mngr.nb_unchanged, 250)
+
+        shutil.rmtree(str(previous_folder))
+        report = backup_mngr.verify(search_params={"query": None})
+        self.assertEqual(len(report), 250)
+        self.assertEqual(
+            {md_report.get("status") for md_report in report.values()}, {"verified"}
+        )
+        for md_report in report.values():
+            self.assertTrue(Path(md_report.get("path")).is_file())
@@ -0,0 +1,90 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_backup_serializers
+        # for specific python -m unittest
+        python -m unittest tests.test_backup_serializers.TestSerializers.test_canonical_bytes
+
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import json
+import unittest
+from datetime import datetime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+# Isogeo
+from isogeo_pysdk import Metadata
+
+# module target
+from isogeo_migrations_toolbelt.backup.serializers import (
+    CanonicalSerializer,
+    CompactSerializer,
+    get_serializer,
+)
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestSerializers(unittest.TestCase):
+    """Test backup serializers."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Executed before each test."""
+        self.tmp_dir = TemporaryDirectory()
+        self.md_dict = Metadata(
+            _id="0269803d50c446b09f5060ef7fe3e22b",
+            _modified=datetime(2020, 6, 1, 12, 30),
+            abstract="Données d'élévation\n----",
+            keywords=[{"_tag": "keyword:isogeo:relief", "text": "relief"}],
+            title="Élévation",
+        ).to_dict()
+
+    def tearDown(self):
+        """Executed after each test."""
+        self.tmp_dir.cleanup()
+
+    # -- TESTS ---------------------------------------------------------
+    def test_canonical_bytes(self):
+        """Canonical JSON files are the same as before"""
+        out_path = Path(self.tmp_dir.name, "metadata.json")
+        with out_path.open("w") as out_json:
+            json.dump(
+                obj=self.md_dict, fp=out_json, sort_keys=True, indent=4, default=str
+            )
+
+        self.assertEqual(
+            CanonicalSerializer().dumps(self.md_dict), out_path.read_bytes()
+        )
+
+    def test_compact_roundtrip(self):
+        """Compact JSON holds the same content on a single line"""
+        compact_bytes = CompactSerializer().dumps_line(self.md_dict)
+        self.assertNotIn(b"\n", compact_bytes)
+        self.assertEqual(
+            json.loads(compact_bytes),
+            json.loads(CanonicalSerializer().dumps(self.md_dict)),
+        )
+
+    def test_get_serializer(self):
+        """Serializers are got by name or instance"""
+        self.assertIsInstance(get_serializer("compact"), CompactSerializer)
+        serializer = CanonicalSerializer()
+        self.assertIs(get_serializer(serializer), serializer)
+        with self.assertRaises(ValueError):
+            get_serializer("pickle")
+        with self.assertRaises(TypeError):
+            get_serializer(json)
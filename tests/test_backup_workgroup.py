@@ -0,0 +1,149 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_backup_workgroup
+        # for specific python -m unittest
+        python -m unittest tests.test_backup_workgroup.TestBackupWorkgroup.test_workgroup_files
+
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock
+
+# Isogeo
+from isogeo_pysdk import Metadata, Workgroup
+
+# module target
+from isogeo_migrations_toolbelt import BackupManager, BackupManifest
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+METADATA_UUID = "0269803d50c446b09f5060ef7fe3e22b"
+WORKGROUP_UUID = "32f7e95ec4e94ca3bc1afda960003882"
+
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestBackupWorkgroup(unittest.TestCase):
+    """Test workgroup backup, with an offline API client."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Executed before each test."""
+        self.tmp_dir = TemporaryDirectory()
+        self.folder = Path(self.tmp_dir.name)
+        self.metadata = {
+            "_id": METADATA_UUID,
+            "_creator": {"_id": WORKGROUP_UUID},
+            "_modified": "2020-06-01T00:00:00+00:00",
+            "title": "Metadata",
+        }
+
+        self.api_client = MagicMock()
+        self.api_client.workgroup.get.return_value = Workgroup(
+            _id=WORKGROUP_UUID, code="workgroup-code"
+        )
+        self.api_client.workgroup.memberships.return_value = [
+            {"role": "admin", "user": {"_id": METADATA_UUID}}
+        ]
+        self.api_client.contact.listing.return_value = [{"_id": "a"}, {"_id": "b"}]
+        self.api_client.catalog.listing.return_value = [{"_id": "c"}]
+        self.api_client.specification.listing.return_value = []
+        self.api_client.license.listing.return_value = []
+        self.api_client.srs.listing.return_value = (False, 500)
+        self.api_client.search.return_value = MagicMock(
+            results=[self.metadata], total=1
+        )
+        self.api_client.metadata.get.return_value = Metadata(**self.metadata)
+
+    def tearDown(self):
+        """Executed after each test."""
+        self.tmp_dir.cleanup()
+
+    # -- TESTS ---------------------------------------------------------
+    def test_workgroup_files(self):
+        """Workgroup objects are stored next to the metadata, recorded by the manifest"""
+        backup_mngr = BackupManager(
+            api_client=self.api_client, output_folder=self.folder
+        )
+        report = backup_mngr.workgroup(workgroup_uuid=WORKGROUP_UUID)
+
+        self.assertEqual(
+            report,
+            {
+                "workgroup": 1,
+                "memberships": 1,
+                "contacts": 2,
+                "catalogs": 1,
+                "specifications": 0,
+                "licenses": 0,
+                "coordinate_systems": False,
+            },
+        )
+
+        # one file by object, except the failed one
+        workgroup_folder = Path(self.folder, WORKGROUP_UUID, "_workgroup")
+        self.assertEqual(
+            sorted(i.stem for i in workgroup_folder.glob("*.json")),
+            sorted(
+                i for i in BackupManager.WORKGROUP_OBJECTS if i != "coordinate_systems"
+            ),
+        )
+        with Path(workgroup_folder, "workgroup.json").open("r") as in_json:
+            self.assertEqual(json.load(in_json).get("code"), "workgroup-code")
+        with Path(workgroup_folder, "contacts.json").open("r") as in_json:
+            self.assertEqual(json.load(in_json), [{"_id": "a"}, {"_id": "b"}])
+
+        # metadata of the workgroup
+        self.api_client.search.assert_called_once()
+        self.assertEqual(
+            self.api_client.search.call_args[1].get("group"), WORKGROUP_UUID
+        )
+        entry = BackupManifest.load(self.folder).get(METADATA_UUID)
+        self.assertEqual(entry.get("_creator"), WORKGROUP_UUID)
+        self.assertEqual(BackupManifest.load_record(entry).get("title"), "Metadata")
+
+    def test_objects_only(self):
+        """Only the requested objects are stored, without the metadata"""
+        backup_mngr = BackupManager(
+            api_client=self.api_client, output_folder=self.folder
+        )
+        report = backup_mngr.workgroup(
+            workgroup_uuid=WORKGROUP_UUID, objects=("catalogs",), metadata=False
+        )
+
+        self.assertEqual(report, {"catalogs": 1})
+        self.assertEqual(
+            [i.name for i in Path(self.folder, WORKGROUP_UUID).rglob("*.json")],
+            ["catalogs.json"],
+        )
+        self.api_client.search.assert_not_called()
+        self.assertEqual(BackupManifest.load(self.folder), {})
+
+    def test_bad_objects(self):
+        """Unknown objects and bad workgroup UUIDs are refused"""
+        backup_mngr = BackupManager(
+            api_client=self.api_client, output_folder=self.folder
+        )
+        with self.assertRaises(ValueError):
+            backup_mngr.workgroup(workgroup_uuid="not a UUID")
+        with self.assertRaises(ValueError):
+            backup_mngr.workgroup(workgroup_uuid=WORKGROUP_UUID, objects=("users",))
@@ -0,0 +1,113 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_bounded_executor
+        # for specific python -m unittest
+        python -m unittest tests.test_bounded_executor.TestBoundedExecutor.test_map_window
+
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import asyncio
+import time
+import unittest
+from threading import Lock
+
+# module target
+from isogeo_migrations_toolbelt.utils import BoundedExecutor
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestBoundedExecutor(unittest.TestCase):
+    """Test bounded executor."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Executed before each test."""
+        self.lock = Lock()
+        self.nb_pulled = 0
+        self.nb_done = 0
+        self.max_in_flight = 0
+
+    # -- Helpers -------------------------------------------------------
+    def items(self, nb_items: int):
+        """Items counting how many were pulled."""
+        for i in range(nb_items):
+            with self.lock:
+                self.nb_pulled += 1
+                self.max_in_flight = max(
+                    self.max_in_flight, self.nb_pulled - self.nb_done
+                )
+            yield i
+
+    def square(self, item: int) -> int:
+        """Slow task."""
+        time.sleep(0.01 if item % 3 else 0.03)
+        with self.lock:
+            self.nb_done += 1
+        return item * item
+
+    # -- TESTS ---------------------------------------------------------
+    def test_map_results(self):
+        """Every item is processed, results are paired with their item."""
+        bounded_executor = BoundedExecutor(max_workers=4)
+        results = dict(bounded_executor.map(self.square, self.items(50)))
+
+        self.assertEqual(results, {i: i * i for i in range(50)})
+
+    def test_map_window(self):
+        """Items are pulled only when there is room in the window."""
+        bounded_executor = BoundedExecutor(max_workers=4, window=6)
+        for item, result in bounded_executor.map(self.square, self.items(50)):
+            pass
+
+        self.assertLessEqual(self.max_in_flight, 6)
+        self.assertEqual(self.nb_done, 50)
+
+    def test_map_errors(self):
+        """Errors of the tasks are raised to the consumer."""
+
+        def fail(item):
+            raise ValueError(item)
+
+        bounded_executor = BoundedExecutor(max_workers=2)
+        with self.assertRaises(ValueError):
+            list(bounded_executor.map(fail, range(5)))
+
+    def test_amap(self):
+        """Items are processed from a coroutine, within the window."""
+        bounded_executor = BoundedExecutor(max_workers=4, window=6)
+
+        async def consume():
+            return {
+                item: result
+                async for item, result in bounded_executor.amap(
+                    self.square, self.items(50)
+                )
+            }
+
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(consume())
+        finally:
+            loop.close()
+
+        self.assertEqual(results, {i: i * i for i in range(50)})
+        self.assertLessEqual(self.max_in_flight, 6)
+
+    def test_bad_workers(self):
+        """At least one thread is required."""
+        with self.assertRaises(ValueError):
+            BoundedExecutor(max_workers=0)
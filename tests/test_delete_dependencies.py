@@ -0,0 +1,84 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_delete_dependencies
+        # for specific python -m unittest
+        python -m unittest tests.test_delete_dependencies.TestDeleteDependencies.test_both_sides
+
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import unittest
+from uuid import uuid4
+
+# module target
+from isogeo_migrations_toolbelt import MetadataDeleter
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestDeleteDependencies(unittest.TestCase):
+    """Test service layers associations of the metadata to delete."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Executed before each test."""
+        self.service_uuid, self.dataset_uuid, self.layer_uuid = (
+            uuid4().hex for i in range(3)
+        )
+        self.service = {
+            "_id": self.service_uuid,
+            "type": "service",
+            "layers": [
+                {
+                    "_id": self.layer_uuid,
+                    "dataset": {"_id": self.dataset_uuid, "type": "rasterDataset"},
+                }
+            ],
+        }
+        self.dataset = {
+            "_id": self.dataset_uuid,
+            "type": "rasterDataset",
+            "serviceLayers": [
+                {"_id": self.layer_uuid, "service": {"_id": self.service_uuid}}
+            ],
+        }
+
+    # -- TESTS ---------------------------------------------------------
+    def test_both_sides(self):
+        """An association listed by the service and the dataset is removed once"""
+        di_associations = MetadataDeleter._list_associations(
+            {self.service_uuid: self.service, self.dataset_uuid: self.dataset}
+        )
+        self.assertEqual(
+            di_associations,
+            {(self.service_uuid, self.layer_uuid, self.dataset_uuid): "rasterDataset"},
+        )
+
+    def test_one_side(self):
+        """Associations with metadata which are not deleted are listed too"""
+        for md in (self.service, self.dataset):
+            di_associations = MetadataDeleter._list_associations({md.get("_id"): md})
+            self.assertIn(
+                (self.service_uuid, self.layer_uuid, self.dataset_uuid), di_associations
+            )
+
+    def test_no_layers(self):
+        """Layers without dataset and incomplete payloads are ignored"""
+        self.service["layers"].append({"_id": uuid4().hex})
+        self.dataset["serviceLayers"].append({"_id": uuid4().hex})
+        di_associations = MetadataDeleter._list_associations(
+            {self.service_uuid: self.service, self.dataset_uuid: self.dataset}
+        )
+        self.assertEqual(len(di_associations), 1)
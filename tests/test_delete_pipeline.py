@@ -0,0 +1,153 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_delete_pipeline
+        # for specific python -m unittest
+        python -m unittest tests.test_delete_pipeline.TestDeletePipeline.test_nothing_to_delete
+
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+# module target
+from isogeo_migrations_toolbelt import BackupManager, DeletionReport, MetadataDeleter
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestDeletePipeline(unittest.TestCase):
+    """Test the deletion gated by the backup, with an offline API client."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Executed before each test."""
+        self.tmp_dir = TemporaryDirectory()
+        self.li_uuids = [uuid4().hex for i in range(3)]
+
+        # none of the metadata exists
+        self.api_client = MagicMock()
+        self.api_client.search.return_value = MagicMock(results=[], total=0)
+
+    def tearDown(self):
+        """Executed after each test."""
+        self.tmp_dir.cleanup()
+
+    # -- TESTS ---------------------------------------------------------
+    def test_nothing_to_delete(self):
+        """Missing metadata neither trigger a catalog-wide backup nor a deletion"""
+        for method in ("delete", "backup_and_delete"):
+            self.api_client.reset_mock()
+            backup_mngr = BackupManager(
+                api_client=self.api_client, output_folder=self.tmp_dir.name
+            )
+            md_dltr = MetadataDeleter(api_client=self.api_client)
+            getattr(md_dltr, method)(
+                metadata_ids_list=self.li_uuids,
+                backup_manager=backup_mngr,
+                hard_mode=1,
+            )
+
+            # only the pre-flight search
+            self.api_client.search.assert_called_once()
+            args, kwargs = self.api_client.search.call_args
+            self.assertEqual(kwargs.get("specific_md"), tuple(self.li_uuids))
+            self.api_client.metadata.get.assert_not_called()
+            self.api_client.metadata.delete.assert_not_called()
+
+            self.assertEqual(md_dltr.report.counts(), {"missing": 3})
+            self.assertEqual(md_dltr.skipped, {})
+            self.assertEqual(list(Path(self.tmp_dir.name).iterdir()), [])
+
+    def test_unrequested_reports(self):
+        """Reports of metadata which were not requested are ignored"""
+        md_dltr = MetadataDeleter(api_client=self.api_client, check_existence=False)
+        li_api_routes = md_dltr._prepare_routes(self.li_uuids[:1])
+        unrequested_uuid = self.li_uuids[1]
+
+        def verify(metadata_ids):
+            yield unrequested_uuid, {"status": "verified"}
+            yield metadata_ids[0], {"status": "verified"}
+
+        self.assertEqual(
+            list(md_dltr._verified_routes(li_api_routes, verify)), li_api_routes
+        )
+        self.assertNotIn(unrequested_uuid, md_dltr.report)
+
+    def test_failed_chunks(self):
+        """Failed searches of the pre-flight check are retried, then reported"""
+        li_uuids = [uuid4().hex for i in range(250)]
+        li_searches = []
+
+        def search(**kwargs):
+            """Offline search: the second chunk fails once, the third one always."""
+            chunk = kwargs.get("specific_md")
+            li_searches.append(chunk)
+            if chunk == tuple(li_uuids[100:200]) and li_searches.count(chunk) == 1:
+                return (False, 503)
+            if chunk == tuple(li_uuids[200:]):
+                return (False, 403)
+            # the last metadata of each chunk doesn't exist
+            return MagicMock(
+                results=[{"_id": i} for i in chunk[:-1]], total=len(chunk) - 1
+            )
+
+        self.api_client.search.side_effect = search
+        md_dltr = MetadataDeleter(api_client=self.api_client, retries=2, backoff=0)
+        md_dltr.delete(metadata_ids_list=li_uuids)
+
+        # chunks of 100 metadata, only the failure worth it is retried
+        self.assertEqual(
+            [len(chunk) for chunk in li_searches[:3]],
+            [MetadataDeleter.CHECK_CHUNK_SIZE, MetadataDeleter.CHECK_CHUNK_SIZE, 50],
+        )
+        self.assertEqual(li_searches[3:], [tuple(li_uuids[100:200])])
+
+        self.assertEqual(
+            md_dltr.report.counts(), {"missing": 2, "unresolved": 50, "soft": 198}
+        )
+        self.assertEqual(md_dltr.missing, [li_uuids[99], li_uuids[199]])
+        self.assertEqual(set(md_dltr.unresolved), set(li_uuids[200:]))
+        self.assertEqual(md_dltr.report.get(li_uuids[200]).get("code"), 403)
+        self.assertEqual(md_dltr.report.failures(), [])
+
+    def test_retry_already_gone(self):
+        """A retried deletion answered by a 404 went through the first time"""
+        di_responses = {
+            self.li_uuids[0]: [(False, 502), (False, 404)],
+            self.li_uuids[1]: [(False, 404)],
+        }
+
+        def delete(metadata_id):
+            """Offline deletion."""
+            return di_responses.get(metadata_id).pop(0)
+
+        self.api_client.metadata.delete.side_effect = delete
+        md_dltr = MetadataDeleter(
+            api_client=self.api_client, check_existence=False, backoff=0
+        )
+        report = md_dltr.delete(metadata_ids_list=self.li_uuids[:2], hard_mode=1)
+
+        self.assertIsInstance(report, DeletionReport)
+        self.assertIs(report, md_dltr.report)
+        item = report.get(self.li_uuids[0])
+        self.assertEqual((item.get("status"), item.get("attempts")), ("deleted", 2))
+        # never deleted
+        item = report.get(self.li_uuids[1])
+        self.assertEqual((item.get("status"), item.get("code")), ("error", 404))
+        self.assertEqual(md_dltr.nb_deleted, 1)
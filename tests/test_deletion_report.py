@@ -0,0 +1,94 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_deletion_report
+        # for specific python -m unittest
+        python -m unittest tests.test_deletion_report.TestDeletionReport.test_threads
+
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import csv
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from uuid import uuid4
+
+# module target
+from isogeo_migrations_toolbelt import DeletionReport
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestDeletionReport(unittest.TestCase):
+    """Test deletion report."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Executed before each test."""
+        self.tmp_dir = TemporaryDirectory()
+        self.report = DeletionReport()
+        self.li_uuid = [uuid4().hex for i in range(4)]
+        self.report.add(self.li_uuid[0], "deleted", latency=0.1234, attempt=True)
+        self.report.add(self.li_uuid[1], "error", code=503, attempt=True)
+        self.report.add(self.li_uuid[2], "error", code=403, attempt=True)
+        self.report.add(self.li_uuid[3], "missing")
+
+    def tearDown(self):
+        """Executed after each test."""
+        self.tmp_dir.cleanup()
+
+    # -- TESTS ---------------------------------------------------------
+    def test_counts(self):
+        """Metadata are counted by status"""
+        self.assertEqual(self.report.counts(), {"deleted": 1, "error": 2, "missing": 1})
+        self.assertEqual(self.report.count("deleted", "missing"), 2)
+        self.assertEqual(self.report.get(self.li_uuid[0]).get("latency"), 0.123)
+
+    def test_failures(self):
+        """Only network, server and rate limiting errors are worth a retry"""
+        self.assertEqual(self.report.failures(), self.li_uuid[1:3])
+        self.assertEqual(self.report.failures(retryable=True), [self.li_uuid[1]])
+
+        # successful retry
+        self.report.add(self.li_uuid[1], "deleted", attempt=True)
+        item = self.report.get(self.li_uuid[1])
+        self.assertEqual(item.get("attempts"), 2)
+        self.assertIsNone(item.get("code"))
+        self.assertEqual(self.report.failures(retryable=True), [])
+
+    def test_threads(self):
+        """Items are counted once whatever the number of threads"""
+        report = DeletionReport()
+        li_uuid = [uuid4().hex for i in range(500)]
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            for md_uuid in li_uuid:
+                executor.submit(report.add, md_uuid, "deleted", attempt=True)
+        self.assertEqual(len(report), 500)
+        self.assertEqual(report.count("deleted"), 500)
+
+    def test_exports(self):
+        """The report is exported to CSV and JSON Lines"""
+        csv_path = self.report.to_csv(Path(self.tmp_dir.name, "report.csv"))
+        with csv_path.open("r", encoding="UTF-8") as in_csv:
+            li_rows = list(csv.DictReader(in_csv, delimiter=";"))
+        self.assertEqual([row.get("uuid") for row in li_rows], self.li_uuid)
+        self.assertEqual(li_rows[1].get("code"), "503")
+
+        jsonl_path = self.report.to_jsonl(Path(self.tmp_dir.name, "report.jsonl"))
+        with jsonl_path.open("r", encoding="UTF-8") as in_jsonl:
+            li_items = [json.loads(line) for line in in_jsonl]
+        self.assertEqual(li_items, self.report.items())
@@ -0,0 +1,286 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_duplicate_differential
+        # for specific python -m unittest
+        python -m unittest tests.test_duplicate_differential.TestDifferentialJobs.test_key_matching
+
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import unittest
+from unittest.mock import MagicMock
+
+# Isogeo
+from isogeo_pysdk import Condition, Event, Limitation, Link, Metadata
+
+# module target
+from isogeo_migrations_toolbelt import MetadataDuplicator, MetadataHandle
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+SOURCE_UUID = "0269803d50c446b09f5060ef7fe3e22b"
+DESTINATION_UUID = "c2f7d68a7d9c4cd3b8a6de3a3b1d52a8"
+WORKGROUP_UUID = "32f7e95ec4e94ca3bc1afda960003882"
+CATALOG_UUID_1 = "7c1a8cbb9c1c4a1ab0b0e3b5c30e1a44"
+CATALOG_UUID_2 = "a0f1e38ac7ba4e5e9d9b7d2b1f6f0c3e"
+CONTACT_UUID_1 = "5a6ea1f0b0e54b9a8d4b1e4f2a6c9d01"
+CONTACT_UUID_2 = "b3d0d8e2c5f74e0c9a1f6e7d8c9b0a12"
+LICENSE_UUID = "e4b1c2d3f4a54b6c8d7e9f0a1b2c3d4e"
+
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestDifferentialJobs(unittest.TestCase):
+    """Test the differential import of subresources, with an offline API client."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Executed before each test."""
+        self.api_client = MagicMock()
+        self.metadata_dst = Metadata(_id=DESTINATION_UUID)
+
+    # -- Helpers -------------------------------------------------------
+    def differential(self, source: dict, destination: dict, jobs: list, **kwargs):
+        """Compare import jobs with a destination metadata.
+
+        :returns: removal jobs and remaining import jobs, as (family, arguments)
+        """
+        md_duplicator = MetadataDuplicator(
+            api_client=self.api_client,
+            source_metadata_uuid=SOURCE_UUID,
+            source_metadata=self.metadata(SOURCE_UUID, **source),
+        )
+        li_removals, li_jobs = md_duplicator._differential_jobs(
+            jobs=jobs,
+            metadata_dst=self.metadata_dst,
+            metadata_dst_bkp=self.metadata(DESTINATION_UUID, **destination),
+            **kwargs
+        )
+        return (
+            [(family, job_kwargs) for family, func, job_kwargs in li_removals],
+            [(family, job_kwargs) for family, func, job_kwargs in li_jobs],
+        )
+
+    @staticmethod
+    def metadata(md_uuid: str, **attributes) -> Metadata:
+        """Metadata with empty subresources, as returned with `include="all"`."""
+        di_subresources = {i: [] for i in MetadataHandle.SUBRESOURCES}
+        di_subresources.update(
+            _id=md_uuid,
+            _creator={"_id": WORKGROUP_UUID},
+            tags={},
+            type="vectorDataset",
+            title="Metadata",
+        )
+        di_subresources.update(attributes)
+        return Metadata(**di_subresources)
+
+    def job(self, family: str, **kwargs) -> tuple:
+        """Import job of the source, as built by `import_into_other_metadata`."""
+        kwargs["metadata"] = self.metadata_dst
+        return (family, MagicMock(), kwargs)
+
+    # -- TESTS ---------------------------------------------------------
+    def test_key_matching(self):
+        """Subresources are matched by identity key, not by UUID nor time of the day"""
+        evt_src = {"_id": "src", "date": "2020-01-01", "kind": "update"}
+        evt_dst = {"_id": "dst", "date": "2020-01-01T12:00:00+00:00", "kind": "update"}
+        evt_old = {"_id": "old", "date": "2019-01-01T00:00:00+00:00", "kind": "update"}
+        cond = {"description": "CGU", "license": {"_id": LICENSE_UUID}}
+        li_jobs = [
+            self.job("events", event=Event(**evt_src)),
+            self.job("conditions", condition=Condition(_id="src", **cond)),
+            self.job(
+                "conditions",
+                condition=Condition(description="Other", license={"_id": LICENSE_UUID}),
+            ),
+            self.job("featureAttributes", metadata_source=None),
+        ]
+
+        li_removals, li_kept = self.differential(
+            source={},
+            destination={
+                "events": [evt_dst, evt_old],
+                "conditions": [dict(cond, _id="dst")],
+            },
+            jobs=li_jobs,
+        )
+
+        self.assertEqual(
+            [(family, kwargs.get("event")._id) for family, kwargs in li_removals],
+            [("events", "old")],
+        )
+        # unknown families are always kept
+        self.assertEqual(
+            [family for family, kwargs in li_kept], ["conditions", "featureAttributes"]
+        )
+        self.assertEqual(li_kept[0][1].get("condition").description, "Other")
+
+    def test_duplicate_entries(self):
+        """Each destination subresource matches one import job at most"""
+        lim = {"type": "legal", "restriction": "patent", "description": "Patent"}
+
+        # two in the source, one in the destination
+        li_removals, li_kept = self.differential(
+            source={},
+            destination={"limitations": [dict(lim, _id="dst")]},
+            jobs=[self.job("limitations", limitation=Limitation(**lim))] * 2,
+        )
+        self.assertEqual(li_removals, [])
+        self.assertEqual(len(li_kept), 1)
+
+        # one in the source, two in the destination
+        li_removals, li_kept = self.differential(
+            source={},
+            destination={
+                "limitations": [dict(lim, _id="dst_1"), dict(lim, _id="dst_2")]
+            },
+            jobs=[self.job("limitations", limitation=Limitation(**lim))],
+        )
+        self.assertEqual(
+            [kwargs.get("limitation")._id for family, kwargs in li_removals], ["dst_2"]
+        )
+        self.assertEqual(li_kept, [])
+
+    def test_contact_roles(self):
+        """A contact losing a role is dissociated, then associated with its roles again"""
+        li_jobs = [
+            self.job(
+                "contacts",
+                contact_role={"contact": {"_id": CONTACT_UUID_1}, "role": role},
+            )
+            for role in ("author", "pointOfContact")
+        ] + [
+            self.job(
+                "contacts",
+                contact_role={"contact": {"_id": CONTACT_UUID_2}, "role": "author"},
+            )
+        ]
+
+        li_removals, li_kept = self.differential(
+            source={},
+            destination={
+                "contacts": [
+                    {"contact": {"_id": CONTACT_UUID_1}, "role": "author"},
+                    {"contact": {"_id": CONTACT_UUID_2}, "role": "author"},
+                    {"contact": {"_id": CONTACT_UUID_2}, "role": "custodian"},
+                ]
+            },
+            jobs=li_jobs,
+        )
+
+        self.assertEqual(
+            [(family, kwargs.get("contact")._id) for family, kwargs in li_removals],
+            [("contacts", CONTACT_UUID_2)],
+        )
+        self.assertEqual(
+            [
+                (
+                    kwargs.get("contact_role").get("contact").get("_id"),
+                    kwargs.get("contact_role").get("role"),
+                )
+                for family, kwargs in li_kept
+            ],
+            [(CONTACT_UUID_1, "pointOfContact"), (CONTACT_UUID_2, "author")],
+        )
+
+    def test_excluded_families(self):
+        """Excluded subresources and catalogs are left in the destination"""
+        tags = {
+            "catalog:{}".format(CATALOG_UUID_1): "Catalog 1",
+            "catalog:{}".format(CATALOG_UUID_2): "Catalog 2",
+        }
+        destination = {
+            "tags": tags,
+            "events": [{"_id": "dst", "date": "2020-01-01", "kind": "update"}],
+        }
+
+        li_removals, li_kept = self.differential(
+            source={}, destination=destination, jobs=[]
+        )
+        self.assertEqual(
+            sorted(family for family, kwargs in li_removals),
+            ["catalogs", "catalogs", "events"],
+        )
+
+        li_removals, li_kept = self.differential(
+            source={},
+            destination=destination,
+            jobs=[],
+            exclude_catalogs=[CATALOG_UUID_1],
+            exclude_subresources=["events"],
+        )
+        self.assertEqual(
+            [(family, kwargs.get("catalog")._id) for family, kwargs in li_removals],
+            [("catalogs", CATALOG_UUID_2)],
+        )
+
+    def test_hosted_links(self):
+        """Hosted links are neither removed from the destination nor imported"""
+        hosted = {
+            "_id": "hosted",
+            "type": "hosted",
+            "kind": "data",
+            "title": "Data.zip",
+            "url": "/resources/{}/links/hosted.bin".format(SOURCE_UUID),
+            "actions": ["download"],
+        }
+        url = {
+            "type": "url",
+            "kind": "url",
+            "title": "Website",
+            "url": "https://example.com",
+            "actions": ["view"],
+        }
+        metadata_src = self.metadata(SOURCE_UUID, links=[hosted, dict(url, _id="src")])
+        metadata_dst = self.metadata(
+            DESTINATION_UUID,
+            links=[
+                dict(hosted, url="/resources/{}/links/hosted.bin".format(SOURCE_UUID)),
+                dict(url, _id="dst"),
+                dict(url, _id="old", title="Old website"),
+            ],
+        )
+        self.api_client.metadata.get.return_value = metadata_dst
+        self.api_client.metadata.update.return_value = metadata_dst
+
+        md_duplicator = MetadataDuplicator(
+            api_client=self.api_client,
+            source_metadata_uuid=SOURCE_UUID,
+            source_metadata=metadata_src,
+        )
+        md_duplicator.import_into_other_metadata(
+            destination_metadata_uuid=DESTINATION_UUID,
+            copymark_title=False,
+            copymark_abstract=False,
+            exclude_fields=[],
+            differential=True,
+        )
+
+        # only the outdated URL is removed, nothing is created
+        self.assertEqual(
+            [
+                kwargs.get("link")._id
+                for args, kwargs in self.api_client.metadata.links.delete.call_args_list
+            ],
+            ["old"],
+        )
+        self.api_client.metadata.links.create.assert_not_called()
+        self.assertIsInstance(
+            self.api_client.metadata.links.delete.call_args[1].get("link"), Link
+        )
@@ -0,0 +1,105 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_duplicate_from_uuids
+        # for specific python -m unittest
+        python -m unittest tests.test_duplicate_from_uuids.TestDuplicateFromUuids.test_chunks
+
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import unittest
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+# module target
+from isogeo_migrations_toolbelt import MetadataDuplicator
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+WORKGROUP_UUID = "32f7e95ec4e94ca3bc1afda960003882"
+
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestDuplicateFromUuids(unittest.TestCase):
+    """Test loading many source metadata by chunks, with an offline API client."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Executed before each test."""
+        self.li_uuids = [uuid4().hex for i in range(5)]
+        self.li_failing = []
+
+        self.api_client = MagicMock()
+        self.api_client.search.side_effect = self.search
+
+    # -- Helpers -------------------------------------------------------
+    def search(self, specific_md: tuple, **kwargs) -> MagicMock:
+        """Offline search of specific metadata, failing for some of them."""
+        if any(md_uuid in self.li_failing for md_uuid in specific_md):
+            return (False, 500)
+        return MagicMock(
+            results=[
+                {"_id": md_uuid, "_creator": {"_id": WORKGROUP_UUID}}
+                for md_uuid in specific_md
+            ]
+        )
+
+    # -- TESTS ---------------------------------------------------------
+    def test_chunks(self):
+        """Sources are searched by chunks, once each, in the order of the passed list"""
+        li_passed = self.li_uuids + ["not a UUID", self.li_uuids[0]]
+
+        with self.assertLogs("isogeo_migrations_toolbelt.duplicate.duplicator") as logs:
+            di_duplicators = MetadataDuplicator.from_uuids(
+                api_client=self.api_client,
+                source_metadata_uuids=li_passed,
+                chunk_size=2,
+            )
+
+        self.assertEqual(list(di_duplicators), self.li_uuids)
+        self.assertEqual(
+            di_duplicators.get(self.li_uuids[0]).metadata_source._id, self.li_uuids[0]
+        )
+        self.assertEqual(
+            sorted(
+                kwargs.get("specific_md")
+                for args, kwargs in self.api_client.search.call_args_list
+            ),
+            sorted(
+                tuple(self.li_uuids[i : i + 2]) for i in range(0, len(self.li_uuids), 2)
+            ),
+        )
+        self.assertIn("5/5 source metadata loaded in 3 searches.", logs.output[-1])
+
+    def test_failed_chunk(self):
+        """Sources of a failed search are left out"""
+        self.li_failing = [self.li_uuids[2]]
+
+        with self.assertLogs("isogeo_migrations_toolbelt.duplicate.duplicator") as logs:
+            di_duplicators = MetadataDuplicator.from_uuids(
+                api_client=self.api_client,
+                source_metadata_uuids=self.li_uuids + [self.li_uuids[4]],
+                chunk_size=2,
+            )
+
+        self.assertEqual(
+            list(di_duplicators),
+            [self.li_uuids[0], self.li_uuids[1], self.li_uuids[4]],
+        )
+        self.assertIn("3/5 source metadata loaded in 3 searches.", logs.output[-1])
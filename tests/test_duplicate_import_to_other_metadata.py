@@ -178,3 +178,33 @@ class TestDuplicationImportMetadata(unittest.TestCase):
 
         # delete created metadata
         self.isogeo.metadata.delete(new_md._id)
+
+    def test_import_differential_twice(self):
+        """import_into_other_metadata in differential mode is idempotent"""
+        # load source
+        md_duplicator = MetadataDuplicator(
+            api_client=self.isogeo,
+            source_metadata_uuid=environ.get("ISOGEO_METADATA_FIXTURE_UUID"),
+        )
+
+        # import it twice
+        md_duplicator.import_into_other_metadata(
+            destination_metadata_uuid=self.fixture_metadata_target._id,
+            copymark_title=False,
+            copymark_abstract=False,
+            differential=True,
+        )
+        new_md = md_duplicator.import_into_other_metadata(
+            destination_metadata_uuid=self.fixture_metadata_target._id,
+            copymark_title=False,
+            copymark_abstract=False,
+            differential=True,
+        )
+
+        # nothing to remove nor to add the second time
+        self.assertEqual(md_duplicator.subresources_removals_report, {})
+        md_imported = self.isogeo.metadata.get(new_md._id, include="all")
+        self.assertEqual(len(self.fixture_metadata.events), len(md_imported.events))
+
+        # delete created metadata
+        self.isogeo.metadata.delete(new_md._id)
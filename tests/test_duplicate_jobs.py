@@ -0,0 +1,104 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_duplicate_jobs
+        # for specific python -m unittest
+        python -m unittest tests.test_duplicate_jobs.TestDuplicateJobs.test_same_errors
+
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import unittest
+from unittest.mock import MagicMock
+
+# Isogeo
+from isogeo_pysdk import Metadata
+
+# module target
+from isogeo_migrations_toolbelt import MetadataDuplicator
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+SOURCE_UUID = "0269803d50c446b09f5060ef7fe3e22b"
+
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestDuplicateJobs(unittest.TestCase):
+    """Test how the sub-resources jobs are run, with fake jobs."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Executed before each test."""
+        self.li_done = []
+
+    # -- Helpers -------------------------------------------------------
+    def duplicator(self, max_workers: int) -> MetadataDuplicator:
+        """Duplicator of an offline source metadata."""
+        return MetadataDuplicator(
+            api_client=MagicMock(),
+            source_metadata_uuid=SOURCE_UUID,
+            source_metadata=Metadata(_id=SOURCE_UUID),
+            max_workers=max_workers,
+        )
+
+    def succeed(self, item: str) -> str:
+        """Fake job which succeeds."""
+        self.li_done.append(item)
+        return item
+
+    @staticmethod
+    def reply_error(item: str) -> tuple:
+        """Fake job whose API request fails, as returned by the SDK."""
+        return (False, 404)
+
+    @staticmethod
+    def fail(item: str):
+        """Fake job which raises."""
+        raise ValueError(item)
+
+    def jobs(self) -> list:
+        """Jobs of two families, with failures in the middle."""
+        return [
+            ("events", self.succeed, {"item": "event_1"}),
+            ("events", self.fail, {"item": "event_2"}),
+            ("links", self.reply_error, {"item": "link_1"}),
+            ("events", self.succeed, {"item": "event_3"}),
+            ("links", self.succeed, {"item": "link_2"}),
+        ]
+
+    # -- TESTS ---------------------------------------------------------
+    def test_same_errors(self):
+        """Failed jobs are reported the same way, one by one or simultaneously"""
+        for max_workers in (0, 1, 4):
+            self.li_done = []
+            md_duplicator = self.duplicator(max_workers)
+            report = md_duplicator._run_subresources_jobs(self.jobs())
+
+            # other jobs are run anyway
+            self.assertEqual(
+                sorted(self.li_done), ["event_1", "event_3", "link_2"], max_workers
+            )
+            self.assertEqual(
+                {family: outcome.get("done") for family, outcome in report.items()},
+                {"events": 2, "links": 1},
+            )
+            self.assertEqual(report.get("links").get("errors"), [404])
+            li_errors = report.get("events").get("errors")
+            self.assertEqual(len(li_errors), 1)
+            self.assertIsInstance(li_errors[0], ValueError)
+            self.assertIs(md_duplicator.subresources_report, report)
@@ -31,7 +31,7 @@ from dotenv import load_dotenv
 from isogeo_pysdk import Contact, Isogeo, Workgroup
 
 # module target
-from isogeo_migrations_toolbelt import MetadataDuplicator
+from isogeo_migrations_toolbelt import MetadataDuplicator, WorkgroupReferenceCache
 
 
 # #############################################################################
@@ -174,3 +174,96 @@ class TestDuplicationOtherGroup(unittest.TestCase):
 
         # delete created metadata
         self.isogeo.metadata.delete(new_md._id)
+
+    def test_duplicate_parallel_subresources(self):
+        """duplicate_into_other_group with sub-resources sent through a pool of threads"""
+        # load source
+        md_duplicator = MetadataDuplicator(
+            api_client=self.isogeo,
+            source_metadata_uuid=environ.get("ISOGEO_METADATA_FIXTURE_UUID"),
+            max_workers=5,
+        )
+
+        # duplicate it
+        new_md = md_duplicator.duplicate_into_other_group(
+            destination_workgroup_uuid=self.fixture_workgroup._id,
+            copymark_title=False,
+            copymark_abstract=False,
+        )
+
+        # compare results
+        self.assertEqual(self.fixture_metadata.title, new_md.title)
+        self.assertEqual(len(self.fixture_metadata.events), len(new_md.events))
+        for family, outcome in md_duplicator.subresources_report.items():
+            self.assertEqual(outcome.get("errors"), [], family)
+
+        # delete created metadata
+        self.isogeo.metadata.delete(new_md._id)
+
+    def test_duplicate_with_shared_workgroup_cache(self):
+        """duplicate_into_other_group twice with the same destination workgroup cache"""
+        # load destination workgroup cache
+        wg_cache = WorkgroupReferenceCache(
+            api_client=self.isogeo, workgroup_uuid=self.fixture_workgroup._id
+        )
+
+        li_new_md = []
+        for i in range(2):
+            # load source
+            md_duplicator = MetadataDuplicator(
+                api_client=self.isogeo,
+                source_metadata_uuid=environ.get("ISOGEO_METADATA_FIXTURE_UUID"),
+            )
+
+            # duplicate it
+            li_new_md.append(
+                md_duplicator.duplicate_into_other_group(
+                    destination_workgroup_uuid=self.fixture_workgroup._id,
+                    copymark_title=False,
+                    copymark_abstract=False,
+                    workgroup_cache=wg_cache,
+                )
+            )
+
+        # compare results: same catalogs and specifications are used by both copies
+        self.assertEqual(
+            sorted(li_new_md[0].tags), sorted(li_new_md[1].tags),
+        )
+        self.assertEqual(
+            len(li_new_md[0].specifications), len(li_new_md[1].specifications)
+        )
+
+        # a cache bound to another workgroup is refused
+        with self.assertRaises(ValueError):
+            md_duplicator.duplicate_into_other_group(
+                destination_workgroup_uuid=self.fixture_metadata._creator.get("_id"),
+                workgroup_cache=wg_cache,
+            )
+
+        # delete created metadata
+        for new_md in li_new_md:
+            self.isogeo.metadata.delete(new_md._id)
+
+    def test_duplicate_without_refetch(self):
+        """duplicate_into_other_group returning a lightweight handle"""
+        # load source
+        md_duplicator = MetadataDuplicator(
+            api_client=self.isogeo,
+            source_metadata_uuid=environ.get("ISOGEO_METADATA_FIXTURE_UUID"),
+        )
+
+        # duplicate it
+        new_md = md_duplicator.duplicate_into_other_group(
+            destination_workgroup_uuid=self.fixture_workgroup._id,
+            copymark_title=False,
+            copymark_abstract=False,
+            refetch=False,
+        )
+
+        # compare results: root attributes are known locally, subresources are retrieved
+        self.assertEqual(self.fixture_metadata.title, new_md.title)
+        self.assertEqual(self.fixture_workgroup._id, new_md._creator.get("_id"))
+        self.assertEqual(len(self.fixture_metadata.events), len(new_md.events))
+
+        # delete created metadata
+        self.isogeo.metadata.delete(new_md._id)
@@ -31,7 +31,7 @@ from dotenv import load_dotenv
 from isogeo_pysdk import Isogeo
 
 # module target
-from isogeo_migrations_toolbelt import MetadataDuplicator
+from isogeo_migrations_toolbelt import KeywordCache, MetadataDuplicator
 
 
 # #############################################################################
@@ -155,3 +155,59 @@ class TestDuplicationSameGroup(unittest.TestCase):
 
         # delete created metadata
         self.isogeo.metadata.delete(new_md._id)
+
+    def test_duplicate_with_shared_keyword_cache(self):
+        """duplicate_into_same_group twice with the same keywords cache"""
+        kw_cache = KeywordCache(api_client=self.isogeo)
+
+        li_new_md = []
+        for i in range(2):
+            # load source
+            md_duplicator = MetadataDuplicator(
+                api_client=self.isogeo,
+                source_metadata_uuid=environ.get("ISOGEO_METADATA_FIXTURE_UUID"),
+                keyword_cache=kw_cache,
+            )
+
+            # duplicate it
+            li_new_md.append(md_duplicator.duplicate_into_same_group())
+
+        # compare results
+        for new_md in li_new_md:
+            self.assertEqual(
+                sorted(kw.get("_id") for kw in self.fixture_metadata.keywords),
+                sorted(kw.get("_id") for kw in new_md.keywords),
+            )
+        # keywords have been resolved once
+        self.assertEqual(kw_cache.misses, len(self.fixture_metadata.keywords))
+
+        # delete created metadata
+        for new_md in li_new_md:
+            self.isogeo.metadata.delete(new_md._id)
+
+    def test_duplicate_from_uuids(self):
+        """duplicate_into_same_group with a source loaded by a chunked search"""
+        # load sources
+        di_duplicators = MetadataDuplicator.from_uuids(
+            api_client=self.isogeo,
+            source_metadata_uuids=[environ.get("ISOGEO_METADATA_FIXTURE_UUID")],
+        )
+        self.assertEqual(len(di_duplicators), 1)
+        md_duplicator = di_duplicators.get(environ.get("ISOGEO_METADATA_FIXTURE_UUID"))
+
+        # compare source with the one loaded by the API
+        self.assertEqual(self.fixture_metadata._id, md_duplicator.metadata_source._id)
+        self.assertEqual(
+            len(self.fixture_metadata.events), len(md_duplicator.metadata_source.events)
+        )
+
+        # duplicate it
+        new_md = md_duplicator.duplicate_into_same_group(
+            copymark_title=False, copymark_abstract=False
+        )
+
+        # compare results
+        self.assertEqual(self.fixture_metadata.title, new_md.title)
+
+        # delete created metadata
+        self.isogeo.metadata.delete(new_md._id)
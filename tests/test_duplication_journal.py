@@ -0,0 +1,115 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_duplication_journal
+        # for specific python -m unittest
+        python -m unittest tests.test_duplication_journal.TestDuplicationJournal.test_resume_steps
+
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+# module target
+from isogeo_migrations_toolbelt import DuplicationJournal, MetadataDuplicator
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+SOURCE_UUID = "0269803d50c446b09f5060ef7fe3e22b"
+TARGET_UUID = "32f7e95ec4e94ca3bc1afda960003882"
+DESTINATION_UUID = "c2f7d68a7d9c4cd3b8a6de3a3b1d52a8"
+
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestDuplicationJournal(unittest.TestCase):
+    """Test duplication journal."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Executed before each test."""
+        self.tmp_dir = TemporaryDirectory()
+        self.journal = DuplicationJournal(Path(self.tmp_dir.name, "journal.sqlite"))
+
+    def tearDown(self):
+        """Executed after each test."""
+        self.journal.close()
+        self.tmp_dir.cleanup()
+
+    # -- TESTS ---------------------------------------------------------
+    def test_resume_steps(self):
+        """Steps survive a new connection to the journal"""
+        self.journal.start(SOURCE_UUID, "other_group", TARGET_UUID, DESTINATION_UUID)
+        self.journal.mark_step(
+            SOURCE_UUID, "other_group", TARGET_UUID, "imported:events:a", "events"
+        )
+        self.journal.mark_step(
+            SOURCE_UUID, "other_group", TARGET_UUID, "imported:events:a", "events"
+        )
+        self.journal.close()
+
+        # reopen it
+        self.journal = DuplicationJournal(Path(self.tmp_dir.name, "journal.sqlite"))
+        self.assertEqual(
+            self.journal.destination(SOURCE_UUID, "other_group", TARGET_UUID),
+            DESTINATION_UUID,
+        )
+        self.assertEqual(
+            self.journal.done_steps(SOURCE_UUID, "other_group", TARGET_UUID),
+            {"imported:events:a"},
+        )
+        self.assertEqual(
+            self.journal.status(SOURCE_UUID, "other_group", TARGET_UUID), "started"
+        )
+
+        self.journal.complete(SOURCE_UUID, "other_group", TARGET_UUID)
+        self.assertEqual(
+            self.journal.status(SOURCE_UUID, "other_group", TARGET_UUID), "completed"
+        )
+
+    def test_new_destination_forgets_steps(self):
+        """Steps of a lost destination are forgotten"""
+        self.journal.start(SOURCE_UUID, "same_group", TARGET_UUID, DESTINATION_UUID)
+        self.journal.mark_step(
+            SOURCE_UUID, "same_group", TARGET_UUID, "imported:links:a", "links"
+        )
+        self.journal.start(SOURCE_UUID, "same_group", TARGET_UUID, SOURCE_UUID)
+
+        self.assertEqual(
+            self.journal.done_steps(SOURCE_UUID, "same_group", TARGET_UUID), set()
+        )
+        self.assertEqual(
+            self.journal.destination(SOURCE_UUID, "same_group", TARGET_UUID),
+            SOURCE_UUID,
+        )
+
+    def test_steps_keys(self):
+        """Jobs keys are stable and identical jobs are numbered"""
+        li_jobs = [
+            ("events", print, {"event": {"_id": DESTINATION_UUID, "kind": "update"}}),
+            ("catalogs", print, {"catalog_uuid": TARGET_UUID}),
+            ("catalogs", print, {"catalog_uuid": TARGET_UUID}),
+        ]
+        li_steps = MetadataDuplicator._journal_steps(li_jobs)
+
+        self.assertEqual(li_steps, MetadataDuplicator._journal_steps(li_jobs))
+        self.assertEqual(
+            li_steps[0], 'imported:events:{"event": "' + DESTINATION_UUID + '"}'
+        )
+        self.assertEqual(li_steps[2], li_steps[1] + "#2")
@@ -0,0 +1,90 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_keyword_cache
+        # for specific python -m unittest
+        python -m unittest tests.test_keyword_cache.TestKeywordCache.test_eviction_order
+
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import unittest
+from unittest.mock import MagicMock
+
+# Isogeo
+from isogeo_pysdk import Keyword
+
+# module target
+from isogeo_migrations_toolbelt import KeywordCache
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestKeywordCache(unittest.TestCase):
+    """Test the keywords cache, with an offline API client."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Executed before each test."""
+        self.api_client = MagicMock()
+        self.api_client.keyword.get.side_effect = self.get
+
+    # -- Helpers -------------------------------------------------------
+    @staticmethod
+    def get(keyword_id: str, include: list) -> Keyword:
+        """Offline keyword retrieval."""
+        if keyword_id == "unknown":
+            return (False, 404)
+        return Keyword(_id=keyword_id, _tag="keyword:isogeo:{}".format(keyword_id))
+
+    def requested(self) -> list:
+        """Keywords requested to the API, in order."""
+        return [
+            kwargs.get("keyword_id")
+            for args, kwargs in self.api_client.keyword.get.call_args_list
+        ]
+
+    # -- TESTS ---------------------------------------------------------
+    def test_eviction_order(self):
+        """The least recently used keyword is evicted first"""
+        kw_cache = KeywordCache(api_client=self.api_client, maxsize=2)
+        for keyword_id in ("a", "b", "a", "c", "a", "b"):
+            keyword = kw_cache.get({"_id": keyword_id})
+            self.assertEqual(keyword._id, keyword_id)
+
+        # "b" was evicted by "c", then "c" by "b"
+        self.assertEqual(self.requested(), ["a", "b", "c", "b"])
+        self.assertEqual(len(kw_cache), 2)
+        self.assertEqual((kw_cache.hits, kw_cache.misses), (2, 4))
+
+    def test_counters(self):
+        """Only the API requests are cached and counted"""
+        kw_cache = KeywordCache(api_client=self.api_client)
+
+        # complete keywords don't need any request
+        keyword = kw_cache.get({"_id": "a", "_tag": "keyword:isogeo:a", "text": "A"})
+        self.assertEqual((keyword._tag, keyword.text), ("keyword:isogeo:a", "A"))
+        self.assertEqual((kw_cache.hits, kw_cache.misses, len(kw_cache)), (0, 0, 0))
+
+        # failures are not cached
+        for i in range(2):
+            self.assertEqual(kw_cache.get({"_id": "unknown"}), (False, 404))
+        self.assertEqual((kw_cache.hits, kw_cache.misses, len(kw_cache)), (0, 2, 0))
+
+        kw_cache.get({"_id": "b"})
+        kw_cache.get({"_id": "b"})
+        self.assertEqual((kw_cache.hits, kw_cache.misses, len(kw_cache)), (1, 3, 1))
+
+        kw_cache.clear()
+        self.assertEqual((kw_cache.hits, kw_cache.misses, len(kw_cache)), (0, 0, 0))
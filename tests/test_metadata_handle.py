@@ -0,0 +1,120 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_metadata_handle
+        # for specific python -m unittest
+        python -m unittest tests.test_metadata_handle.TestMetadataHandle.test_service_source
+
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import unittest
+from unittest.mock import MagicMock
+
+# Isogeo
+from isogeo_pysdk import Metadata
+
+# module target
+from isogeo_migrations_toolbelt import MetadataDuplicator, MetadataHandle
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+SOURCE_UUID = "0269803d50c446b09f5060ef7fe3e22b"
+WORKGROUP_UUID = "32f7e95ec4e94ca3bc1afda960003882"
+DESTINATION_UUID = "c2f7d68a7d9c4cd3b8a6de3a3b1d52a8"
+
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestMetadataHandle(unittest.TestCase):
+    """Test the lightweight metadata returned by duplications without refetch."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Executed before each test."""
+        self.api_client = MagicMock()
+        self.metadata_created = Metadata(
+            _id=DESTINATION_UUID,
+            _creator={"_id": WORKGROUP_UUID},
+            _created="2020-01-01T00:00:00+00:00",
+            _modified="2020-01-01T00:00:00+00:00",
+        )
+
+    # -- TESTS ---------------------------------------------------------
+    def test_dataset_source(self):
+        """Attributes sent to the creation request are known without any request"""
+        metadata_sent = Metadata(
+            _id=SOURCE_UUID,
+            type="vectorDataset",
+            title="Dataset [COPIE]",
+            abstract="Abstract",
+            events=[{"_id": SOURCE_UUID}],
+        )
+        handle = MetadataHandle.from_creation(
+            api_client=self.api_client,
+            metadata_sent=metadata_sent,
+            metadata_created=self.metadata_created,
+        )
+
+        self.assertEqual(handle._id, DESTINATION_UUID)
+        self.assertEqual(handle.title, "Dataset [COPIE]")
+        self.assertEqual(handle.abstract, "Abstract")
+        self.assertEqual(handle._created, self.metadata_created._created)
+        self.api_client.metadata.get.assert_not_called()
+
+        # subresources come from the API
+        handle.events
+        self.api_client.metadata.get.assert_called_once_with(
+            metadata_id=DESTINATION_UUID, include="all"
+        )
+
+    def test_service_source(self):
+        """Only the attributes written by the service helper are reported"""
+        # source without subresources
+        di_subresources = {i: [] for i in MetadataHandle.SUBRESOURCES}
+        di_subresources["tags"] = {}
+        metadata_source = Metadata(
+            _id=SOURCE_UUID,
+            _creator={"_id": WORKGROUP_UUID},
+            type="service",
+            format="wms",
+            path="https://example.com/wms",
+            title="Service",
+            abstract="Abstract never sent",
+            **di_subresources
+        )
+        self.api_client.services.create.return_value = Metadata(
+            _id=DESTINATION_UUID,
+            _creator={"_id": WORKGROUP_UUID},
+            type="service",
+            format="wms",
+            path="https://example.com/wms",
+            title="Service [COPIE]",
+        )
+        md_duplicator = MetadataDuplicator(
+            api_client=self.api_client,
+            source_metadata_uuid=SOURCE_UUID,
+            source_metadata=metadata_source,
+        )
+        handle = md_duplicator.duplicate_into_same_group(refetch=False)
+
+        self.assertIsInstance(handle, MetadataHandle)
+        self.assertEqual(handle._id, DESTINATION_UUID)
+        self.assertEqual(handle.title, "Service [COPIE]")
+        self.assertEqual(handle.path, "https://example.com/wms")
+        self.assertIsNone(handle.abstract)
+        self.api_client.metadata.create.assert_not_called()
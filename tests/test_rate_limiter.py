@@ -0,0 +1,101 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_rate_limiter
+        # for specific python -m unittest
+        python -m unittest tests.test_rate_limiter.TestRateLimiter.test_back_off_on_server_error
+
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import unittest
+from types import SimpleNamespace
+
+# module target
+from isogeo_migrations_toolbelt import RateLimiter
+
+
+# #############################################################################
+# ########## Helpers ###############
+# ##################################
+
+
+class FakeSession(object):
+    """Minimal session replying with the given status codes, then 200."""
+
+    def __init__(self, status_codes: list = []):
+        self.status_codes = list(status_codes)
+        self.sent = 0
+
+    def request(self, method: str, url: str, **kwargs):
+        self.sent += 1
+        status_code = self.status_codes.pop(0) if self.status_codes else 200
+        return SimpleNamespace(status_code=status_code, headers={})
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test rate limiter."""
+
+    # -- TESTS ---------------------------------------------------------
+    def test_bad_rates(self):
+        """Rates must be consistent"""
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=100, max_rate=50)
+        with self.assertRaises(ValueError):
+            RateLimiter(decrease=2)
+
+    def test_install_once(self):
+        """Installing twice doesn't pace requests twice"""
+        session = FakeSession()
+        rate_limiter = RateLimiter(rate=50)
+        rate_limiter.install(session)
+        rate_limiter.install(session)
+        RateLimiter.apply(session)
+
+        session.get("https://api.isogeo.com/about")
+        self.assertEqual(rate_limiter.requests, 1)
+        self.assertIs(session._rate_limiter, rate_limiter)
+
+    def test_speed_up_on_success(self):
+        """Rate grows after successful requests"""
+        session = FakeSession()
+        rate_limiter = RateLimiter(rate=20, increase=1).install(session)._rate_limiter
+        for i in range(5):
+            session.get("https://api.isogeo.com/about")
+        self.assertEqual(rate_limiter.rate, 25)
+
+    def test_back_off_on_server_error(self):
+        """Rate is cut down after a 5xx"""
+        session = FakeSession([503])
+        rate_limiter = RateLimiter(rate=20, decrease=0.5).install(session)._rate_limiter
+        response = session.get("https://api.isogeo.com/about")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(rate_limiter.rate, 10)
+        self.assertEqual(rate_limiter.throttled, 1)
+
+    def test_retry_on_too_many_requests(self):
+        """Requests refused with a 429 are sent again"""
+        session = FakeSession([429, 429])
+        rate_limiter = RateLimiter(rate=50, min_rate=1, max_retries=3)
+        rate_limiter.install(session)
+        response = session.get("https://api.isogeo.com/about")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(session.sent, 3)
+        self.assertEqual(rate_limiter.throttled, 2)
@@ -20,11 +20,13 @@
 import logging
 import unittest
 import urllib3
+from copy import deepcopy
 from os import environ
 from pathlib import Path
 from socket import gethostname
 from sys import _getframe, exit
 from time import gmtime, sleep, strftime
+from unittest.mock import MagicMock
 
 # 3rd party
 from dotenv import load_dotenv
@@ -171,3 +173,92 @@ class TestSearchReplace(unittest.TestCase):
 
         # delete metadata
         self.isogeo.metadata.delete(metadata_id=md._id)
+
+
+class TestSearchReplaceFilter(unittest.TestCase):
+    """Test metadata matching the search and replace patterns, offline."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Executed before each test."""
+        self.searchrpl_mngr = SearchReplaceManager(
+            api_client=MagicMock(),
+            attributes_patterns={
+                "title": ("Grand Dijon", "Dijon Métropole"),
+                "abstract": ("Grand Dijon", "Dijon Métropole"),
+                "coordinateSystem": ("Lambert 93", "RGF93 / Lambert-93"),
+            },
+        )
+
+    # -- TESTS ---------------------------------------------------------
+    def test_several_attributes(self):
+        """A metadata matching several patterns is returned once, with every replacement"""
+        li_results = self.searchrpl_mngr.filter_matching_metadatas(
+            [
+                {
+                    "_id": "0269803d50c446b09f5060ef7fe3e22b",
+                    "title": "Parcelles du Grand Dijon",
+                    "abstract": "Cadastre du Grand Dijon",
+                },
+                {"_id": "c2f7d68a7d9c4cd3b8a6de3a3b1d52a8", "title": "Parcelles"},
+            ]
+        )
+
+        self.assertEqual(len(li_results), 1)
+        self.assertIsInstance(li_results[0], Metadata)
+        self.assertEqual(li_results[0].title, "Parcelles du Dijon Métropole")
+        self.assertEqual(li_results[0].abstract, "Cadastre du Dijon Métropole")
+
+    def test_hyphenated_attribute(self):
+        """Attributes renamed by the Metadata model are read from the raw search result"""
+        li_results = self.searchrpl_mngr.filter_matching_metadatas(
+            [
+                {
+                    "_id": "0269803d50c446b09f5060ef7fe3e22b",
+                    "coordinate-system": "Lambert 93",
+                },
+                {
+                    "_id": "c2f7d68a7d9c4cd3b8a6de3a3b1d52a8",
+                    "title": "Parcelles du Grand Dijon",
+                    "coordinate-system": {"code": 2154, "name": "Lambert 93"},
+                },
+            ]
+        )
+
+        self.assertEqual(
+            [md._id for md in li_results],
+            ["0269803d50c446b09f5060ef7fe3e22b", "c2f7d68a7d9c4cd3b8a6de3a3b1d52a8"],
+        )
+        # only string values are replaced, others are kept
+        self.assertEqual(
+            li_results[1].coordinateSystem, {"code": 2154, "name": "Lambert 93"}
+        )
+
+    def test_title_as_name(self):
+        """A title equal to the technical name is left unchanged"""
+        li_results = self.searchrpl_mngr.filter_matching_metadatas(
+            [
+                {
+                    "_id": "0269803d50c446b09f5060ef7fe3e22b",
+                    "name": "Grand Dijon",
+                    "title": "Grand Dijon",
+                }
+            ]
+        )
+
+        self.assertEqual(li_results, ())
+
+    def test_search_results_unchanged(self):
+        """Search results are left untouched"""
+        li_search_results = [
+            {
+                "_id": "0269803d50c446b09f5060ef7fe3e22b",
+                "title": "Parcelles du Grand Dijon",
+                "coordinate-system": "Lambert 93",
+            }
+        ]
+        li_search_results_bkp = deepcopy(li_search_results)
+
+        self.searchrpl_mngr.filter_matching_metadatas(li_search_results)
+
+        self.assertEqual(li_search_results, li_search_results_bkp)
@@ -0,0 +1,173 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_snapshot_index
+        # for specific python -m unittest
+        python -m unittest tests.test_snapshot_index.TestSnapshotIndex.test_latest_before
+
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import unittest
+from datetime import datetime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock, patch
+
+# Isogeo
+from isogeo_pysdk import Metadata
+
+# module target
+from isogeo_migrations_toolbelt import (
+    BackupManager,
+    BackupManifest,
+    JsonLinesArchive,
+    SnapshotIndex,
+)
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+METADATA_UUID = "0269803d50c446b09f5060ef7fe3e22b"
+WORKGROUP_UUID = "32f7e95ec4e94ca3bc1afda960003882"
+SNAPSHOTS = ("20200101_120000", "20200301_120000", "20200601_120000")
+
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestSnapshotIndex(unittest.TestCase):
+    """Test snapshot index."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Executed before each test."""
+        self.tmp_dir = TemporaryDirectory()
+        self.snapshot_index = SnapshotIndex(
+            Path(self.tmp_dir.name, "index.sqlite"), batch_size=2
+        )
+
+        # one archive by snapshot
+        for snapshot in SNAPSHOTS:
+            archive_path = Path(self.tmp_dir.name, snapshot, "metadata.jsonl.gz")
+            with JsonLinesArchive(archive_path) as jsonl_archive:
+                offset, length = jsonl_archive.write(
+                    METADATA_UUID, {"_id": METADATA_UUID, "title": snapshot}
+                )
+            self.snapshot_index.add(
+                metadata_id=METADATA_UUID,
+                workgroup_id=WORKGROUP_UUID,
+                modified=snapshot,
+                snapshot=snapshot,
+                folder=archive_path.parent,
+                path=archive_path,
+                title=snapshot,
+                offset=offset,
+                length=length,
+            )
+
+    def tearDown(self):
+        """Executed after each test."""
+        self.snapshot_index.close()
+        self.tmp_dir.cleanup()
+
+    # -- TESTS ---------------------------------------------------------
+    def test_versions(self):
+        """Versions are listed from the latest snapshot"""
+        li_versions = self.snapshot_index.versions(METADATA_UUID)
+        self.assertEqual(
+            [i.get("snapshot") for i in li_versions], list(reversed(SNAPSHOTS))
+        )
+        self.assertEqual(self.snapshot_index.versions(WORKGROUP_UUID), [])
+
+    def test_latest_before(self):
+        """Latest version before a date is loaded from its archive"""
+        md_version = self.snapshot_index.latest(
+            METADATA_UUID, before=datetime(2020, 5, 1)
+        )
+        self.assertEqual(md_version.get("snapshot"), SNAPSHOTS[1])
+        self.assertEqual(
+            BackupManifest.load_record(md_version).get("title"), SNAPSHOTS[1]
+        )
+        self.assertEqual(
+            self.snapshot_index.latest(METADATA_UUID).get("snapshot"), SNAPSHOTS[2]
+        )
+        self.assertIsNone(
+            self.snapshot_index.latest(METADATA_UUID, before=datetime(2019, 1, 1))
+        )
+
+    def test_snapshot_records(self):
+        """Records of a snapshot are filtered by workgroup"""
+        self.assertEqual(len(self.snapshot_index.snapshot(SNAPSHOTS[0])), 1)
+        self.assertEqual(
+            self.snapshot_index.snapshot(SNAPSHOTS[0], WORKGROUP_UUID)[0].get("_id"),
+            METADATA_UUID,
+        )
+        self.assertEqual(self.snapshot_index.snapshot(SNAPSHOTS[0], METADATA_UUID), [])
+
+    def test_linked_records(self):
+        """Linked metadata are indexed the same way by the backup and from the manifest"""
+        md = {
+            "_id": METADATA_UUID,
+            "_creator": {"_id": WORKGROUP_UUID},
+            "_modified": "2020-01-01T00:00:00+00:00",
+            "title": "Unchanged",
+        }
+        api_client = MagicMock()
+        api_client.search.return_value = MagicMock(results=[md], total=1)
+        api_client.metadata.get.return_value = Metadata(**md)
+
+        # two backups of the same metadata, indexed as they're performed
+        backup_index = SnapshotIndex(Path(self.tmp_dir.name, "backup_index.sqlite"))
+        li_folders = []
+        for snapshot in SNAPSHOTS[1:]:
+            backup_mngr = BackupManager(
+                api_client=api_client,
+                output_folder=Path(self.tmp_dir.name, "backup_" + snapshot),
+                previous_snapshot=li_folders[-1] if li_folders else None,
+                snapshot_index=backup_index,
+            )
+            with patch(
+                "isogeo_migrations_toolbelt.backup.backup_manager.datetime"
+            ) as run_date:
+                run_date.now.return_value.strftime.return_value = snapshot
+                backup_mngr.metadata(search_params={"query": None})
+            li_folders.append(backup_mngr.outfolder)
+        self.assertEqual(backup_mngr.nb_unchanged, 1)
+
+        # the same backups indexed from their manifest
+        folders_index = SnapshotIndex(Path(self.tmp_dir.name, "folders_index.sqlite"))
+        for folder in li_folders:
+            folders_index.add_folder(folder)
+
+        try:
+            self.assertEqual(
+                backup_index.versions(METADATA_UUID),
+                folders_index.versions(METADATA_UUID),
+            )
+            self.assertEqual(
+                [i.get("_id") for i in folders_index.snapshot(SNAPSHOTS[2])],
+                [METADATA_UUID],
+            )
+            for index in (backup_index, folders_index):
+                self.assertEqual(
+                    index.latest(METADATA_UUID, before=datetime(2020, 5, 1)).get(
+                        "snapshot"
+                    ),
+                    SNAPSHOTS[1],
+                )
+        finally:
+            backup_index.close()
+            folders_index.close()
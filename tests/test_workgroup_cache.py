@@ -0,0 +1,202 @@
+# -*- coding: UTF-8 -*-
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_workgroup_cache
+        # for specific python -m unittest
+        python -m unittest tests.test_workgroup_cache.TestWorkgroupCache.test_invalidate_kind
+
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Isogeo
+from isogeo_pysdk import Catalog, Contact, CoordinateSystem, Specification
+
+# module target
+from isogeo_migrations_toolbelt import WorkgroupReferenceCache
+
+# #############################################################################
+# ######## Globals #################
+# ##################################
+
+WORKGROUP_UUID = "32f7e95ec4e94ca3bc1afda960003882"
+CATALOG_UUID = "7c1a8cbb9c1c4a1ab0b0e3b5c30e1a44"
+CONTACT_UUID = "5a6ea1f0b0e54b9a8d4b1e4f2a6c9d01"
+SPECIFICATION_UUID_1 = "b3d0d8e2c5f74e0c9a1f6e7d8c9b0a12"
+SPECIFICATION_UUID_2 = "e4b1c2d3f4a54b6c8d7e9f0a1b2c3d4e"
+
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestWorkgroupCache(unittest.TestCase):
+    """Test the workgroup reference cache, with an offline API client."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Executed before each test."""
+        self.api_client = MagicMock()
+        self.api_client.catalog.listing.return_value = [
+            {"_id": CATALOG_UUID, "name": "Catalog"}
+        ]
+        self.api_client.contact.listing.return_value = [
+            {"_id": CONTACT_UUID, "email": "contact@example.com"}
+        ]
+        self.api_client.srs.listing.return_value = [{"code": 4326}]
+        self.api_client.specification.listing.return_value = [
+            {
+                "_id": SPECIFICATION_UUID_1,
+                "link": "https://eur-lex.europa.eu/eli/reg/2010/1089/",
+                "name": "INSPIRE - Interoperability  of spatial data sets",
+            },
+            {"_id": SPECIFICATION_UUID_2, "link": None, "name": "Internal"},
+        ]
+        self.wg_cache = WorkgroupReferenceCache(
+            api_client=self.api_client, workgroup_uuid=WORKGROUP_UUID
+        )
+
+    # -- TESTS ---------------------------------------------------------
+    def test_invalidate_kind(self):
+        """Only the invalidated kind of objects is reloaded"""
+        for i in range(2):
+            self.wg_cache.resolve_catalog(Catalog(name="Catalog"))
+            self.wg_cache.resolve_contact(Contact(email="contact@example.com"))
+        self.api_client.catalog.listing.assert_called_once()
+        self.api_client.contact.listing.assert_called_once()
+
+        self.wg_cache.invalidate("catalogs")
+        self.wg_cache.resolve_catalog(Catalog(name="Catalog"))
+        self.wg_cache.resolve_contact(Contact(email="contact@example.com"))
+        self.assertEqual(self.api_client.catalog.listing.call_count, 2)
+        self.api_client.contact.listing.assert_called_once()
+
+        with self.assertRaises(ValueError):
+            self.wg_cache.invalidate("users")
+
+    @patch("isogeo_migrations_toolbelt.duplicate.workgroup_cache.monotonic")
+    def test_max_age(self, monotonic):
+        """Listings are reloaded once expired"""
+        wg_cache = WorkgroupReferenceCache(
+            api_client=self.api_client, workgroup_uuid=WORKGROUP_UUID, max_age=60
+        )
+        monotonic.return_value = 1000
+        wg_cache.resolve_coordinate_system(CoordinateSystem(code=4326))
+        monotonic.return_value = 1059
+        wg_cache.resolve_coordinate_system(CoordinateSystem(code=4326))
+        self.api_client.srs.listing.assert_called_once()
+
+        monotonic.return_value = 1060
+        wg_cache.resolve_coordinate_system(CoordinateSystem(code=4326))
+        self.assertEqual(self.api_client.srs.listing.call_count, 2)
+        self.api_client.srs.associate_workgroup.assert_not_called()
+
+    def test_created_meanwhile(self):
+        """A failed creation returns the object created meanwhile by something else"""
+        self.api_client.catalog.create.return_value = (False, 409)
+        self.api_client.catalog.listing.side_effect = [
+            [],
+            [{"_id": CATALOG_UUID, "name": "Catalog"}],
+        ]
+
+        catalog = self.wg_cache.resolve_catalog(Catalog(name="Catalog"))
+
+        self.assertIsInstance(catalog, Catalog)
+        self.assertEqual(catalog._id, CATALOG_UUID)
+        self.assertEqual(self.api_client.catalog.listing.call_count, 2)
+        args, kwargs = self.api_client.catalog.create.call_args
+        self.assertEqual(kwargs.get("workgroup_id"), WORKGROUP_UUID)
+
+    def test_failed_creation(self):
+        """A creation which really failed returns the API error"""
+        self.api_client.contact.create.return_value = (False, 500)
+
+        contact = self.wg_cache.resolve_contact(Contact(email="other@example.com"))
+
+        self.assertEqual(contact, (False, 500))
+        self.assertEqual(self.api_client.contact.listing.call_count, 2)
+
+        # next use doesn't reload again
+        self.wg_cache.resolve_contact(Contact(email="contact@example.com"))
+        self.assertEqual(self.api_client.contact.listing.call_count, 2)
+
+    def test_specifications_exact(self):
+        """Specifications are matched by link and name, as they are"""
+        spec = self.wg_cache.find_specification(
+            link="https://eur-lex.europa.eu/eli/reg/2010/1089/",
+            name="INSPIRE - Interoperability  of spatial data sets",
+        )
+        self.assertEqual(spec.get("_id"), SPECIFICATION_UUID_1)
+
+        # not normalized
+        self.assertIsNone(
+            self.wg_cache.find_specification(
+                link="https://eur-lex.europa.eu/eli/reg/2010/1089",
+                name="INSPIRE - Interoperability of spatial data sets",
+            )
+        )
+        self.api_client.specification.listing.assert_called_once()
+
+    def test_specifications_normalized(self):
+        """Normalized specifications ignore case, spaces and trailing slash"""
+        wg_cache = WorkgroupReferenceCache(
+            api_client=self.api_client,
+            workgroup_uuid=WORKGROUP_UUID,
+            normalize_specifications=True,
+        )
+        spec = wg_cache.find_specification(
+            link=" HTTPS://eur-lex.europa.eu/eli/reg/2010/1089 ",
+            name="inspire - interoperability of\nspatial data sets ",
+        )
+        self.assertEqual(spec.get("_id"), SPECIFICATION_UUID_1)
+
+        # the name still counts
+        self.assertIsNone(
+            wg_cache.find_specification(
+                link="https://eur-lex.europa.eu/eli/reg/2010/1089", name="INSPIRE"
+            )
+        )
+
+    def test_specifications_missing_link(self):
+        """Specifications without link only match specifications without link"""
+        spec = self.wg_cache.find_specification(link=None, name="Internal")
+        self.assertEqual(spec.get("_id"), SPECIFICATION_UUID_2)
+
+        self.assertIsNone(
+            self.wg_cache.find_specification(
+                link="https://example.com/internal", name="Internal"
+            )
+        )
+
+    def test_created_specification(self):
+        """Created specifications are indexed without reloading the listing"""
+        self.api_client.specification.create.return_value = Specification(
+            _id="a0f1e38ac7ba4e5e9d9b7d2b1f6f0c3e",
+            link="https://example.com/spec",
+            name="New",
+        )
+        spec_source = {
+            "_id": "source",
+            "link": "https://example.com/spec",
+            "name": "New",
+        }
+
+        for i in range(2):
+            specification = self.wg_cache.resolve_specification(spec_source)
+            self.assertEqual(specification._id, "a0f1e38ac7ba4e5e9d9b7d2b1f6f0c3e")
+
+        self.api_client.specification.create.assert_called_once()
+        self.api_client.specification.listing.assert_called_once()
+        self.assertEqual(len(self.wg_cache.specifications), 3)